@@ -0,0 +1,105 @@
+import random
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from utils.date_utils import parse_date, parse_dates, parse_month_year, to_month_year
+
+#-------------------------------------------------------------
+# Micro-benchmark: date parsing engine (utils/date_utils.py) vs the
+# previous extract_date_from_text / clean_date.
+#
+#   python benchmarkDates.py [rows]
+#-------------------------------------------------------------
+
+def legacy_extract_date_from_text(text):
+    """extract_date_from_text as it was before utils/date_utils.py"""
+    patterns = [
+        r'(\w+\s+\d{1,2},\s*20\d{2})',
+        r'(\d{1,2}\s+\w+\s+20\d{2})',
+        r'(20\d{2}-\d{1,2}-\d{1,2})'
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, text)
+        if matches:
+            try:
+                date_str = matches[0]
+                formats = ['%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y', '%Y-%m-%d']
+                for fmt in formats:
+                    try:
+                        date_obj = datetime.strptime(date_str, fmt)
+                        if date_obj:
+                            return f"{date_obj.strftime('%b')}-{date_obj.strftime('%y')}"
+                    except:
+                        continue
+            except:
+                pass
+    return None
+
+def legacy_clean_date(date_str):
+    """clean_date as it was before utils/date_utils.py"""
+    if not isinstance(date_str, str) or not date_str:
+        return None
+    month_map = {'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+                 'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'}
+    parts = date_str.strip().split('-')
+    if len(parts) != 2:
+        return None
+    month_abbr, year = parts
+    if len(year) == 2:
+        year = f"20{year}"
+    month_num = month_map.get(month_abbr, None)
+    if not month_num:
+        return None
+    return f"{year}-{month_num}"
+
+def make_texts(rows, seed=0):
+    """Synthetic article snippets with dates in every supported format (and some with none)"""
+    rng = random.Random(seed)
+    filler = "Acme and Globex announced an expanded AI partnership covering cloud and models. "
+    formats = [
+        lambda d: d.strftime('%B %d, %Y'),
+        lambda d: d.strftime('%b %d, %Y'),
+        lambda d: d.strftime('%d %B %Y'),
+        lambda d: d.strftime('%Y-%m-%d'),
+        lambda d: None,
+    ]
+    texts = []
+    for _ in range(rows):
+        date = datetime(rng.randint(2020, 2025), rng.randint(1, 12), rng.randint(1, 28))
+        formatted = rng.choice(formats)(date)
+        texts.append(filler * rng.randint(1, 5) + (f"Published {formatted}. " if formatted else "") + filler)
+    return texts
+
+def timed(label, func, rows):
+    start_time = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start_time
+    print(f"{label:<42}{elapsed * 1000:>10.1f} ms{rows / elapsed:>14,.0f} rows/s")
+    return result
+
+def main(rows=20000):
+    texts = make_texts(rows)
+    series = pd.Series(texts)
+    month_years = [f"{abbr}-{year}" for abbr, year in zip(
+        random.Random(1).choices(['Jan', 'Mar', 'Sep', 'Dec'], k=rows), random.Random(2).choices(range(20, 26), k=rows))]
+
+    print(f"{rows} rows\n")
+    legacy = timed("legacy extract_date_from_text (per row)", lambda: [legacy_extract_date_from_text(t) for t in texts], rows)
+    scalar = timed("parse_date + to_month_year (per row)", lambda: [to_month_year(parse_date(t)) for t in texts], rows)
+    vectorized = [to_month_year(date) for date in timed("parse_dates (Series)", lambda: parse_dates(series), rows)]
+
+    legacy_cleaned = timed("legacy clean_date (per row)", lambda: [legacy_clean_date(d) for d in month_years], rows)
+    cleaned = timed("parse_month_year (per row)", lambda: [parse_month_year(d) for d in month_years], rows)
+    timed("parse_dates on Mon-YY (Series)", lambda: parse_dates(pd.Series(month_years)), rows)
+
+    mismatches = sum(1 for a, b, c in zip(legacy, scalar, vectorized) if not a == b == c)
+    print(f"\nResults differing from the legacy parser: {mismatches}")
+    mismatches = sum(1 for a, b in zip(legacy_cleaned, cleaned) if a != b)
+    print(f"Results differing from the legacy clean_date: {mismatches}")
+
+if __name__ == "__main__":
+    import sys
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,67 @@
+import argparse
+import sys
+
+from utils.storage_utils import read_table
+from utils.benchmark_utils import (
+    fake_backend, llm_backend, run_benchmark, save_results, load_results, compare_results
+)
+
+#-------------------------------------------------------------
+# Benchmark model latency and throughput.
+#
+# Offline (no network):
+#   python benchmarkModels.py --backend fake --out data/benchmarks/fake.json
+# Against a model, compared with an earlier run:
+#   python benchmarkModels.py --backend ollama --model gemma3:1b --csv "data/AI Partnerships sample_updated.csv" \
+#       --out data/benchmarks/gemma3.json --baseline data/benchmarks/gemma3_baseline.json
+#-------------------------------------------------------------
+
+prompt = """
+    Summarize the following AI partnership announcement in one sentence:
+    """
+
+def load_prompts(csv_path, limit):
+    """Build summarization prompts from the raw_content column, or synthetic ones without a CSV"""
+    if not csv_path:
+        return [f"{prompt}\nCompany{i} and Company{i + 1} announce an AI partnership." for i in range(limit)]
+    df = read_table(csv_path, columns=['raw_content']).dropna()
+    return [prompt + "\n" + text for text in df['raw_content'].head(limit).blob.text()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM latency and throughput")
+    parser.add_argument("--backend", choices=["fake", "ollama", "openai"], default="fake")
+    parser.add_argument("--model", default=None, help="Model name for ollama/openai backends")
+    parser.add_argument("--csv", default=None, help="CSV with a raw_content column to build prompts from")
+    parser.add_argument("--prompts", type=int, default=10, help="Number of prompts per trial")
+    parser.add_argument("--concurrency", default="1,2,4", help="Comma-separated concurrency levels")
+    parser.add_argument("--trials", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake backend mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Fake backend latency spread")
+    parser.add_argument("--distribution", default="lognormal", help="Fake backend latency distribution")
+    parser.add_argument("--out", default="data/benchmarks/results.json")
+    parser.add_argument("--baseline", default=None, help="Earlier results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=None)
+    args = parser.parse_args()
+
+    if args.backend == "fake":
+        backend = fake_backend(latency=args.latency, jitter=args.jitter, distribution=args.distribution)
+    else:
+        backend = llm_backend(args.model, use_openai=args.backend == "openai")
+
+    prompts = load_prompts(args.csv, args.prompts)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = run_benchmark(backend, prompts, concurrency_levels=levels, trials=args.trials, warmup=args.warmup)
+    save_results(results, args.out)
+    print(f"\nResults saved to {args.out}")
+
+    if args.baseline:
+        regressions = compare_results(load_results(args.baseline), results, args.tolerance)
+        for regression in regressions:
+            print(f"Regression - {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
 from utils.my_llm_utils import *
 from utils.my_utils import *
-from utils.tavily_search_utils import web_search
+from utils.concurrency_utils import map_in_order, PROVIDER_CONCURRENCY
 
+import os
+import sys
 import time
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-csv_path = "data/AI Partnerships sample_updated.csv"
+from utils.benchmark_utils import percentile
+from utils.trace_utils import print_trace_report, log_trace_report_to_wandb
+from utils.blob_utils import intern_columns, resolve_columns, resolve
+from utils.ollama_utils import get_ollama_scheduler
 
-# read the csv file
-df, output_path = read_csv_with_output_path(csv_path)
-
-
-import wandb
-wandb.init(project="AI-Partnerships-agent")
+# CSV to compare models on (override with COMPARE_CSV or the first command-line argument).
+# For repeatable latency percentiles and throughput, see benchmarkModels.py
+csv_path = os.getenv("COMPARE_CSV", "data/AI Partnerships sample_updated.csv")
 
 ollamaModels = ["gemma3:1b", "llama3.2:latest", "phi4:latest"]
 openAiModels = ["gpt-4o"]
@@ -24,39 +27,63 @@ prompt = f"""
 
 # Initialize statistics dictionary
 model_stats = {}
-
-def process_model_summaries(models, use_openai=False):
+# Summaries per model, written into df once every model has finished
+model_summaries = {}
+
+# Requests in flight per model, e.g. MODEL_CONCURRENCY="gpt-4o=8,phi4:latest=1".
+# Models not listed use their provider's limit (OPENAI_CONCURRENCY / OLLAMA_CONCURRENCY).
+MODEL_CONCURRENCY = {
+    name.strip(): int(limit)
+    for name, limit in (item.split('=') for item in os.getenv("MODEL_CONCURRENCY", "").split(',') if '=' in item)
+}
+
+def summarize_with_timing(llm, raw_content):
+    """Summarize one text and return (summary string, request latency in seconds)"""
+    start_time = time.perf_counter()
+    summary = llm.invoke(prompt + "\n" + raw_content)
+    elapsed = time.perf_counter() - start_time
+    
+    # Prefer the latency of the model request itself, which excludes time spent
+    # queued behind other requests for a concurrency slot or the rate limiter
+    if llm.last_request_seconds is not None:
+        elapsed = llm.last_request_seconds
+    
+    # Convert summary to string
+    summary_str = summary.content if hasattr(summary, 'content') else str(summary)
+    return summary_str, elapsed
+
+def process_model_summaries(df, models, use_openai=False):
+    """Summarize every row with each model in turn, several rows at a time per model"""
+    provider = "openai" if use_openai else "ollama"
     for model in models:
-        print(f"\nProcessing {model}...")
-        llm = get_llm(use_openai=use_openai, model_name=model)
+        concurrency = MODEL_CONCURRENCY.get(model, PROVIDER_CONCURRENCY.get(provider, 1))
+        print(f"\nProcessing {model} ({concurrency} concurrent requests)...")
+        # Uncached, so every latency below is a real model request
+        llm = get_llm(use_openai=use_openai, model_name=model, cache=False)
+        
+        # Load a local model before timing it, so its cold-load time is kept
+        # apart from the inference latencies (models run one at a time, each loaded once)
+        scheduler = None if use_openai else get_ollama_scheduler()
+        cold_load = scheduler.ensure_resident(model) if scheduler else 0.0
         
         # Initialize statistics for this model
         model_stats[model] = {
             'summary_lengths': [],
             'processing_times': [],
+            'cold_load_time': cold_load,
             'start_time': datetime.now()
         }
         
-        # iterate over the rows of the dataframe
-        for index, row in df.iterrows():
-            # get the raw content
-            raw_content = row['raw_content']
-            
-            # Time the summarization
-            start_time = time.time()
-            # summarize the raw content
-            summary = llm.invoke(prompt + "\n" + raw_content)
-            end_time = time.time()
-            
-            # Convert summary to string
-            summary_str = summary.content if hasattr(summary, 'content') else str(summary)
-            
-            # Store statistics
+        # summarize the raw content of every row (results come back in row order);
+        # raw_content holds blob references, loaded one article at a time
+        results = map_in_order(lambda raw_content: summarize_with_timing(llm, resolve(raw_content)),
+                               df['raw_content'].tolist(), max_workers=concurrency)
+        
+        # Store statistics
+        for summary_str, elapsed in results:
             model_stats[model]['summary_lengths'].append(len(summary_str))
-            model_stats[model]['processing_times'].append(end_time - start_time)
-            
-            # add the summary to the dataframe
-            df.at[index, model + '_summary'] = summary_str
+            model_stats[model]['processing_times'].append(elapsed)
+        model_summaries[model] = [summary_str for summary_str, _ in results]
             
         # Calculate final statistics
         model_stats[model]['end_time'] = datetime.now()
@@ -65,46 +92,77 @@ def process_model_summaries(models, use_openai=False):
         model_stats[model]['min_time'] = np.min(model_stats[model]['processing_times'])
         model_stats[model]['max_time'] = np.max(model_stats[model]['processing_times'])
         model_stats[model]['median_time'] = np.median(model_stats[model]['processing_times'])
+        model_stats[model]['p95_time'] = percentile(model_stats[model]['processing_times'], 95)
         model_stats[model]['avg_length'] = np.mean(model_stats[model]['summary_lengths'])
         model_stats[model]['min_length'] = np.min(model_stats[model]['summary_lengths'])
         model_stats[model]['max_length'] = np.max(model_stats[model]['summary_lengths'])
         model_stats[model]['median_length'] = np.median(model_stats[model]['summary_lengths'])
 
-# Process Ollama models
-process_model_summaries(ollamaModels, use_openai=False)
-
-# Process OpenAI models
-process_model_summaries(openAiModels, use_openai=True)
-
-# Create summary DataFrame
-summary_stats = pd.DataFrame({
-    'Model': list(model_stats.keys()),
-    'Total Time (s)': [stats['total_time'] for stats in model_stats.values()],
-    'Avg Time (s)': [stats['avg_time'] for stats in model_stats.values()],
-    'Min Time (s)': [stats['min_time'] for stats in model_stats.values()],
-    'Max Time (s)': [stats['max_time'] for stats in model_stats.values()],
-    'Median Time (s)': [stats['median_time'] for stats in model_stats.values()],
-    'Avg Length': [stats['avg_length'] for stats in model_stats.values()],
-    'Min Length': [stats['min_length'] for stats in model_stats.values()],
-    'Max Length': [stats['max_length'] for stats in model_stats.values()],
-    'Median Length': [stats['median_length'] for stats in model_stats.values()]
-})
-
-# Create modelComparison DataFrame
-modelComparison = df[['partner1', 'partner2', 'raw_content'] + [f'{model}_summary' for model in ollamaModels + openAiModels]].copy()
-
-# Convert AIMessage objects to strings
-for col in modelComparison.columns:
-    if col.endswith('_summary'):
-        modelComparison[col] = modelComparison[col].apply(lambda x: x.content if hasattr(x, 'content') else str(x))
-
-
-# Log both tables to wandb
-wandb.log({
-    "summaries": wandb.Table(dataframe=modelComparison),
-    "model_stats": wandb.Table(dataframe=summary_stats)
-})
-
-# Display the summary statistics
-print("\nModel Performance Statistics:")
-print(summary_stats.to_string(index=False))
+def compare_models(df):
+    """Summarize every row with every model and return the per-model statistics table"""
+    # The remote OpenAI models and the local Ollama models use separate resources,
+    # so run the two queues at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        queues = [
+            executor.submit(process_model_summaries, df, ollamaModels, use_openai=False),
+            executor.submit(process_model_summaries, df, openAiModels, use_openai=True),
+        ]
+        for model_queue in queues:
+            model_queue.result()
+
+    # add the summaries to the dataframe (long ones are kept in the blob store)
+    for model, summaries in model_summaries.items():
+        df[model + '_summary'] = summaries
+    intern_columns(df)
+
+    # Create summary DataFrame
+    summary_stats = pd.DataFrame({
+        'Model': list(model_stats.keys()),
+        'Cold Load (s)': [stats['cold_load_time'] for stats in model_stats.values()],
+        'Total Time (s)': [stats['total_time'] for stats in model_stats.values()],
+        'Avg Time (s)': [stats['avg_time'] for stats in model_stats.values()],
+        'Min Time (s)': [stats['min_time'] for stats in model_stats.values()],
+        'Max Time (s)': [stats['max_time'] for stats in model_stats.values()],
+        'Median Time (s)': [stats['median_time'] for stats in model_stats.values()],
+        'P95 Time (s)': [stats['p95_time'] for stats in model_stats.values()],
+        'Avg Length': [stats['avg_length'] for stats in model_stats.values()],
+        'Min Length': [stats['min_length'] for stats in model_stats.values()],
+        'Max Length': [stats['max_length'] for stats in model_stats.values()],
+        'Median Length': [stats['median_length'] for stats in model_stats.values()]
+    })
+    return summary_stats
+
+def main():
+    # read the csv file
+    # Only the partner names and article text are needed
+    df, output_path = read_csv_with_output_path(sys.argv[1] if len(sys.argv) > 1 else csv_path,
+                                                columns=['partner1', 'partner2', 'raw_content'])
+
+    import wandb
+    wandb.init(project="AI-Partnerships-agent")
+
+    summary_stats = compare_models(df)
+
+    # Create modelComparison DataFrame
+    modelComparison = df[['partner1', 'partner2', 'raw_content'] + [f'{model}_summary' for model in ollamaModels + openAiModels]].copy()
+
+    # Convert AIMessage objects to strings
+    for col in modelComparison.columns:
+        if col.endswith('_summary'):
+            modelComparison[col] = modelComparison[col].apply(lambda x: x.content if hasattr(x, 'content') else str(x))
+
+    # Log both tables to wandb, with the article texts and summaries loaded
+    modelComparison = resolve_columns(modelComparison)
+    wandb.log({
+        "summaries": wandb.Table(dataframe=modelComparison),
+        "model_stats": wandb.Table(dataframe=summary_stats)
+    })
+    log_trace_report_to_wandb(wandb.run)
+
+    # Display the summary statistics
+    print("\nModel Performance Statistics:")
+    print(summary_stats.to_string(index=False))
+    print_trace_report()
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,93 @@
 from utils.my_llm_utils import *
 from utils.my_utils import *
-from utils.tavily_search_utils import web_search
+from utils.tavily_search_utils import web_search_many
+from utils.company_utils import CompanyIndex, canonical_company_name, clean_company_name
+from utils.trace_utils import span, print_trace_report
+from utils.prompt_utils import build_prompt
+from utils.prefilter_utils import get_prefilter, get_prefilter_stats
+from utils.dedup_utils import get_near_duplicate_index, collapse_near_duplicates
+from utils.blob_utils import to_blob
+from utils.concurrency_utils import map_in_order, PROVIDER_CONCURRENCY
+from utils.retry_utils import RetryQueue, is_retryable
+from utils.ollama_utils import get_ollama_scheduler
+from utils.cascade_utils import CASCADE_VALIDATION, CASCADE_LOCAL_MODEL, get_cascade_stats, is_clear_verdict, parse_confident_answer
 import pandas as pd
-from datetime import datetime, timedelta
-import time
+import os
+import re
+
+# Discovery queries, run concurrently; results are merged and deduplicated before extraction
+SEARCH_QUERIES = [
+    "company announces AI partnership with company",
+    "company expands partnership with company AI",
+    "company and company announce AI partnership",
+    "company partners with company AI",
+    "company collaborates with company artificial intelligence",
+    "company teams up with company AI",
+    "company joins forces with company AI",
+    "company strategic partnership with company AI",
+    "company new partnership with company artificial intelligence",
+    "company alliance with company AI",
+]
+
+# Validate all candidate pairs of an article with one LLM call instead of one call per pair
+BATCH_VALIDATION = os.getenv("BATCH_VALIDATION", "true").lower() == "true" # default to True
+
+# Local Ollama model that extracts company names from each result
+EXTRACTION_MODEL = os.getenv("EXTRACTION_MODEL", "gemma3:1b")
 
 def get_existing_partnerships(csv_path):
-    """Read existing partnerships and create a set of normalized partner pairs"""
-    df = pd.read_csv(csv_path)
-    existing_pairs = set()
+    """Read existing partnerships into an index of canonical partner pairs
+
+    Returns a CompanyIndex (see utils/company_utils.py): pairs match regardless
+    of order, case, legal suffixes such as Inc/Corp and known aliases.
+    """
+    with span("storage.read", path=csv_path) as attrs:
+        index = CompanyIndex.from_csv(csv_path)
+        attrs["rows"] = len(index)
+    return index
+
+def validation_verdict(answers):
+    """Turn the three yes/no validation answers into (is_valid, rejection_reason)"""
+    # Convert yes/no to boolean
+    is_valid_partnership = answers[0] == 'yes'
+    is_ai_related = answers[1] == 'yes'
+    are_real_companies = answers[2] == 'yes'
+    
+    # Check all conditions
+    is_valid = is_valid_partnership and is_ai_related and are_real_companies
     
-    for _, row in df.iterrows():
-        partner1 = str(row['partner1']).lower().strip()
-        partner2 = str(row['partner2']).lower().strip()
-        # Store pairs in both orders to handle case-insensitive matching
-        existing_pairs.add(frozenset([partner1, partner2]))
+    # Generate rejection reason
+    if not is_valid:
+        reasons = []
+        if not is_valid_partnership:
+            reasons.append("not a valid partnership")
+        if not is_ai_related:
+            reasons.append("not AI-related")
+        if not are_real_companies:
+            reasons.append("companies not verified as real")
+        rejection_reason = ", ".join(reasons)
+    else:
+        rejection_reason = "passed"
     
-    return existing_pairs
+    return is_valid, rejection_reason
+
+def validate_partnership(partner1, partner2, content, llm=None, cascade=None):
+    """Validate if the content describes an AI partnership between the two companies using LLM
 
-def validate_partnership(partner1, partner2, content):
-    """Validate if the content describes an AI partnership between the two companies using LLM"""
+    With cascade (default CASCADE_VALIDATION) a local model answers first and
+    only unclear answers reach the OpenAI model (see validate_cascade).
+    """
     from utils.my_llm_utils import get_llm
     
+    cascade = CASCADE_VALIDATION if cascade is None else cascade
+    if cascade:
+        return validate_cascade([(partner1, partner2)], content)[0]
+    
     # Initialize LLM
-    #llm = get_llm(use_openai=False, model_name="gemma3:1b")
-    llm = get_llm(use_openai=True)
+    llm = llm or get_llm(use_openai=True)
     
-    # Create validation prompt
-    prompt = f"""
+    # Create validation prompt (the text is packed into the model's input token budget)
+    prompt = build_prompt(f"""
     You are a validation assistant. Answer these three questions about the text below:
     1. Does this text describe a partnership between {partner1} and {partner2}?
     2. Is this partnership related to AI or machine learning?
@@ -38,8 +98,8 @@ def validate_partnership(partner1, partner2, content):
     Example: no,yes,no
 
     Text:
-    {content}
-    """
+    {{text}}
+    """, content, names=(partner1, partner2), model=llm.model_name)
     
     try:
         # Get response from LLM
@@ -58,130 +118,370 @@ def validate_partnership(partner1, partner2, content):
             if len(answers) != 3:
                 return False, f"Invalid response format. Expected 3 answers, got {len(answers)}"
             
-            # Convert yes/no to boolean
-            is_valid_partnership = answers[0] == 'yes'
-            is_ai_related = answers[1] == 'yes'
-            are_real_companies = answers[2] == 'yes'
-            
-            # Check all conditions
-            is_valid = is_valid_partnership and is_ai_related and are_real_companies
-            
-            # Generate rejection reason
-            if not is_valid:
-                reasons = []
-                if not is_valid_partnership:
-                    reasons.append("not a valid partnership")
-                if not is_ai_related:
-                    reasons.append("not AI-related")
-                if not are_real_companies:
-                    reasons.append("companies not verified as real")
-                rejection_reason = ", ".join(reasons)
-            else:
-                rejection_reason = "passed"
-            
-            return is_valid, rejection_reason
+            return validation_verdict(answers)
             
         except Exception as parse_error:
             return False, f"Failed to parse yes/no responses: {str(parse_error)}"
         
     except Exception as e:
+        # Let transient failures reach the caller, which retries the result later
+        if is_retryable(e):
+            raise
         error_msg = f"Error in LLM validation: {str(e)}"
         print(error_msg)
         return False, error_msg
 
-def search_new_partnerships(existing_pairs, time_range="month"):
-    """Search for new AI partnerships using Tavily"""
+def numbered_answers(response_str, num_pairs):
+    """
+    Yield (pair number, answer text) for each numbered line of a batched response.
+
+    Models sometimes echo the pair before answering ("1. Acme and Beta: yes,no,yes"),
+    so only the text after the last colon is the answer.
+    """
+    for line in response_str.strip().lower().splitlines():
+        match = re.match(r'^\W*(\d+)\s*[:.)\-]\s*(.+)$', line.strip())
+        if match and 1 <= int(match.group(1)) <= num_pairs:
+            yield int(match.group(1)), match.group(2).rsplit(':', 1)[-1]
+
+def parse_batch_validation(response_str, num_pairs):
+    """
+    Parse a batched validation response into one verdict per pair.
+
+    Expects one line per pair such as "2: yes,no,yes". Pairs without a
+    well-formed line are rejected with a reason explaining why.
+
+    Returns:
+        list[tuple[bool, str]]: (is_valid, rejection_reason) for each pair, in order
+    """
+    verdicts = [(False, "no verdict returned for this pair")] * num_pairs
+    
+    for number, answer in numbered_answers(response_str, num_pairs):
+        answers = [ans.strip(" .*") for ans in answer.split(',')]
+        if len(answers) != 3:
+            verdicts[number - 1] = (False, f"Invalid response format. Expected 3 answers, got {len(answers)}")
+        else:
+            verdicts[number - 1] = validation_verdict(answers)
+    
+    return verdicts
+
+def validate_partnerships_batch(pairs, content, llm=None, cascade=None):
+    """Validate several candidate pairs from the same text with a single LLM call
+
+    Sends the text once with every pair listed, and applies the same three
+    yes/no criteria as validate_partnership to each pair.
+
+    Args:
+        pairs (list[tuple[str, str]]): Candidate (partner1, partner2) pairs
+        content (str): Text the pairs were extracted from
+        llm (optional): Model to ask. If None, the OpenAI model
+        cascade (bool, optional): Ask the local model first (see validate_cascade). If None, uses CASCADE_VALIDATION
+
+    Returns:
+        list[tuple[bool, str]]: (is_valid, rejection_reason) for each pair, in order
+    """
+    if not pairs:
+        return []
+    cascade = CASCADE_VALIDATION if cascade is None else cascade
+    if cascade:
+        return validate_cascade(pairs, content)
+    if len(pairs) == 1:
+        return [validate_partnership(pairs[0][0], pairs[0][1], content, llm=llm, cascade=False)]
+
+    llm = llm or get_llm(use_openai=True)
+    
+    pair_lines = "\n    ".join(f"{i}. {partner1} and {partner2}" for i, (partner1, partner2) in enumerate(pairs, 1))
+    names = tuple(name for pair in pairs for name in pair)
+    prompt = build_prompt(f"""
+    You are a validation assistant. For each numbered pair of companies below, answer these three questions about the text:
+    1. Does this text describe a partnership between the two companies?
+    2. Is this partnership related to AI or machine learning?
+    3. Are both companies real companies?
+
+    Answer with one line per pair: the pair number, a colon, then ONLY "yes" or "no" for each question, separated by commas.
+    Example:
+    1: yes,yes,yes
+    2: no,yes,no
+
+    Pairs:
+    {pair_lines}
+
+    Text:
+    {{text}}
+    """, content, names=names, model=llm.model_name)
+    
+    try:
+        response = llm.invoke(prompt)
+        response_str = response.content if hasattr(response, 'content') else str(response)
+        print(f"Debug - Raw batch LLM response: {response_str.strip()}")  # Debug line
+        return parse_batch_validation(response_str, len(pairs))
+    except Exception as e:
+        if is_retryable(e):
+            raise
+        error_msg = f"Error in LLM validation: {str(e)}"
+        print(error_msg)
+        return [(False, error_msg)] * len(pairs)
+
+def search_new_partnerships(existing_pairs, time_range="month", batch_validation=None):
+    """Search for new AI partnerships using Tavily
+
+    Every query in SEARCH_QUERIES runs concurrently; results are merged and
+    deduplicated by canonical URL and content hash, and near-duplicate copies
+    of the same article (see utils/dedup_utils.py) are collapsed before extraction.
+
+    existing_pairs is a CompanyIndex of known partnerships; validated new
+    partnerships are added to it. Results are screened by the heuristic
+    pre-filter (see utils/prefilter_utils.py) before company extraction.
+
+    With batch_validation (default BATCH_VALIDATION) every candidate pair found
+    in a result is validated with one LLM call; otherwise one call per pair.
+    """
+    batch_validation = BATCH_VALIDATION if batch_validation is None else batch_validation
+    prefilter = get_prefilter()
     new_partnerships = []
     
-    # Multiple search queries to increase coverage
-    search_queries = [
-        f"company announces AI partnership with company"
-        # f"company expands partnership with company AI",
-        # f"company and company announce AI partnership",
-        # f"company partners with company AI",
-        # f"company collaborates with company artificial intelligence",
-        # f"company teams up with company AI",
-        # f"company joins forces with company AI",
-        # f"company strategic partnership with company AI",
-        # f"company new partnership with company artificial intelligence",
-        # f"company alliance with company AI"
-    ]
-    
-    # Process each search query
-    for query in search_queries:
-        print(f"\nSearching with query: {query}")
-        search_results = web_search(query, max_results=5, time_range=time_range)
+    # Run every query at once; the same article found by several queries is kept once
+    print(f"\nSearching with {len(SEARCH_QUERIES)} queries")
+    results, counts = web_search_many(SEARCH_QUERIES, max_results=5, time_range=time_range)
+    for query, count in counts.items():
+        print(f"  {query}: {count['results']} results, {count['unique']} new")
+    print(f"{len(results)} unique results")
+    
+    # Drop results that are obviously not announcements before any model call
+    # (scored on the original text, since company names are found by capitalization)
+    if prefilter:
+        total = len(results)
+        results = prefilter.filter(results)
+        print(f"Pre-filter kept {len(results)} of {total} results")
+    
+    # Collapse syndicated copies of the same announcement (also across runs)
+    near_duplicates = get_near_duplicate_index()
+    if near_duplicates:
+        total = len(results)
+        results = collapse_near_duplicates(results, near_duplicates)
+        print(f"Near-duplicate filter kept {len(results)} of {total} results")
+    
+    # Skip results whose content is too short
+    results = [result for result in results if len(result.get('content', '')) >= 50]
+    
+    # Results whose extraction or validation still fails with a retryable error
+    # are tried again once the others are done
+    retry_queue = RetryQueue()
+    deferred_urls = {}
+    
+    def defer(result, func, error):
+        label = f"result {result.get('url')}"
+        deferred_urls[label] = result.get('url') or ''
+        retry_queue.add(label, func, error)
+    
+    def extract(result):
+        return extract_companies_from_text(result.get('content', '').lower() + " " + result.get('title', '').lower())
+    
+    def try_extract(result):
+        try:
+            return extract(result)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            defer(result, lambda: process_result(result, extract(result)), e)
+            return None
+    
+    def process_result(result, companies):
+        content = result.get('content', '').lower()
+        url = result.get('url')
         
-        if not search_results or not search_results.get('results'):
-            continue
+        # Skip if we don't find at least 2 companies
+        if len(companies) < 2:
+            return
         
-        # Process each result
-        for result in search_results['results']:
-            content = result.get('content', '').lower()
-            title = result.get('title', '').lower()
-            url = result.get('url')
-            
-            # Skip if content is too short
-            if len(content) < 50:
-                continue
+        # Collect the new candidate pairs
+        candidates = []
+        for i in range(len(companies)):
+            for j in range(i + 1, len(companies)):
+                partner1 = companies[i]
+                partner2 = companies[j]
                 
-            # Look for company names in the content
-            companies = extract_companies_from_text(content + " " + title)
-            
-            # Skip if we don't find at least 2 companies
-            if len(companies) < 2:
-                continue
-            
-            # Check each pair of companies
-            for i in range(len(companies)):
-                for j in range(i + 1, len(companies)):
-                    partner1 = companies[i]
-                    partner2 = companies[j]
-                    
-                    # Skip if either company name is too short
-                    if len(partner1) < 3 or len(partner2) < 3:
-                        continue
-                    
-                    # Check if this partnership is new
-                    pair = frozenset([partner1.lower().strip(), partner2.lower().strip()])
-                    if pair not in existing_pairs:
-                        # Validate the partnership using LLM
-                        is_valid, rejection_reason = validate_partnership(partner1, partner2, content)
-                        if is_valid:
-                            # Extract date
-                            date = extract_date_from_text(content)
-                            
-                            # Add to new partnerships
-                            new_partnerships.append({
-                                'partner1': partner1,
-                                'partner2': partner2,
-                                'When announced': date,
-                                'Link': url,
-                                'raw_content': content
-                            })
-                            
-                            # Add to existing pairs to avoid duplicates
-                            existing_pairs.add(pair)
-                            
-                            print(f"Found new partnership: {partner1} and {partner2}")
-                        else:
-                            print(f"Skipped partnership: {partner1} and {partner2}")
-                            print(f"Reason: {rejection_reason}")
+                # Skip if either company name is too short
+                if len(partner1) < 3 or len(partner2) < 3:
+                    continue
+                
+                # Skip two spellings of the same company
+                if canonical_company_name(partner1) == canonical_company_name(partner2):
+                    continue
+                
+                # Check if this partnership is new
+                if not existing_pairs.contains(partner1, partner2):
+                    candidates.append((partner1, partner2))
+        
+        # Validate the partnerships using LLM
+        if batch_validation:
+            verdicts = validate_partnerships_batch(candidates, content)
+        else:
+            verdicts = [validate_partnership(partner1, partner2, content) for partner1, partner2 in candidates]
         
-        # Add a small delay between queries to avoid rate limits
-        time.sleep(1)
+        # Extract the date once for every partnership found in this result, and store
+        # the text once (as a blob reference) however many partnerships it yields
+        found = any(is_valid for is_valid, _ in verdicts)
+        date = extract_date_from_text(content) if found else None
+        raw_content = to_blob(content) if found else None
+        
+        for (partner1, partner2), (is_valid, rejection_reason) in zip(candidates, verdicts):
+            if is_valid:
+                # Add to new partnerships
+                new_partnerships.append({
+                    'partner1': partner1,
+                    'partner2': partner2,
+                    'When announced': date,
+                    'Link': url,
+                    'raw_content': raw_content
+                })
+                
+                # Add to existing pairs to avoid duplicates
+                existing_pairs.add(partner1, partner2)
+                
+                print(f"Found new partnership: {partner1} and {partner2}")
+            else:
+                print(f"Skipped partnership: {partner1} and {partner2}")
+                print(f"Reason: {rejection_reason}")
     
+    # Look for company names in every result first, so the local extraction model is
+    # loaded once and stays resident instead of alternating with the validation model
+    scheduler = get_ollama_scheduler()
+    if scheduler:
+        scheduler.ensure_resident(EXTRACTION_MODEL)
+    extracted = map_in_order(try_extract, results, max_workers=PROVIDER_CONCURRENCY["ollama"])
+    
+    # The cascade's local validation model is needed next
+    if scheduler and CASCADE_VALIDATION:
+        scheduler.ensure_resident(CASCADE_LOCAL_MODEL)
+    
+    # Process each result
+    for result, companies in zip(results, extracted):
+        if companies is None:
+            continue
+        try:
+            process_result(result, companies)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            defer(result, lambda result=result, companies=companies: process_result(result, companies), e)
+    
+    # Retry the deferred results; forget the ones that still fail in the near-duplicate
+    # index, so a later run does not drop their syndicated copies as already seen
+    _, failed = retry_queue.drain()
+    if failed:
+        for label, _ in failed:
+            if near_duplicates:
+                near_duplicates.remove(deferred_urls[label])
+        print(f"{len(failed)} results still failing; they will be searched again on the next run")
+
     return new_partnerships
 
+def parse_local_validation(response_str, num_pairs):
+    """
+    Parse the local model's numbered "yes,no,yes,85" lines.
+
+    Returns:
+        list: (answers, confidence) for each pair, in order, or None where the line is missing or malformed
+    """
+    parsed = [None] * num_pairs
+    for number, answer in numbered_answers(response_str, num_pairs):
+        parsed[number - 1] = parse_confident_answer(answer)
+    return parsed
+
+def validate_cascade(pairs, content):
+    """Validate candidate pairs with a cheap local model, escalating only unclear answers
+
+    The local model (CASCADE_LOCAL_MODEL) answers the same three questions for
+    every pair in one call, with a confidence for each. Clear answers (see
+    utils/cascade_utils.py) are kept; pairs whose answer is missing, malformed
+    or below the confidence threshold are validated by the OpenAI model as
+    before. A confident local "yes" is kept without asking OpenAI, so accepting
+    needs the higher CASCADE_ACCEPT_CONFIDENCE.
+
+    Args:
+        pairs (list[tuple[str, str]]): Candidate (partner1, partner2) pairs
+        content (str): Text the pairs were extracted from
+
+    Returns:
+        list[tuple[bool, str]]: (is_valid, rejection_reason) for each pair, in order
+    """
+    if not pairs:
+        return []
+    stats = get_cascade_stats()
+    local_llm = get_llm(use_openai=False, model_name=CASCADE_LOCAL_MODEL)
+    
+    pair_lines = "\n    ".join(f"{i}. {partner1} and {partner2}" for i, (partner1, partner2) in enumerate(pairs, 1))
+    names = tuple(name for pair in pairs for name in pair)
+    prompt = build_prompt(f"""
+    You are a validation assistant. For each numbered pair of companies below, answer these three questions about the text:
+    1. Does this text describe a partnership between the two companies?
+    2. Is this partnership related to AI or machine learning?
+    3. Are both companies real companies?
+    Then give your confidence from 0 to 100 that all three answers are correct.
+
+    Answer with one line per pair: the pair number, a colon, then ONLY "yes" or "no" for each question
+    and the confidence, separated by commas.
+    Example:
+    1: yes,yes,yes,95
+    2: no,yes,no,80
+
+    Pairs:
+    {pair_lines}
+
+    Text:
+    {{text}}
+    """, content, names=names, model=local_llm.model_name)
+    
+    try:
+        response = local_llm.invoke(prompt)
+        response_str = response.content if hasattr(response, 'content') else str(response)
+        parsed = parse_local_validation(response_str, len(pairs))
+        local_seconds = local_llm.last_request_seconds
+    except Exception as e:
+        print(f"Error in local LLM validation: {str(e)}")
+        parsed = None
+        local_seconds = None
+    
+    verdicts = [None] * len(pairs)
+    outcomes = []
+    for i, answer in enumerate(parsed or [None] * len(pairs)):
+        if parsed is None:
+            outcomes.append("error")
+        elif answer is None:
+            outcomes.append("malformed")
+        elif is_clear_verdict(*answer):
+            outcomes.append("clear")
+            verdicts[i] = validation_verdict(answer[0])
+        else:
+            outcomes.append("low_confidence")
+    
+    # Ask the OpenAI model about the pairs the local model was not clear about.
+    # Stats are recorded only once both calls are done, so a run deferred by a
+    # retryable OpenAI error (and redone later) is counted once.
+    escalated = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    if escalated:
+        remote_llm = get_llm(use_openai=True)
+        remote_verdicts = validate_partnerships_batch([pairs[i] for i in escalated], content,
+                                                      llm=remote_llm, cascade=False)
+        for i, verdict in zip(escalated, remote_verdicts):
+            verdicts[i] = verdict
+    
+    stats.record_local(local_seconds, outcomes)
+    if escalated:
+        stats.record_remote(remote_llm.last_request_seconds, remote_llm.model_name, remote_llm.last_usage)
+    
+    print(f"Cascade: {len(pairs) - len(escalated)} of {len(pairs)} pairs decided by {CASCADE_LOCAL_MODEL}")
+    return verdicts
+
 def extract_companies_from_text(text):
     """Extract potential company names from text using LLM"""
     from utils.my_llm_utils import get_llm
     
     # Initialize LLM
-    llm = get_llm(use_openai=False, model_name="gemma3:1b")
+    llm = get_llm(use_openai=False, model_name=EXTRACTION_MODEL)
     
-    # Create prompt for company extraction
-    prompt = f"""
+    # Create prompt for company extraction (the text is packed into the model's input token budget)
+    prompt = build_prompt("""
     Extract the names of companies involved in a partnership or collaboration from the following text.
     Return ONLY a JSON array of company names, with no additional text or explanation.
     If there are no companies mentioned, return an empty array.
@@ -193,7 +493,7 @@ def extract_companies_from_text(text):
     
     Example format:
     ["Company1", "Company2"]
-    """
+    """, text, model=llm.model_name)
     
     try:
         # Get response from LLM
@@ -214,21 +514,18 @@ def extract_companies_from_text(text):
             # If no JSON array found, try to extract company names directly
             companies = [name.strip() for name in response_str.split(',') if name.strip()]
         
-        # Clean up company names
+        # Clean up company names (suffixes, prefixes, quotes)
         cleaned_companies = []
         for company in companies:
-            # Remove common suffixes
-            company = re.sub(r'\s+(Inc\.?|Ltd\.?|LLC|Corp\.?|Corporation)$', '', company, flags=re.IGNORECASE)
-            # Remove common prefixes
-            company = re.sub(r'^(The|A|An)\s+', '', company, flags=re.IGNORECASE)
-            # Remove quotes if present
-            company = company.strip('"\'')
+            company = clean_company_name(company)
             if company:
                 cleaned_companies.append(company)
         
         return list(set(cleaned_companies))  # Remove duplicates
         
     except Exception as e:
+        if is_retryable(e):
+            raise
         print(f"Error extracting companies: {str(e)}")
         return []
 
@@ -245,17 +542,49 @@ def main():
     # Search for new partnerships
     new_partnerships = search_new_partnerships(existing_pairs, days_back)
     print(f"Found {len(new_partnerships)} new partnerships")
+
+    # Report the model calls the pre-filter avoided
+    prefilter_stats = get_prefilter_stats()
+    if prefilter_stats:
+        print(f"Pre-filter: rejected {prefilter_stats['rejected']} of {prefilter_stats['scored']} results, "
+              f"saving up to {prefilter_stats['llm_calls_saved']} LLM calls")
+    near_duplicates = get_near_duplicate_index()
+    if near_duplicates:
+        print(f"Near-duplicates: collapsed {near_duplicates.stats()['duplicates']} syndicated copies")
+
+    # Report how many pairs the local model settled, and what that saved
+    if CASCADE_VALIDATION:
+        cascade_stats = get_cascade_stats().stats()
+        print(f"Cascade: {cascade_stats['escalated']} of {cascade_stats['pairs']} pairs escalated to OpenAI "
+              f"({cascade_stats['escalation_rate']:.0%}; {cascade_stats['malformed']} malformed, "
+              f"{cascade_stats['low_confidence']} low confidence, {cascade_stats['errors']} local errors), local {cascade_stats['local_seconds']:.1f}s, "
+              f"OpenAI {cascade_stats['remote_seconds']:.1f}s, ${cascade_stats['cost']:.4f} spent, "
+              f"~${cascade_stats['saved_cost']:.4f} saved")
+    
+    # Report model loads
+    scheduler = get_ollama_scheduler()
+    if scheduler:
+        for model, stats in scheduler.stats().items():
+            print(f"Ollama {model}: {stats['cold_loads']} cold loads ({stats['cold_load_seconds']:.1f}s), "
+                  f"{stats['warm_hits']} already resident, {stats['unloads']} unloads")
+    
+    # Report what reusing LLM clients saved
+    registry_stats = get_llm_registry_stats()
+    print(f"LLM clients: {registry_stats['clients']} created, {registry_stats['reused']} reused, "
+          f"~{registry_stats['estimated_seconds_saved']:.2f}s construction/connection overhead saved")
     
     if new_partnerships:
         # Create DataFrame for new partnerships
         df_new = pd.DataFrame(new_partnerships)
         
         # Process new partnerships to get summaries
-        df_new = update_partnerships(df_new, output_csv)
+        df_new = update_partnerships(df_new, output_csv, resume=False)
         
         print(f"\nNew partnerships saved to {output_csv}")
     else:
         print("No new partnerships found")
+        print_cache_stats()
+        print_trace_report()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.company_utils import CompanyIndex, canonical_company_name, canonical_company_names
+
+NAMES = [
+    ("The Microsoft Corp.", "microsoft"),
+    ("Moody's", "moodys"),
+    ("Nestlé", "nestle"),
+    ("Hermès", "hermes"),
+    ("L’Oréal", "loreal"),
+    ("L'Oreal", "loreal"),
+    ("Facebook, Inc.", "meta"),
+    ("Open AI", "openai"),
+    ("", ""),
+]
+
+
+@pytest.mark.parametrize("name, canonical", NAMES)
+def test_canonical_company_name(name, canonical):
+    assert canonical_company_name(name, None) == canonical
+
+
+def test_vectorized_matches_scalar():
+    names = pd.Series([name for name, _ in NAMES] + [None])
+    assert canonical_company_names(names).tolist() == [canonical for _, canonical in NAMES] + [""]
+
+
+def test_index_matches_accented_and_plain_spellings():
+    index = CompanyIndex.from_dataframe(pd.DataFrame({"partner1": ["Nestlé SA"], "partner2": ["Hermès"]}))
+    assert ("hermes", "Nestle SA") in index
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+pytest.importorskip("nest_asyncio")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import crawler_utils
+from utils.crawler_utils import CrawlerSession
+
+PAGES = {
+    "/a": "<html><body><h1>Acme partners with Beta</h1><p>An AI deal.</p></body></html>",
+    "/b": "<html><body><h1>Gamma and Delta team up</h1></body></html>",
+    "/c": "<html><body><h1>Epsilon signs with Zeta</h1></body></html>",
+}
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves PAGES (slowly enough for requests to overlap), 404 for anything else"""
+
+    def do_GET(self):
+        time.sleep(0.1)
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", f'"{self.path.strip("/")}"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class HTTPCrawler:
+    """
+    Stands in for AsyncWebCrawler where no browser can be launched: fetches
+    the page over plain HTTP and returns its HTML as the markdown.
+    """
+
+    started = 0
+    active = 0
+    max_active = 0
+
+    def __init__(self, config=None):
+        self.config = config
+
+    async def start(self):
+        HTTPCrawler.started += 1
+
+    async def close(self):
+        pass
+
+    @staticmethod
+    def _get(url):
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.read().decode("utf-8"), dict(response.headers)
+
+    async def arun(self, url, config=None):
+        HTTPCrawler.active += 1
+        HTTPCrawler.max_active = max(HTTPCrawler.max_active, HTTPCrawler.active)
+        try:
+            html, headers = await asyncio.to_thread(self._get, url)
+        except urllib.error.HTTPError as e:
+            return SimpleNamespace(url=url, success=False, error_message=str(e), markdown=None)
+        finally:
+            HTTPCrawler.active -= 1
+        return SimpleNamespace(url=url, success=True, markdown=SimpleNamespace(raw_markdown=html),
+                               response_headers=headers)
+
+
+@pytest.fixture
+def http_crawler(monkeypatch):
+    monkeypatch.setattr(crawler_utils, "AsyncWebCrawler", HTTPCrawler)
+    HTTPCrawler.started = HTTPCrawler.active = HTTPCrawler.max_active = 0
+    return HTTPCrawler
+
+
+async def _crawl_all(session, urls, on_page=None):
+    async with session:
+        return [item async for item in session.crawl_many(urls, on_page=on_page)]
+
+
+def test_crawl_many_uses_the_pool_and_the_domain_limit(site, http_crawler):
+    urls = [f"{site}/a", f"{site}/b", f"{site}/c", f"{site}/missing"]
+    pages = []
+    results = asyncio.run(_crawl_all(CrawlerSession(pool_size=3, per_domain_limit=2), urls,
+                                     on_page=lambda url, markdown, headers: pages.append((url, headers.get("ETag")))))
+
+    assert sorted(url for url, _, _ in results) == sorted(urls)
+    by_url = {url: (markdown, error) for url, markdown, error in results}
+    for path in ("/a", "/b", "/c"):
+        markdown, error = by_url[f"{site}{path}"]
+        assert error is None and PAGES[path] in markdown
+    markdown, error = by_url[f"{site}/missing"]
+    assert markdown is None and isinstance(error, RuntimeError)
+
+    # Browsers are started once per session; one domain never gets more than per_domain_limit requests
+    assert http_crawler.started == 3
+    assert http_crawler.max_active == 2
+    assert sorted(pages) == sorted((f"{site}{path}", f'"{path.strip("/")}"') for path in ("/a", "/b", "/c"))
+
+
+def test_crawl_many_reports_on_page_errors(site, http_crawler):
+    def on_page(url, markdown, headers):
+        if url.endswith("/b"):
+            raise OSError("disk full")
+
+    results = asyncio.run(_crawl_all(CrawlerSession(pool_size=2), [f"{site}/a", f"{site}/b"], on_page=on_page))
+
+    by_url = {url: (markdown, error) for url, markdown, error in results}
+    assert by_url[f"{site}/a"][1] is None
+    assert by_url[f"{site}/b"][0] is None and isinstance(by_url[f"{site}/b"][1], OSError)
+
+
+def test_crawl_many_with_a_browser(site):
+    session = CrawlerSession(pool_size=1, browser_type="chromium")
+    try:
+        asyncio.run(session.start())
+    except Exception as e:
+        pytest.skip(f"no browser available: {e}")
+    asyncio.run(session.close())
+
+    results = asyncio.run(_crawl_all(CrawlerSession(pool_size=1, browser_type="chromium"), [f"{site}/a"]))
+    (url, markdown, error), = results
+    assert error is None and "Acme partners with Beta" in markdown
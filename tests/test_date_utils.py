@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.date_utils import parse_date, parse_dates, parse_month_year, to_month_year
+
+
+def test_parse_date_formats():
+    assert parse_date("Published October 23, 2024.") == "2024-10"
+    assert parse_date("on 3 Sept 2023") == "2023-09"
+    assert parse_date("2022-01-15") == "2022-01"
+    assert parse_date("Feb 30, 2024, then March 3, 2024") == "2024-03"
+    assert parse_date("no date here") is None
+
+
+def test_parse_dates_matches_parse_date():
+    texts = pd.Series(["Oct 3, 2024", None, 5, "Oct 3, 2024", "2023-02-29"], index=[5, 6, 7, 8, 9])
+    result = parse_dates(texts)
+    assert list(result.index) == [5, 6, 7, 8, 9]
+    assert result.tolist() == ["2024-10", None, None, "2024-10", None]
+
+
+def test_month_year_round_trip():
+    assert parse_month_year("Sep-24") == "2024-09"
+    assert parse_month_year("Launched Sep-24") is None
+    assert to_month_year(parse_month_year("sep-2024")) == "Sep-24"
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# searchNewPartnerships imports the LLM and search clients at module level
+for module in ("dotenv", "langchain_openai", "langchain_ollama", "tavily"):
+    pytest.importorskip(module)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from searchNewPartnerships import parse_batch_validation, parse_local_validation
+
+
+def test_plain_lines():
+    verdicts = parse_batch_validation("1: yes,yes,yes\n2: yes,no,yes", 2)
+    assert verdicts == [(True, "passed"), (False, "not AI-related")]
+
+
+def test_echoed_pair_uses_text_after_last_colon():
+    response = "1. Acme and Beta: yes, yes, yes\n2. Gamma, Inc. and Delta: Co: no, yes, yes"
+    verdicts = parse_batch_validation(response, 2)
+    assert verdicts == [(True, "passed"), (False, "not a valid partnership")]
+
+
+def test_missing_and_malformed_lines():
+    verdicts = parse_batch_validation("1: yes,yes\n7: yes,yes,yes", 2)
+    assert verdicts[0] == (False, "Invalid response format. Expected 3 answers, got 2")
+    assert verdicts[1] == (False, "no verdict returned for this pair")
+
+
+def test_local_validation_with_echoed_pair():
+    parsed = parse_local_validation("1. Acme and Beta: yes,yes,no,85\n2) garbage", 2)
+    assert parsed == [(['yes', 'yes', 'no'], 85), None]
@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.prefilter_utils import score_texts
+
+
+def _features(text):
+    return score_texts([text]).iloc[0]
+
+
+def test_partnership_phrases_are_scored_once():
+    features = _features("Acme teams up with Globex")
+    assert features['keywords'] == 1 and features['announcement'] == 0
+    assert features['score'] == 1.0 and not features['passed']
+
+
+def test_keywords_match_whole_word_prefixes():
+    assert _features("An ideal guide to rejoining")['keywords'] == 0
+    assert _features("Acme announced a collaboration and a deal")['keywords'] == 3
+
+
+def test_dotted_ai_is_an_ai_term():
+    assert _features("Acme bets on A.I. at last")['ai_terms'] == 1
+    assert _features("Acme bets on A.I.")['ai_terms'] == 1
+
+
+def test_announcement_passes():
+    features = _features("Acme and Globex announce an AI partnership and launch new models")
+    assert features['passed']
+    assert features['keywords'] == 2 and features['announcement'] == 1 and features['ai_terms'] == 2
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.storage_utils import CSVStorage, SQLiteStorage, open_storage
+
+
+def _csv(tmp_path, df):
+    path = str(tmp_path / "in.csv")
+    df.to_csv(path, index=False)
+    return CSVStorage(path)
+
+
+def _copy_in_chunks(source, target, chunksize):
+    for i, chunk in enumerate(source.iter_chunks(chunksize)):
+        if i == 0:
+            target.write(chunk)
+        else:
+            target.append(chunk)
+    target.close()
+
+
+def test_parquet_chunks_fill_in_a_column_empty_in_the_first_chunk(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({
+        "partner1": ["A", "B", "C", "D", "E", "F", "G"],
+        "partner3": [None, None, None, None, "C", None, "X"],  # all NaN (float64) in the first chunk
+        "score": [1.5, 2.0, 3.0, "high", 4.0, 5.0, 6.0],      # numbers, then text
+    })
+    output = open_storage(str(tmp_path / "out.parquet"))
+    _copy_in_chunks(_csv(tmp_path, df), output, chunksize=3)
+
+    result = output.read()
+    assert result["partner1"].tolist() == df["partner1"].tolist()
+    assert result["partner3"].tolist()[4] == "C" and result["partner3"].tolist()[6] == "X"
+    assert result["partner3"].isna().sum() == 5
+    assert result["score"].tolist() == ["1.5", "2.0", "3.0", "high", "4.0", "5.0", "6.0"]
+    assert list(result.index) == list(range(7))
+
+
+def test_parquet_append_after_close_keeps_earlier_rows(tmp_path):
+    pytest.importorskip("pyarrow")
+    output = open_storage(str(tmp_path / "out.parquet"))
+    output.write(pd.DataFrame({"partner1": ["A"]}))
+    output.close()
+    output.append(pd.DataFrame({"partner1": ["B"], "partner2": ["C"]}, index=[1]))
+    output.close()
+
+    result = output.read()
+    assert result["partner1"].tolist() == ["A", "B"]
+    assert result["partner2"].tolist()[1] == "C"
+
+
+def test_sqlite_sync_keeps_exactly_the_frame_rows(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "out.sqlite"))
+    storage.write(pd.DataFrame({"partner1": ["A", "B", "C"], "extra": [1, 2, 3]}))
+    storage.sync(pd.DataFrame({"partner1": ["A2", "D"]}, index=[0, 3]))
+
+    result = storage.read()
+    assert list(result.index) == [0, 3]
+    assert result["partner1"].tolist() == ["A2", "D"]
+    assert result["extra"].tolist()[0] == 1
@@ -1,11 +1,9 @@
 # load libraries
 from utils.my_llm_utils import *
 from utils.my_utils import *
-from utils.tavily_search_utils import web_search
 #from utils.crawler_utils import crawl_url
 
 import pandas as pd
-import time
 import os
 
 #-------------------------------------------------------------
@@ -21,15 +19,13 @@ else:
 	print(llm)
 	
 #-------------------------------------------------------------
-# load data
-csv_path = "data/input/AI Partnerships_03.csv"
-
-# read the csv file
-df, output_path = read_csv_with_output_path(csv_path)
+# load data - the full file is streamed in chunks, no need to split it into shards first
+csv_path = "data/input/AI Partnerships.csv"
 
 #-------------------------------------------------------------
- # Update the partnerships data
-success = update_partnerships(df, output_path)
+ # Update the partnerships data chunk by chunk (see UPDATE_CHUNKSIZE)
+# Set DRY_RUN=true to only print the rows and API calls the run would make
+success = update_partnerships_streaming(csv_path, dry_run=os.getenv("DRY_RUN", "false").lower() == "true")
 #-------------------------------------------------------------
 #-------------------------------------------------------------
 #-------------------------------------------------------------
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.rate_limit_utils import estimate_tokens
+
+# Regressions larger than this fraction are reported by compare_results
+BENCHMARK_TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", 0.10))
+
+
+def percentile(values, pct):
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values (list[float]): Samples
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(values):
+    """Mean and p50/p95/p99 of a list of latencies"""
+    return {
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+    }
+
+
+class FakeLLM:
+    """
+    Deterministic stand-in for an LLM, for offline benchmarks.
+
+    Latency is drawn from a configurable distribution seeded by the prompt, so
+    the same prompt always takes the same time and returns the same text.
+    Supports invoke() and stream() like the LangChain models.
+    """
+
+    def __init__(self, latency=0.5, jitter=0.1, distribution="lognormal", time_to_first_token=0.1,
+                 output_tokens=40, seed=0, model="fake"):
+        """
+        Args:
+            latency (float): Mean request latency in seconds
+            jitter (float): Spread of the latency (standard deviation, or sigma for lognormal)
+            distribution (str): "constant", "normal", "lognormal" or "exponential"
+            time_to_first_token (float): Seconds before the first streamed chunk
+            output_tokens (int): Words in each response
+            seed (int): Seed combined with the prompt hash
+            model (str): Model name reported in results
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.time_to_first_token = min(time_to_first_token, latency)
+        self.output_tokens = output_tokens
+        self.seed = seed
+        self.model = model
+
+    def _rng(self, prompt):
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _latency(self, rng):
+        if self.distribution == "constant":
+            value = self.latency
+        elif self.distribution == "normal":
+            value = rng.gauss(self.latency, self.jitter)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1 / self.latency)
+        else:
+            value = self.latency * rng.lognormvariate(0, self.jitter)
+        return max(self.time_to_first_token, value)
+
+    def _response(self, rng):
+        return " ".join(f"token{rng.randint(0, 999)}" for _ in range(self.output_tokens))
+
+    def invoke(self, prompt):
+        rng = self._rng(prompt)
+        time.sleep(self._latency(rng))
+        return self._response(rng)
+
+    def stream(self, prompt):
+        rng = self._rng(prompt)
+        latency = self._latency(rng)
+        words = self._response(rng).split(" ")
+        time.sleep(self.time_to_first_token)
+        step = (latency - self.time_to_first_token) / max(1, len(words) - 1)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(step)
+            yield word if i == 0 else " " + word
+
+
+class LLMBackend:
+    """Benchmark backend that times one request to an LLM, streaming when possible"""
+
+    def __init__(self, llm, name=None, stream=True):
+        """
+        Args:
+            llm: Object with invoke() (and optionally stream()), e.g. get_llm(...) or FakeLLM
+            name (str, optional): Name reported in results. Defaults to the model name
+            stream (bool): Use stream() to measure time-to-first-token
+        """
+        self.llm = llm
+        self.name = name or getattr(llm, "model_name", None) or getattr(llm, "model", "llm")
+        self.stream = stream and hasattr(llm, "stream")
+
+    def run(self, prompt):
+        """
+        Send one prompt.
+
+        Returns:
+            dict: latency and time_to_first_token (seconds), output_tokens
+        """
+        start_time = time.perf_counter()
+        first_token = None
+        if self.stream:
+            parts = []
+            for chunk in self.llm.stream(prompt):
+                if first_token is None:
+                    first_token = time.perf_counter() - start_time
+                parts.append(chunk.content if hasattr(chunk, "content") else str(chunk))
+            text = "".join(parts)
+        else:
+            response = self.llm.invoke(prompt)
+            text = response.content if hasattr(response, "content") else str(response)
+        latency = time.perf_counter() - start_time
+        return {
+            "latency": latency,
+            "time_to_first_token": first_token if first_token is not None else latency,
+            "output_tokens": estimate_tokens(text),
+        }
+
+
+def fake_backend(**kwargs):
+    """LLMBackend around a FakeLLM (kwargs are passed to FakeLLM)"""
+    llm = FakeLLM(**kwargs)
+    return LLMBackend(llm, name=llm.model)
+
+
+def llm_backend(model_name, use_openai=False, stream=True):
+    """LLMBackend around a real model from get_llm, with the response cache turned off"""
+    from utils.my_llm_utils import get_llm
+    return LLMBackend(get_llm(use_openai=use_openai, model_name=model_name, cache=False),
+                      name=model_name, stream=stream)
+
+
+def _run_trial(backend, prompts, concurrency):
+    """Send every prompt once with the given concurrency; returns samples and wall time"""
+    samples = []
+    lock = threading.Lock()
+
+    def send(prompt):
+        sample = backend.run(prompt)
+        with lock:
+            samples.append(sample)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, prompts))
+    return samples, time.perf_counter() - start_time
+
+
+def run_benchmark(backend, prompts, concurrency_levels=(1, 2, 4), trials=3, warmup=1):
+    """
+    Measure latency and throughput of a backend at several concurrency levels.
+
+    At each level, warmup requests are sent first and excluded from the
+    results, then the prompts are sent trials times.
+
+    Args:
+        backend: Object with run(prompt) -> dict, e.g. LLMBackend
+        prompts (list[str]): Prompts sent in each trial
+        concurrency_levels (tuple[int]): Numbers of requests in flight to test
+        trials (int): Repetitions of the prompt set per level
+        warmup (int): Requests sent before measuring at each level
+
+    Returns:
+        dict: Machine-readable results (see save_results), one entry per concurrency level
+    """
+    levels = []
+    for concurrency in concurrency_levels:
+        for prompt in prompts[:warmup]:
+            backend.run(prompt)
+
+        samples = []
+        wall_time = 0.0
+        for _ in range(trials):
+            trial_samples, trial_time = _run_trial(backend, prompts, concurrency)
+            samples.extend(trial_samples)
+            wall_time += trial_time
+
+        output_tokens = sum(sample["output_tokens"] for sample in samples)
+        levels.append({
+            "concurrency": concurrency,
+            "requests": len(samples),
+            "wall_time": wall_time,
+            "requests_per_second": len(samples) / wall_time if wall_time else 0.0,
+            "tokens_per_second": output_tokens / wall_time if wall_time else 0.0,
+            "latency": latency_summary([sample["latency"] for sample in samples]),
+            "time_to_first_token": latency_summary([sample["time_to_first_token"] for sample in samples]),
+        })
+        print(f"{backend.name} @ concurrency {concurrency}: {levels[-1]['requests_per_second']:.2f} req/s, "
+              f"p95 {levels[-1]['latency']['p95']:.3f}s")
+
+    return {
+        "backend": backend.name,
+        "timestamp": datetime.now().isoformat(),
+        "prompts": len(prompts),
+        "trials": trials,
+        "warmup": warmup,
+        "levels": levels,
+    }
+
+
+def save_results(results, path):
+    """Write benchmark results to a JSON file"""
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+def load_results(path):
+    """Read benchmark results written by save_results"""
+    with open(path, "r", encoding="utf-8") as infile:
+        return json.load(infile)
+
+
+def compare_results(baseline, current, tolerance=None):
+    """
+    Find regressions between two benchmark runs.
+
+    A regression is a p95 latency or time-to-first-token increase, or a
+    requests/tokens per second decrease, of more than tolerance at the same
+    concurrency level.
+
+    Args:
+        baseline (dict): Earlier results
+        current (dict): New results
+        tolerance (float, optional): Allowed relative change. If None, uses BENCHMARK_TOLERANCE
+
+    Returns:
+        list[str]: One message per regression (empty if none)
+    """
+    tolerance = BENCHMARK_TOLERANCE if tolerance is None else tolerance
+    baseline_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    regressions = []
+
+    for level in current["levels"]:
+        before = baseline_levels.get(level["concurrency"])
+        if before is None:
+            continue
+        checks = [
+            ("p95 latency", before["latency"]["p95"], level["latency"]["p95"], True),
+            ("p95 time to first token", before["time_to_first_token"]["p95"], level["time_to_first_token"]["p95"], True),
+            ("requests/sec", before["requests_per_second"], level["requests_per_second"], False),
+            ("tokens/sec", before["tokens_per_second"], level["tokens_per_second"], False),
+        ]
+        for metric, old, new, lower_is_better in checks:
+            if not old:
+                continue
+            change = (new - old) / old
+            if (lower_is_better and change > tolerance) or (not lower_is_better and change < -tolerance):
+                regressions.append(f"concurrency {level['concurrency']}: {metric} {old:.3f} -> {new:.3f} ({change:+.1%})")
+
+    return regressions
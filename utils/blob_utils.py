@@ -0,0 +1,229 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+
+import pandas as pd
+
+# Content-addressed store for article bodies and long summaries (override via env vars)
+BLOB_STORE_ENABLED = os.getenv("BLOB_STORE_ENABLED", "true").lower() == "true" # default to True
+# Not under data/cache: row journals hold references, so the store must outlive cache clean-ups
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "data/blobs.sqlite")
+BLOB_MIN_CHARS = int(os.getenv("BLOB_MIN_CHARS", 200)) # shorter texts stay inline in the frame
+BLOB_CACHE_ENTRIES = int(os.getenv("BLOB_CACHE_ENTRIES", 256)) # decompressed texts kept in memory
+
+# Columns whose long texts are moved into the store (plus every "<model>_summary" column)
+BLOB_COLUMNS = ['raw_content', 'summary']
+
+# Frames hold "blob:<sha256 of the text>" in place of the text
+BLOB_PREFIX = "blob:"
+
+
+def is_blob_ref(value):
+    """True if value is a reference to a text in the blob store"""
+    return isinstance(value, str) and value.startswith(BLOB_PREFIX) and len(value) == len(BLOB_PREFIX) + 64
+
+
+def blob_columns(df):
+    """The columns of df whose texts belong in the blob store"""
+    return [column for column in df.columns if column in BLOB_COLUMNS or str(column).endswith('_summary')]
+
+
+class BlobStore:
+    """
+    Deduplicated, compressed store of texts keyed by their SHA-256.
+
+    Identical texts are stored once however many rows share them. Recently
+    read texts are kept decompressed in a small LRU cache. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path, cache_entries=None):
+        """
+        Args:
+            path (str): Path to the SQLite file (parent directory is created if needed)
+            cache_entries (int, optional): Decompressed texts kept in memory. If None, uses BLOB_CACHE_ENTRIES
+        """
+        self.path = path
+        self.cache_entries = BLOB_CACHE_ENTRIES if cache_entries is None else cache_entries
+        self.stored = 0
+        self.deduplicated = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "size INTEGER NOT NULL, compressed_size INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    def put(self, text):
+        """
+        Store a text.
+
+        Returns:
+            str: Its reference ("blob:<sha256>")
+        """
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        compressed = zlib.compress(data, 6)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, data, size, compressed_size) VALUES (?, ?, ?, ?)",
+                (digest, compressed, len(data), len(compressed)),
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                self.stored += 1
+            else:
+                self.deduplicated += 1
+        return BLOB_PREFIX + digest
+
+    def get(self, ref):
+        """
+        Load the text behind a reference.
+
+        Returns:
+            str: The text, or None if the store does not have it
+        """
+        digest = ref[len(BLOB_PREFIX):]
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+            row = self._conn.execute("SELECT data FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+
+        text = zlib.decompress(row[0]).decode('utf-8')
+        with self._lock:
+            self._cache[digest] = text
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return text
+
+    def stats(self):
+        """
+        Return store counters.
+
+        Returns:
+            dict: stored and deduplicated (texts put this run), blobs, bytes (uncompressed)
+            and compressed_bytes (in total)
+        """
+        with self._lock:
+            blobs, size, compressed = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(compressed_size), 0) FROM blobs"
+            ).fetchone()
+        return {'stored': self.stored, 'deduplicated': self.deduplicated, 'blobs': blobs,
+                'bytes': size, 'compressed_bytes': compressed}
+
+
+_blob_store = None
+_blob_store_lock = threading.Lock()
+
+
+def _shared_blob_store():
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore(BLOB_STORE_PATH)
+        return _blob_store
+
+
+def get_blob_store():
+    """Return the shared blob store, or None if it is disabled"""
+    return _shared_blob_store() if BLOB_STORE_ENABLED else None
+
+
+def to_blob(value):
+    """Move a long text into the blob store and return its reference; anything else is returned as-is"""
+    store = get_blob_store()
+    if store is None or not isinstance(value, str) or len(value) < BLOB_MIN_CHARS or is_blob_ref(value):
+        return value
+    return store.put(value)
+
+
+def resolve(value):
+    """Return the text behind a blob reference; anything else is returned as-is"""
+    if not is_blob_ref(value):
+        return value
+    # References made before the store was disabled are still read from it
+    store = _shared_blob_store()
+    text = store.get(value)
+    if text is None:
+        raise KeyError(f"{value} is not in the blob store at {store.path}")
+    return text
+
+
+def intern_columns(df, columns=None):
+    """
+    Replace the long texts in a frame's blob columns with references, in place.
+
+    Args:
+        df (pd.DataFrame): Frame to update
+        columns (list[str], optional): Columns to intern. If None, uses blob_columns(df)
+
+    Returns:
+        pd.DataFrame: df
+    """
+    if get_blob_store() is None:
+        return df
+    for column in blob_columns(df) if columns is None else columns:
+        values = df[column]
+        long_texts = values.map(lambda value: isinstance(value, str) and len(value) >= BLOB_MIN_CHARS
+                                and not is_blob_ref(value)).astype(bool)
+        if long_texts.any():
+            df[column] = values.astype(object)
+            df.loc[long_texts, column] = values[long_texts].map(to_blob)
+    return df
+
+
+def resolve_columns(df, columns=None):
+    """
+    Copy of a frame with the blob references in its blob columns replaced by their texts.
+
+    Args:
+        df (pd.DataFrame): Frame holding references
+        columns (list[str], optional): Columns to resolve. If None, uses blob_columns(df)
+
+    Returns:
+        pd.DataFrame: The copy (df itself if there is nothing to resolve)
+    """
+    columns = blob_columns(df) if columns is None else columns
+    refs = {column: df[column].map(is_blob_ref).astype(bool) for column in columns}
+    if not any(mask.any() for mask in refs.values()):
+        return df
+    resolved = df.copy()
+    for column, mask in refs.items():
+        if mask.any():
+            resolved[column] = resolved[column].astype(object)
+            resolved.loc[mask, column] = df.loc[mask, column].map(resolve)
+    return resolved
+
+
+@pd.api.extensions.register_series_accessor("blob")
+class BlobAccessor:
+    """
+    Lazy access to the texts behind a column of blob references.
+
+        df['raw_content'].blob.text()     # whole column, resolved
+        df['raw_content'].blob[idx]       # one row, loaded on demand
+    """
+
+    def __init__(self, series):
+        self._series = series
+
+    def __getitem__(self, index):
+        return resolve(self._series[index])
+
+    def text(self):
+        """The column with every reference replaced by its text"""
+        return self._series.map(resolve)
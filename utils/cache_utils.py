@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def make_cache_key(*parts):
+    """
+    Build a stable cache key from JSON-serializable parts.
+
+    Args:
+        *parts: Values identifying the cached item (query, parameters, ...)
+
+    Returns:
+        str: Hex SHA-256 digest of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache stored in a single SQLite file.
+
+    Values are stored as JSON. Entries can carry a TTL, and the cache is kept
+    under max_bytes / max_entries by evicting the least recently used entries.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path, max_bytes=None, max_entries=None):
+        """
+        Args:
+            path (str): Path to the SQLite file (parent directory is created if needed)
+            max_bytes (int, optional): Maximum total size of stored values. None for no limit
+            max_entries (int, optional): Maximum number of entries. None for no limit
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Look up a value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+            ttl (float, optional): Time to live in seconds. None never expires
+        """
+        payload = json.dumps(value)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, expires_at, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        """Drop expired entries, then least recently used ones until under the limits"""
+        self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        over_entries = self.max_entries is not None and count > self.max_entries
+        over_bytes = self.max_bytes is not None and total > self.max_bytes
+        if not (over_entries or over_bytes):
+            return
+
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY last_access ASC"):
+            if not ((self.max_entries is not None and count > self.max_entries)
+                    or (self.max_bytes is not None and total > self.max_bytes)):
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def delete(self, key):
+        """Remove a single entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, entries and bytes
+        """
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
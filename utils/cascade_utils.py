@@ -0,0 +1,146 @@
+import os
+import re
+import threading
+
+# Local-first validation cascade (override via env vars)
+CASCADE_VALIDATION = os.getenv("CASCADE_VALIDATION", "false").lower() == "true" # default to False
+CASCADE_LOCAL_MODEL = os.getenv("CASCADE_LOCAL_MODEL", "gemma3:1b") # cheap Ollama model asked first
+CASCADE_ACCEPT_CONFIDENCE = int(os.getenv("CASCADE_ACCEPT_CONFIDENCE", 90)) # min confidence (0-100) to accept locally
+CASCADE_REJECT_CONFIDENCE = int(os.getenv("CASCADE_REJECT_CONFIDENCE", 70)) # min confidence (0-100) to reject locally
+
+# OpenAI prices in USD per million (input, output) tokens, for the cost report
+MODEL_PRICES = {
+    'gpt-4': (30.00, 60.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-3.5-turbo': (0.50, 1.50),
+}
+
+# "yes,no,yes,85" (answers then confidence); stray spaces, dots, asterisks and a % are tolerated
+CONFIDENT_ANSWER = re.compile(r'^\W*(yes|no)\W*,\W*(yes|no)\W*,\W*(yes|no)\W*,\W*(\d{1,3})\s*%?\W*$')
+
+
+def estimate_cost(model, prompt_tokens, response_tokens):
+    """Cost in USD of a request to an OpenAI model (0.0 for models without a known price)"""
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + response_tokens * output_price) / 1e6
+
+
+def parse_confident_answer(answer):
+    """
+    Parse three yes/no answers followed by a confidence.
+
+    Args:
+        answer (str): e.g. "yes,yes,no,85"
+
+    Returns:
+        tuple[list[str], int]: (answers, confidence 0-100), or None if the answer is malformed
+    """
+    match = CONFIDENT_ANSWER.match(answer.strip().lower())
+    if not match or int(match.group(4)) > 100:
+        return None
+    return [match.group(1), match.group(2), match.group(3)], int(match.group(4))
+
+
+def is_clear_verdict(answers, confidence, accept_confidence=None, reject_confidence=None):
+    """
+    Whether a local verdict is clear enough to keep without asking the OpenAI model.
+
+    Accepting (all three answers yes) adds a partnership to the results, so it
+    needs the higher CASCADE_ACCEPT_CONFIDENCE; rejecting needs
+    CASCADE_REJECT_CONFIDENCE.
+    """
+    accept_confidence = CASCADE_ACCEPT_CONFIDENCE if accept_confidence is None else accept_confidence
+    reject_confidence = CASCADE_REJECT_CONFIDENCE if reject_confidence is None else reject_confidence
+    accepted = all(answer == 'yes' for answer in answers)
+    return confidence >= (accept_confidence if accepted else reject_confidence)
+
+
+class CascadeStats:
+    """
+    Counters for the validation cascade. Safe to share between threads.
+
+    Each validated pair is either resolved by the local model or escalated to
+    the OpenAI model, because the local answer was malformed or not confident
+    enough, or the local request failed. Latency is summed per tier; cost is that of the OpenAI requests
+    made, and saved_cost estimates what the locally resolved pairs would have
+    cost at the average OpenAI cost per escalated pair.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.pairs = 0
+            self.resolved_locally = 0
+            self.malformed = 0
+            self.low_confidence = 0
+            self.errors = 0
+            self.local_requests = 0
+            self.local_seconds = 0.0
+            self.remote_requests = 0
+            self.remote_seconds = 0.0
+            self.remote_cost = 0.0
+
+    def record_local(self, seconds, verdicts):
+        """
+        Record one local request.
+
+        Args:
+            seconds (float): Request latency (None for a cache hit or a failed request)
+            verdicts (list[str]): "clear", "malformed", "low_confidence" or "error" for each pair
+        """
+        with self._lock:
+            self.local_requests += 1
+            self.local_seconds += seconds or 0.0
+            self.pairs += len(verdicts)
+            self.resolved_locally += verdicts.count("clear")
+            self.malformed += verdicts.count("malformed")
+            self.low_confidence += verdicts.count("low_confidence")
+            self.errors += verdicts.count("error")
+
+    def record_remote(self, seconds, model, usage):
+        """Record one OpenAI request (usage is (prompt_tokens, response_tokens), None for a cache hit)"""
+        with self._lock:
+            self.remote_requests += 1
+            self.remote_seconds += seconds or 0.0
+            if usage:
+                self.remote_cost += estimate_cost(model, *usage)
+
+    def stats(self):
+        """
+        Return the cascade counters.
+
+        Returns:
+            dict: pairs, resolved_locally, escalated (malformed + low_confidence + errors), escalation_rate,
+            local/remote requests and seconds, cost and saved_cost (USD)
+        """
+        with self._lock:
+            escalated = self.malformed + self.low_confidence + self.errors
+            cost_per_pair = self.remote_cost / escalated if escalated else 0.0
+            return {
+                'pairs': self.pairs,
+                'resolved_locally': self.resolved_locally,
+                'escalated': escalated,
+                'malformed': self.malformed,
+                'low_confidence': self.low_confidence,
+                'errors': self.errors,
+                'escalation_rate': escalated / self.pairs if self.pairs else 0.0,
+                'local_requests': self.local_requests,
+                'local_seconds': self.local_seconds,
+                'remote_requests': self.remote_requests,
+                'remote_seconds': self.remote_seconds,
+                'cost': self.remote_cost,
+                'saved_cost': self.resolved_locally * cost_per_pair,
+            }
+
+
+_cascade_stats = CascadeStats()
+
+
+def get_cascade_stats():
+    """Return the shared cascade counters"""
+    return _cascade_stats
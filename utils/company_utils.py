@@ -0,0 +1,196 @@
+import json
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+from utils.storage_utils import open_storage
+
+# Extra aliases (JSON object of alias -> canonical name), merged over DEFAULT_ALIASES
+COMPANY_ALIASES_PATH = os.getenv("COMPANY_ALIASES_PATH", "data/company_aliases.json")
+# Persistent index of existing partnerships, rebuilt when the source CSV changes
+COMPANY_INDEX_PATH = os.getenv("COMPANY_INDEX_PATH", "data/cache/company_index.json")
+
+# Legal-form suffixes and articles that don't change which company a name refers to
+COMPANY_SUFFIXES = ['inc', 'incorporated', 'ltd', 'limited', 'llc', 'corp', 'corporation',
+                    'co', 'plc', 'gmbh', 'ag', 'sa', 'holdings', 'group']
+COMPANY_PREFIXES = ['the', 'a', 'an']
+
+# Different names for the same company (canonical form on both sides)
+DEFAULT_ALIASES = {
+    'facebook': 'meta',
+    'meta platforms': 'meta',
+    'amazon web services': 'aws',
+    'international business machines': 'ibm',
+    'hewlett packard enterprise': 'hpe',
+    'open ai': 'openai',
+}
+
+# Display clean-up used for names extracted by the LLM (keeps the original case)
+_DISPLAY_SUFFIX = re.compile(r'\s+(Inc\.?|Ltd\.?|LLC|Corp\.?|Corporation)$', re.IGNORECASE)
+_DISPLAY_PREFIX = re.compile(r'^(The|A|An)\s+', re.IGNORECASE)
+
+# Canonicalization steps, applied in order to lower-cased, NFKD-decomposed names.
+# Shared by the scalar and the vectorized (pandas .str) versions.
+CANONICAL_STEPS = [
+    ('[\u0300-\u036f]', ''),                                          # accents: "nestlé" -> "nestle"
+    (r"['’`]", ''),                                                  # "Moody's" -> "moodys"
+    (r'[^a-z0-9&]+', ' '),                                           # punctuation -> space
+    (r'^\s*(?:' + '|'.join(COMPANY_PREFIXES) + r')\s+', ''),        # leading article
+    (r'(?:\s+(?:' + '|'.join(COMPANY_SUFFIXES) + r'))+\s*$', ''),   # trailing legal forms
+    (r'\s+', ' '),
+]
+_CANONICAL_STEPS = [(re.compile(pattern), replacement) for pattern, replacement in CANONICAL_STEPS]
+
+
+def clean_company_name(name):
+    """Strip legal suffixes, leading articles and quotes from a company name, keeping its case"""
+    name = _DISPLAY_SUFFIX.sub('', name)
+    name = _DISPLAY_PREFIX.sub('', name)
+    return name.strip('"\'')
+
+
+def load_aliases(path=None):
+    """Return DEFAULT_ALIASES merged with the aliases file, if it exists"""
+    aliases = dict(DEFAULT_ALIASES)
+    path = path or COMPANY_ALIASES_PATH
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as infile:
+            aliases.update({canonical_company_name(k, {}): canonical_company_name(v, {})
+                            for k, v in json.load(infile).items()})
+    return aliases
+
+
+_aliases = None
+
+
+def get_aliases():
+    """Return the shared alias table, loaded on first use"""
+    global _aliases
+    if _aliases is None:
+        _aliases = load_aliases()
+    return _aliases
+
+
+def canonical_company_name(name, aliases=None):
+    """
+    Canonical form of a company name used for matching.
+
+    "The Microsoft Corp." and "microsoft" both become "microsoft";
+    aliases map alternative names ("Facebook") to one company ("meta").
+
+    Args:
+        name (str): Company name
+        aliases (dict, optional): Alias table. If None, uses get_aliases()
+
+    Returns:
+        str: Canonical name ('' if the name is empty or not a string)
+    """
+    if not isinstance(name, str):
+        return ''
+    aliases = get_aliases() if aliases is None else aliases
+    name = unicodedata.normalize('NFKD', name.lower().strip())
+    for pattern, replacement in _CANONICAL_STEPS:
+        name = pattern.sub(replacement, name)
+    name = name.strip()
+    return aliases.get(name, name)
+
+
+def canonical_company_names(series, aliases=None):
+    """
+    Vectorized canonical_company_name over a pandas Series.
+
+    Non-string values become ''.
+    """
+    aliases = get_aliases() if aliases is None else aliases
+    names = series.where(series.map(lambda value: isinstance(value, str)), '').astype(str).str.lower().str.strip()
+    names = names.str.normalize('NFKD')
+    for pattern, replacement in CANONICAL_STEPS:
+        names = names.str.replace(pattern, replacement, regex=True)
+    names = names.str.strip()
+    return names.map(lambda name: aliases.get(name, name))
+
+
+def company_pair(partner1, partner2):
+    """Order-independent key for a pair of companies"""
+    return frozenset([canonical_company_name(partner1), canonical_company_name(partner2)])
+
+
+class CompanyIndex:
+    """
+    Set of known partnerships keyed on canonical company names.
+
+    Membership checks are O(1) and ignore order, case, legal suffixes and
+    aliases, so "Microsoft Corp" / "OpenAI" matches an existing "Microsoft" /
+    "OpenAI" row.
+    """
+
+    def __init__(self, pairs=None):
+        self.pairs = set(pairs or ())
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __contains__(self, pair):
+        partner1, partner2 = pair
+        return self.contains(partner1, partner2)
+
+    def contains(self, partner1, partner2):
+        """Check whether a partnership between two companies is already known"""
+        return company_pair(partner1, partner2) in self.pairs
+
+    def add(self, partner1, partner2):
+        """Record a partnership between two companies"""
+        self.pairs.add(company_pair(partner1, partner2))
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build the index from the partner1/partner2 columns of a DataFrame"""
+        partner1 = canonical_company_names(df['partner1'])
+        partner2 = canonical_company_names(df['partner2'])
+        valid = (partner1 != '') & (partner2 != '')
+        return cls(frozenset(pair) for pair in zip(partner1[valid], partner2[valid]))
+
+    @classmethod
+    def from_csv(cls, csv_path, cache_path=None):
+        """
+        Load the index for a partnerships CSV.
+
+        The index is cached on disk and reused while the CSV's size and
+        modification time (and the aliases and canonicalization steps) are
+        unchanged, so large histories load quickly.
+
+        Args:
+            csv_path (str): Path to the partnerships CSV
+            cache_path (str, optional): Index cache file. If None, uses COMPANY_INDEX_PATH
+
+        Returns:
+            CompanyIndex: Index of the partnerships in the CSV
+        """
+        cache_path = cache_path or COMPANY_INDEX_PATH
+        stat = os.stat(csv_path)
+        source = {'path': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime': stat.st_mtime,
+                  'aliases': sorted(get_aliases().items()), 'steps': CANONICAL_STEPS}
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as infile:
+                    cached = json.load(infile)
+                if cached.get('source') == json.loads(json.dumps(source)):
+                    return cls(frozenset(pair) for pair in cached['pairs'])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass
+
+        index = cls.from_dataframe(open_storage(csv_path).read(columns=['partner1', 'partner2']))
+        if cache_path:
+            index.save(cache_path, source)
+        return index
+
+    def save(self, path, source=None):
+        """Write the index to a JSON file"""
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as outfile:
+            json.dump({'source': source, 'pairs': [sorted(pair) for pair in self.pairs]}, outfile)
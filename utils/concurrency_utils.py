@@ -0,0 +1,83 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Maximum number of in-flight requests per provider (override via env vars)
+PROVIDER_CONCURRENCY = {
+    "tavily": int(os.getenv("TAVILY_CONCURRENCY", 4)),
+    "openai": int(os.getenv("OPENAI_CONCURRENCY", 4)),
+    "ollama": int(os.getenv("OLLAMA_CONCURRENCY", 1)),  # a single local host serves one request at a time
+}
+
+# Number of rows update_partnerships processes at once (1 = serial, the original behaviour)
+UPDATE_MAX_WORKERS = int(os.getenv("UPDATE_MAX_WORKERS", 1))
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+
+def set_provider_concurrency(provider, limit):
+    """
+    Set the maximum number of in-flight requests for a provider.
+
+    Should be called before a run starts; requests already holding a slot
+    keep the old limit until they finish.
+
+    Args:
+        provider (str): Provider name, e.g. "tavily", "openai" or "ollama"
+        limit (int): Maximum number of concurrent requests (at least 1)
+    """
+    limit = max(1, int(limit))
+    with _semaphores_lock:
+        PROVIDER_CONCURRENCY[provider] = limit
+        _semaphores[provider] = threading.BoundedSemaphore(limit)
+
+
+def get_provider_semaphore(provider):
+    """Return the shared semaphore bounding in-flight requests for a provider"""
+    with _semaphores_lock:
+        if provider not in _semaphores:
+            limit = max(1, PROVIDER_CONCURRENCY.get(provider, 1))
+            _semaphores[provider] = threading.BoundedSemaphore(limit)
+        return _semaphores[provider]
+
+
+@contextmanager
+def provider_slot(provider):
+    """
+    Hold one of the provider's concurrency slots for the duration of a request.
+
+    Args:
+        provider (str): Provider name, e.g. "tavily", "openai" or "ollama"
+    """
+    semaphore = get_provider_semaphore(provider)
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+def map_in_order(func, items, max_workers=1):
+    """
+    Apply func to every item, optionally on a thread pool.
+
+    Results are always returned in the order of the input items, regardless of
+    the order in which the work completes, so callers can write them back
+    deterministically.
+
+    Args:
+        func (callable): Function applied to each item
+        items (iterable): Items to process
+        max_workers (int): Number of worker threads. 1 runs serially in the calling thread
+
+    Returns:
+        list: func(item) for each item, in input order
+    """
+    items = list(items)
+    if not max_workers or max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
@@ -1,8 +1,26 @@
 import asyncio
+import atexit
+import os
+import queue
+import threading
+from urllib.parse import urlparse
+
 import nest_asyncio
 nest_asyncio.apply()
 from crawl4ai import AsyncWebCrawler, CacheMode, BrowserConfig, CrawlerRunConfig
 
+from utils.page_store_utils import get_page_store, page_validators
+from utils.trace_utils import span
+from utils.retry_utils import RetryQueue, call_with_retry, is_retryable
+
+# Number of warm browsers kept by the crawler session, and how many of them may
+# hit the same domain at once (override via env vars)
+CRAWLER_POOL_SIZE = int(os.getenv("CRAWLER_POOL_SIZE", 3))
+CRAWLER_PER_DOMAIN_LIMIT = int(os.getenv("CRAWLER_PER_DOMAIN_LIMIT", 2))
+CRAWLER_BROWSER = os.getenv("CRAWLER_BROWSER", "firefox")
+# crawl4ai cache mode: "bypass" (always fetch), "enabled", "read_only", "write_only" or "disabled"
+CRAWLER_CACHE_MODE = os.getenv("CRAWLER_CACHE_MODE", "bypass")
+
 # async def simple_crawl():
 #     # Create browser config specifying Firefox
 #     browser_config = BrowserConfig(browser_type="firefox")
@@ -24,9 +42,162 @@ from crawl4ai import AsyncWebCrawler, CacheMode, BrowserConfig, CrawlerRunConfig
 
 #------------------------------------------------------------
 
+def _markdown(result):
+    """Return the raw markdown of a crawl result, raising if the crawl failed"""
+    if not getattr(result, 'success', True):
+        raise RuntimeError(f"Crawl failed for {result.url}: {getattr(result, 'error_message', '')}")
+    markdown = result.markdown
+    return getattr(markdown, 'raw_markdown', markdown)
+
+
+class CrawlerSession:
+    """
+    Long-lived pool of started AsyncWebCrawler instances.
+
+    Starting a browser dominates the cost of crawling a single page, so the
+    session starts pool_size browsers once and hands them out to requests.
+    At most per_domain_limit requests hit the same domain at a time.
+
+    Use as an async context manager, or call start() / close() explicitly.
+    """
+
+    def __init__(self, pool_size=None, per_domain_limit=None, browser_type=None, cache_mode=None):
+        """
+        Args:
+            pool_size (int, optional): Number of browsers. If None, uses CRAWLER_POOL_SIZE
+            per_domain_limit (int, optional): Max concurrent requests per domain. If None, uses CRAWLER_PER_DOMAIN_LIMIT
+            browser_type (str, optional): "firefox", "chromium" or "webkit". If None, uses CRAWLER_BROWSER
+            cache_mode (str, optional): crawl4ai cache mode name. If None, uses CRAWLER_CACHE_MODE
+        """
+        self.pool_size = pool_size or CRAWLER_POOL_SIZE
+        self.per_domain_limit = per_domain_limit or CRAWLER_PER_DOMAIN_LIMIT
+        self.browser_config = BrowserConfig(browser_type=browser_type or CRAWLER_BROWSER)
+        self.run_config = CrawlerRunConfig(cache_mode=CacheMode[(cache_mode or CRAWLER_CACHE_MODE).upper()])
+        self._crawlers = []
+        self._available = None
+        self._domain_limits = {}
+
+    async def start(self):
+        """Start the browsers in the pool"""
+        self._available = asyncio.Queue()
+        for _ in range(self.pool_size):
+            crawler = AsyncWebCrawler(config=self.browser_config)
+            await crawler.start()
+            self._crawlers.append(crawler)
+            self._available.put_nowait(crawler)
+        return self
+
+    async def close(self):
+        """Shut down every browser in the pool"""
+        for crawler in self._crawlers:
+            await crawler.close()
+        self._crawlers = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _domain_limit(self, url):
+        domain = urlparse(url).netloc.lower()
+        if domain not in self._domain_limits:
+            self._domain_limits[domain] = asyncio.Semaphore(self.per_domain_limit)
+        return self._domain_limits[domain]
+
+    async def fetch(self, url):
+        """
+        Crawl one page with a browser from the pool.
+
+        Args:
+            url (str): The URL to crawl
+
+        Returns:
+            tuple: (raw markdown, response headers dict)
+        """
+        async with self._domain_limit(url):
+            crawler = await self._available.get()
+            try:
+                result = await crawler.arun(url=url, config=self.run_config)
+            finally:
+                self._available.put_nowait(crawler)
+        return _markdown(result), getattr(result, 'response_headers', None) or {}
+
+    async def crawl(self, url):
+        """
+        Crawl one page with a browser from the pool.
+
+        Args:
+            url (str): The URL to crawl
+
+        Returns:
+            str: The raw markdown content of the crawled webpage
+        """
+        markdown, _ = await self.fetch(url)
+        return markdown
+
+    async def _crawl_with_url(self, url, on_page=None):
+        try:
+            markdown, headers = await self.fetch(url)
+            if on_page:
+                on_page(url, markdown, headers)
+        except Exception as e:
+            return url, None, e
+        return url, markdown, None
+
+    async def crawl_many(self, urls, on_page=None):
+        """
+        Crawl many pages concurrently, yielding results as they complete.
+
+        Args:
+            urls (list[str]): URLs to crawl
+            on_page (callable, optional): Called with (url, markdown, headers) for every page crawled
+
+        Yields:
+            tuple: (url, markdown or None, exception or None), in completion order
+        """
+        tasks = [asyncio.ensure_future(self._crawl_with_url(url, on_page)) for url in urls]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+
+# The shared session runs on its own event loop in a background thread, so it
+# stays alive between synchronous calls and can be used from worker threads.
+_session = None
+_loop = None
+_session_lock = threading.Lock()
+
+
+def get_crawler_session():
+    """Return the shared CrawlerSession, starting it (and its event loop thread) on first use"""
+    global _session, _loop
+    with _session_lock:
+        if _session is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="crawler-session", daemon=True).start()
+            _session = asyncio.run_coroutine_threadsafe(CrawlerSession().start(), _loop).result()
+        return _session
+
+
+def close_crawler_session():
+    """Shut down the shared session's browsers and event loop"""
+    global _session, _loop
+    with _session_lock:
+        if _session is None:
+            return
+        asyncio.run_coroutine_threadsafe(_session.close(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _session, _loop = None, None
+
+atexit.register(close_crawler_session)
+
+
 async def crawlWeb(url):
     """
     Crawl a webpage and return its text content.
+
+    Starts and stops a browser for this one page; use crawl_url / crawl_urls
+    (or a CrawlerSession) to reuse warm browsers across pages.
     
     Args:
         url (str): The URL to crawl
@@ -34,28 +205,30 @@ async def crawlWeb(url):
     Returns:
         str: The raw markdown content of the crawled webpage
     """
-    # Create browser config specifying Firefox
-    browser_config = BrowserConfig(browser_type="firefox")
-    
-    # Create crawler run config with cache bypassed
-    crawler_run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
-    
-    # Initialize the crawler with Firefox browser config
-    async with AsyncWebCrawler() as crawler:
-        # Override the browser config when running
-        result = await crawler.arun(
-            url=url,
-            config=crawler_run_config,
-            browser_config=browser_config
-        )
-    
-    # Return the raw markdown content
-    return result.markdown.raw_markdown
+    async with CrawlerSession(pool_size=1) as session:
+        return await session.crawl(url)
+
+def _store_page(url, markdown, headers):
+    """Save a crawled page in the page store with its ETag / Last-Modified (empty pages are not stored)"""
+    store = get_page_store()
+    if store and markdown:
+        etag, last_modified = page_validators(headers)
+        store.put(url, markdown, etag=etag, last_modified=last_modified)
+
+
+def _stored_page(url):
+    """Return the stored markdown for a page if it can be served without crawling"""
+    store = get_page_store()
+    return store.lookup(url) if store else None
+
 
-# Helper function to run the async crawl function synchronously
+# Synchronous crawl that reuses the shared session's warm browsers
 def crawl_url(url):
     """
-    Synchronous wrapper for crawlWeb function.
+    Crawl a webpage synchronously with the shared, long-lived crawler session.
+
+    Pages already in the page store (see utils/page_store_utils.py) are served
+    locally while fresh or while the server confirms they have not changed.
     
     Args:
         url (str): The URL to crawl
@@ -63,4 +236,92 @@ def crawl_url(url):
     Returns:
         str: The raw markdown content of the crawled webpage
     """
-    return asyncio.run(crawlWeb(url))
\ No newline at end of file
+    with span("crawl", url=url) as attrs:
+        markdown = _stored_page(url)
+        if markdown is not None:
+            attrs.update(stored=True, bytes_out=len(markdown))
+            return markdown
+
+        # Transient failures are retried with backoff; a site that keeps failing
+        # trips its own circuit breaker (see utils/retry_utils.py)
+        session = get_crawler_session()
+        markdown, headers = call_with_retry(
+            f"crawl:{urlparse(url).netloc}",
+            lambda: asyncio.run_coroutine_threadsafe(session.fetch(url), _loop).result(),
+            attrs=attrs, limiter_provider="crawl")
+        attrs.update(stored=False, bytes_out=len(markdown or ""))
+        _store_page(url, markdown, headers)
+        return markdown
+
+
+def iter_crawl_urls(urls):
+    """
+    Crawl many pages with the shared session, yielding results as they complete.
+
+    Pages that can be served from the page store are yielded first, without crawling.
+
+    Args:
+        urls (list[str]): URLs to crawl
+
+    Yields:
+        tuple: (url, markdown or None, exception or None), in completion order
+    """
+    to_crawl = []
+    for url in urls:
+        markdown = _stored_page(url)
+        if markdown is not None:
+            yield url, markdown, None
+        else:
+            to_crawl.append(url)
+
+    if not to_crawl:
+        return
+
+    session = get_crawler_session()
+    results = queue.Queue()
+    done = object()
+
+    async def produce():
+        try:
+            async for item in session.crawl_many(to_crawl, on_page=_store_page):
+                results.put(item)
+        finally:
+            # Always wake the consumer, even if crawling failed
+            results.put(done)
+
+    future = asyncio.run_coroutine_threadsafe(produce(), _loop)
+    while True:
+        item = results.get()
+        if item is done:
+            break
+        yield item
+    # Raise whatever stopped produce() early
+    future.result()
+
+
+def crawl_urls(urls):
+    """
+    Crawl many pages concurrently with the shared session.
+
+    Pages that fail with a retryable error are crawled once more (with
+    retries, see crawl_url) after the others have finished.
+
+    Args:
+        urls (list[str]): URLs to crawl
+
+    Returns:
+        dict: URL -> raw markdown (None for pages that failed)
+    """
+    pages = {}
+    retry_queue = RetryQueue()
+    for url, markdown, error in iter_crawl_urls(urls):
+        if error:
+            print(f"Crawl error for {url}: {error}")
+            if is_retryable(error):
+                retry_queue.add(f"crawl {url}", lambda url=url: (url, crawl_url(url)), error)
+        pages[url] = markdown
+
+    succeeded, _ = retry_queue.drain()
+    for _, (url, markdown) in succeeded:
+        pages[url] = markdown
+    return pages
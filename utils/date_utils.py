@@ -0,0 +1,141 @@
+import calendar
+import re
+
+import pandas as pd
+
+# Month names and abbreviations -> month number
+MONTHS = {}
+for number, name in enumerate(['january', 'february', 'march', 'april', 'may', 'june', 'july',
+                               'august', 'september', 'october', 'november', 'december'], 1):
+    MONTHS[name] = number
+    MONTHS[name[:3]] = number
+MONTHS['sept'] = 9
+
+MONTH_ABBREVIATIONS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def _alternation(names):
+    """Regex alternation grouped by first letter, longest names first ("s(?:eptember|ept|ep)|...")"""
+    groups = {}
+    for name in sorted(names, key=len, reverse=True):
+        groups.setdefault(name[0], []).append(re.escape(name[1:]))
+    return '|'.join(f"{first}(?:{'|'.join(rests)})" for first, rests in groups.items())
+
+
+_MONTH_NAMES = _alternation(MONTHS)
+_MONTH_ABBRS = _alternation(name for name in MONTHS if len(name) == 3)
+
+# Every supported date format in one pattern, matched against lowercased text; the
+# first date in the text wins. The lookahead skips positions that cannot start a
+# date (a digit or the first letter of a month) before trying the alternatives.
+DATE_PATTERN = re.compile(
+    r'(?=[0-9adfjmnos])\b(?:'
+    rf'(?P<iso_y>20\d{{2}})-(?P<iso_m>\d{{1,2}})-(?P<iso_d>\d{{1,2}})\b'                             # 2024-10-23
+    rf'|(?P<mdy_m>{_MONTH_NAMES})\.?\s+(?P<mdy_d>\d{{1,2}})(?:st|nd|rd|th)?,\s*(?P<mdy_y>20\d{{2}})\b'  # october 23, 2024
+    rf'|(?P<dmy_d>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<dmy_m>{_MONTH_NAMES})\.?,?\s+(?P<dmy_y>20\d{{2}})\b'  # 23 october 2024
+    rf'|(?P<my_m>{_MONTH_ABBRS})-(?P<my_y>\d{{2}}|20\d{{2}})\b'                                      # oct-24
+    r')'
+)
+
+
+def _canonical(year, month, day=None):
+    """'YYYY-MM' from matched parts, or None if they are not a valid date"""
+    month = int(month) if str(month).isdigit() else MONTHS.get(month)
+    if not month or not 1 <= month <= 12:
+        return None
+    year = str(year)
+    if len(year) == 2:
+        year = f"20{year}"
+    # The day must exist in that month (no February 30th)
+    if day is not None and not 1 <= int(day) <= calendar.monthrange(int(year), month)[1]:
+        return None
+    return f"{year}-{month:02d}"
+
+
+def _match_to_canonical(match):
+    parts = match.groupdict()
+    for prefix in ('iso', 'mdy', 'dmy'):
+        if parts[f'{prefix}_y']:
+            return _canonical(parts[f'{prefix}_y'], parts[f'{prefix}_m'], parts[f'{prefix}_d'])
+    return _canonical(parts['my_y'], parts['my_m'])
+
+
+def parse_date(text):
+    """
+    Find the first date in a text.
+
+    Supports ISO ("2024-10-23"), "October 23, 2024" / "Oct 23, 2024",
+    "23 October 2024" / "23 Oct 2024" and "Oct-24".
+
+    Args:
+        text (str): Text to search
+
+    Returns:
+        str: The date as 'YYYY-MM', or None if no valid date is found
+    """
+    if not isinstance(text, str) or not text:
+        return None
+    for match in DATE_PATTERN.finditer(text.lower()):
+        canonical = _match_to_canonical(match)
+        if canonical:
+            return canonical
+    return None
+
+
+def parse_dates(texts):
+    """
+    Find the first date in every text of a Series at once.
+
+    Each distinct text is parsed once with parse_date and the results are
+    mapped back, so repeated values (e.g. a whole 'When announced' column) cost
+    one parse each. This is faster than Series.str.extract with the combined
+    pattern (see benchmarkDates.py).
+
+    Args:
+        texts (pd.Series): Texts to search (non-strings give None)
+
+    Returns:
+        pd.Series: 'YYYY-MM' strings or None, with the same index
+    """
+    texts = pd.Series(texts, dtype=object)
+    parsed = {text: parse_date(text) for text in texts.dropna().unique()}
+    return pd.Series([parsed.get(text) if isinstance(text, str) else None for text in texts],
+                     index=texts.index, dtype=object)
+
+
+# 'oct' -> '10', for parse_month_year
+_MONTH_NUMBERS = {name: f"{number:02d}" for name, number in MONTHS.items() if len(name) == 3}
+
+
+def parse_month_year(text):
+    """
+    Parse a whole 'Mon-YY' string (the format of the 'When announced' column).
+
+    Unlike parse_date, the text must be nothing but the date: 'Sep-24' and
+    'sep-2024' parse, 'Launched Sep-24' does not.
+
+    Args:
+        text (str): e.g. 'Sep-24'
+
+    Returns:
+        str: The date as 'YYYY-MM', or None if text is not a 'Mon-YY' date
+    """
+    if not isinstance(text, str):
+        return None
+    month, _, year = text.strip().partition('-')
+    month = _MONTH_NUMBERS.get(month.lower())
+    if not month or not year.isascii() or not year.isdigit():
+        return None
+    if len(year) == 2:
+        year = f"20{year}"
+    elif len(year) != 4 or not year.startswith('20'):
+        return None
+    return f"{year}-{month}"
+
+
+def to_month_year(canonical):
+    """'2024-10' -> 'Oct-24' (the format of the 'When announced' column)"""
+    if not isinstance(canonical, str) or not canonical:
+        return None
+    year, month = canonical.split('-')
+    return f"{MONTH_ABBREVIATIONS[int(month) - 1]}-{year[2:]}"
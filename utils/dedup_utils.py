@@ -0,0 +1,275 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# Near-duplicate detection for syndicated articles (override via env vars)
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true" # default to True
+NEAR_DUP_PATH = os.getenv("NEAR_DUP_PATH", "data/cache/near_duplicates.sqlite")
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", 0.7)) # estimated Jaccard similarity of shingles
+NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", 128)) # MinHash permutations; more is slower but more accurate
+NEAR_DUP_SHINGLE_SIZE = int(os.getenv("NEAR_DUP_SHINGLE_SIZE", 3)) # words per shingle
+NEAR_DUP_TTL_DAYS = float(os.getenv("NEAR_DUP_TTL_DAYS", 30)) # forget articles seen longer ago than this
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+SEED = 1
+
+
+def shingles(text, size=None):
+    """Set of word shingles (lowercased word n-grams) of a text"""
+    size = size or NEAR_DUP_SHINGLE_SIZE
+    words = re.findall(r'\w+', (text or '').lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def lsh_params(threshold, num_perm):
+    """
+    Pick (bands, rows) with bands * rows <= num_perm for a similarity threshold.
+
+    Two documents share a bucket with probability 1 - (1 - s^rows)^bands, which
+    rises most steeply around s = (1 / bands) ^ (1 / rows); choose the split
+    that puts that point closest to the threshold.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        distance = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or distance < best[0]:
+            best = (distance, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash LSH index of article texts.
+
+    Each text is reduced to a MinHash signature of its word shingles. The
+    signature is split into bands; texts sharing any band bucket are
+    candidates, and a candidate is a near-duplicate when the signatures agree
+    on at least threshold of their positions (the estimated Jaccard
+    similarity). Signatures and buckets live in SQLite so articles seen in
+    earlier runs are recognised too. Safe to share between threads.
+    """
+
+    def __init__(self, path, threshold=None, num_perm=None, ttl=None):
+        """
+        Args:
+            path (str): Path to the SQLite file (parent directory is created if needed)
+            threshold (float, optional): Similarity above which texts are duplicates. If None, uses NEAR_DUP_THRESHOLD
+            num_perm (int, optional): Signature length. If None, uses NEAR_DUP_NUM_PERM
+            ttl (float, optional): Seconds an indexed text is remembered. None to keep forever
+        """
+        self.path = path
+        self.threshold = NEAR_DUP_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or NEAR_DUP_NUM_PERM
+        self.ttl = ttl
+        self.bands, self.rows = lsh_params(self.threshold, self.num_perm)
+        self.checked = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+        generator = np.random.RandomState(SEED)
+        self._a = generator.randint(1, MAX_HASH, size=self.num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, MAX_HASH, size=self.num_perm, dtype=np.uint64)
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (doc_id TEXT PRIMARY KEY, signature BLOB NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (band INTEGER NOT NULL, bucket TEXT NOT NULL, doc_id TEXT NOT NULL, "
+            "PRIMARY KEY (band, bucket, doc_id))"
+        )
+        self._reset_if_params_changed()
+        self._expire()
+        self._conn.commit()
+
+    def _reset_if_params_changed(self):
+        """Signatures and buckets only compare under the same parameters; start over if they changed"""
+        params = f"{self.num_perm}:{self.bands}:{self.rows}:{NEAR_DUP_SHINGLE_SIZE}:{SEED}"
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if row and row[0] == params:
+            return
+        self._conn.execute("DELETE FROM documents")
+        self._conn.execute("DELETE FROM buckets")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (params,))
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        cutoff = time.time() - self.ttl
+        self._conn.execute(
+            "DELETE FROM buckets WHERE doc_id IN (SELECT doc_id FROM documents WHERE added_at < ?)", (cutoff,)
+        )
+        self._conn.execute("DELETE FROM documents WHERE added_at < ?", (cutoff,))
+
+    def signature(self, text):
+        """
+        MinHash signature of a text.
+
+        Returns:
+            np.ndarray: num_perm uint64 values, or None for a text without words
+        """
+        grams = shingles(text)
+        if not grams:
+            return None
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=4).digest(), 'little') for gram in grams],
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(MERSENNE_PRIME) & np.uint64(MAX_HASH)
+        return permuted.min(axis=0)
+
+    def _band_buckets(self, signature):
+        return [
+            (band, hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest())
+            for band in range(self.bands)
+        ]
+
+    def _find(self, signature, buckets):
+        """Most similar indexed document at or above the threshold, as (doc_id, similarity)"""
+        candidates = set()
+        for band, bucket in buckets:
+            candidates.update(doc_id for (doc_id,) in self._conn.execute(
+                "SELECT doc_id FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+
+        best = None
+        for doc_id in candidates:
+            row = self._conn.execute("SELECT signature FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is None:
+                continue
+            similarity = float(np.mean(np.frombuffer(row[0], dtype=np.uint64) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (doc_id, similarity)
+        return best
+
+    def find(self, text):
+        """
+        Look for an indexed near-duplicate of a text.
+
+        Returns:
+            tuple[str, float]: (doc_id, estimated similarity) of the closest match, or None
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._find(signature, self._band_buckets(signature))
+
+    def add(self, doc_id, text):
+        """Index a text under doc_id (replacing any text indexed under the same id)"""
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            self._add(doc_id, signature, self._band_buckets(signature))
+            self._conn.commit()
+
+    def _add(self, doc_id, signature, buckets):
+        self._conn.execute("DELETE FROM buckets WHERE doc_id = ?", (doc_id,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO documents (doc_id, signature, added_at) VALUES (?, ?, ?)",
+            (doc_id, signature.tobytes(), time.time()),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO buckets (band, bucket, doc_id) VALUES (?, ?, ?)",
+            [(band, bucket, doc_id) for band, bucket in buckets],
+        )
+
+    def remove(self, doc_id):
+        """Forget the text indexed under doc_id (e.g. an article that could not be processed)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM buckets WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def check_and_add(self, doc_id, text):
+        """
+        Return the near-duplicate of a text if one is indexed, otherwise index the text.
+
+        Checking and adding happen under one lock, so two threads offering copies
+        of the same article cannot both be treated as new.
+
+        Returns:
+            tuple[str, float]: (doc_id, similarity) of the earlier copy, or None if the text is new
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        buckets = self._band_buckets(signature)
+        with self._lock:
+            self.checked += 1
+            match = self._find(signature, buckets)
+            if match and match[0] != doc_id:
+                self.duplicates += 1
+                return match
+            self._add(doc_id, signature, buckets)
+            self._conn.commit()
+            return None
+
+    def stats(self):
+        """
+        Return index counters.
+
+        Returns:
+            dict: checked, duplicates (collapsed this run) and documents (indexed in total)
+        """
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {'checked': self.checked, 'duplicates': self.duplicates, 'documents': documents}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def collapse_near_duplicates(results, index):
+    """
+    Drop search results whose content is a near-duplicate of one already seen.
+
+    The first copy of an article (in this run or an earlier one) is kept and
+    indexed under its URL; later copies are dropped.
+
+    Args:
+        results (list[dict]): Search results with url and content
+        index (NearDuplicateIndex): Index to check and add to
+
+    Returns:
+        list[dict]: The results that are not near-duplicates, in their original order
+    """
+    kept = []
+    for result in results:
+        match = index.check_and_add(result.get('url') or '', result.get('content') or '')
+        if match:
+            print(f"Near-duplicate of {match[0]} ({match[1]:.0%} similar): {result.get('url')}")
+            continue
+        kept.append(result)
+    return kept
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index():
+    """Return the shared near-duplicate index, or None if it is disabled"""
+    global _index
+    if not NEAR_DUP_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex(NEAR_DUP_PATH, ttl=NEAR_DUP_TTL_DAYS * 24 * 3600 if NEAR_DUP_TTL_DAYS else None)
+        return _index
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+
+
+def default_journal_path(output_path):
+    """Journal file that sits next to the output file"""
+    return f"{output_path}.journal.jsonl"
+
+
+def row_key(row):
+    """Identify a row by its partners so a journal is not applied to a different input"""
+    return "|".join(str(row.get(column)) for column in ('partner1', 'partner2', 'partner3'))
+
+
+class RowJournal:
+    """
+    Append-only JSONL journal of per-row results.
+
+    Each processed row is written as one line and flushed to disk straight
+    away, so an interrupted run loses at most the rows that were in flight.
+    Once a run's output is saved the journal is deleted (see complete), so a
+    journal on disk always belongs to an unfinished run. Rows that could not
+    be finished mark the journal incomplete, which keeps it for a resume.
+    Safe to append from several threads.
+    """
+
+    def __init__(self, path, resume=True):
+        """
+        Args:
+            path (str): Path to the journal file
+            resume (bool): Keep existing entries. If False, the journal is truncated
+        """
+        self.path = path
+        self.incomplete = False
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def load(self):
+        """
+        Read the entries written so far.
+
+        A partially written last line (from a crash mid-write) is ignored.
+
+        Returns:
+            dict: Row index -> {"key": row key, "updates": {column: value}}
+        """
+        return {index: self.read_at(offset) for index, offset in self.offsets().items()}
+
+    def offsets(self):
+        """
+        Scan the journal for the position of each row's latest entry.
+
+        Only offsets are kept in memory, so large journals (with article text)
+        can be applied chunk by chunk with read_at.
+
+        Returns:
+            dict: Row index -> byte offset of its entry
+        """
+        offsets = {}
+        if not os.path.exists(self.path):
+            return offsets
+
+        with open(self.path, 'rb') as infile:
+            offset = 0
+            for line in infile:
+                try:
+                    record = json.loads(line)
+                    offsets[record['index']] = offset
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    pass
+                offset += len(line)
+        return offsets
+
+    def read_at(self, offset):
+        """Read the entry stored at a byte offset returned by offsets()"""
+        with open(self.path, 'rb') as infile:
+            infile.seek(offset)
+            record = json.loads(infile.readline())
+        return {'key': record.get('key'), 'updates': record.get('updates', {})}
+
+    def append(self, index, key, updates):
+        """
+        Record the updates for a row and flush them to disk.
+
+        Args:
+            index: Row index in the DataFrame
+            key (str): Row key (see row_key)
+            updates (dict): Column -> new value
+        """
+        if hasattr(index, 'item'):
+            index = index.item()  # numpy integer -> int
+        line = json.dumps({'index': index, 'key': key, 'updates': updates}, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def mark_incomplete(self):
+        """Keep the journal after the run: some rows still need work"""
+        self.incomplete = True
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def complete(self):
+        """
+        Delete the journal once the run's output is saved, unless it is marked incomplete.
+
+        Returns:
+            bool: True if the journal was deleted
+        """
+        self.close()
+        if self.incomplete:
+            return False
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return True
+
+
+class JournalEntries:
+    """Read-only mapping of row index -> journal entry that reads entries from disk on access"""
+
+    def __init__(self, journal):
+        self.journal = journal
+        self._offsets = journal.offsets()
+
+    def __contains__(self, index):
+        return index in self._offsets
+
+    def __getitem__(self, index):
+        return self.journal.read_at(self._offsets[index])
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+def apply_journal(df, entries):
+    """
+    Apply journaled updates to a DataFrame, rebuilding the results of an earlier run.
+
+    Entries whose row key no longer matches the row at that index are skipped.
+
+    Args:
+        df (pd.DataFrame): DataFrame (or chunk of one) to update in place
+        entries: Mapping of row index -> entry, e.g. RowJournal.load() or JournalEntries
+
+    Returns:
+        set: Indices whose journaled updates were applied
+    """
+    applied = set()
+    for index in df.index:
+        if index not in entries:
+            continue
+        entry = entries[index]
+        if entry['key'] != row_key(df.loc[index]):
+            continue
+        for column, value in entry['updates'].items():
+            # A column read as all-empty is float64 and would reject text
+            if column in df.columns and df[column].dtype != object:
+                df[column] = df[column].astype(object)
+            df.at[index, column] = value
+        applied.add(index)
+    return applied
@@ -3,8 +3,19 @@ from dotenv import load_dotenv
 
 from langchain_ollama import OllamaLLM
 from langchain_openai import ChatOpenAI
-import pandas as pd
-from urllib.parse import urlparse
+from langchain_core.messages import AIMessage
+import hashlib
+import threading
+import time
+
+from utils.concurrency_utils import provider_slot
+from utils.cache_utils import SQLiteCache, make_cache_key
+from utils.rate_limit_utils import get_rate_limiter, estimate_tokens
+from utils.retry_utils import call_with_retry, MAX_RETRIES as DEFAULT_MAX_RETRIES
+from utils.trace_utils import span
+from utils.prompt_utils import build_prompt
+from utils.storage_utils import read_csv_with_output_path
+from utils.ollama_utils import OLLAMA_KEEP_ALIVE
 
 # Load environment variables
 load_dotenv()
@@ -15,36 +26,244 @@ class Config:
     USE_OPENAI = os.getenv("USE_OPENAI", "true").lower() == "true" # default to True
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3") # default model
     OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434") # default URL
-    MAX_RETRIES = 3 # default retries
+    MAX_RETRIES = DEFAULT_MAX_RETRIES # retries after a transient failure (MAX_RETRIES env var, see utils/retry_utils.py)
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true" # default to True
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/cache/llm_responses.sqlite")
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50000)) # least recently used entries are evicted
+    LLM_CACHE_DETERMINISTIC_ONLY = os.getenv("LLM_CACHE_DETERMINISTIC_ONLY", "false").lower() == "true" # only cache temperature=0 models
+
+# Generation parameters that change the output of a model, part of the cache key
+GENERATION_PARAMS = ("temperature", "top_p", "top_k", "max_tokens", "num_predict", "num_ctx",
+                     "seed", "stop", "frequency_penalty", "presence_penalty", "repeat_penalty", "format")
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """Return the shared LLM response cache, or None if caching is disabled"""
+    global _llm_cache
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = SQLiteCache(Config.LLM_CACHE_PATH, max_entries=Config.LLM_CACHE_MAX_ENTRIES)
+        return _llm_cache
 
-def read_csv_with_output_path(csv_path: str, output_path: str = None) -> tuple[pd.DataFrame, str]:
+def get_llm_cache_stats() -> dict:
+    """Return hit/miss counters for the LLM response cache (empty dict if disabled)"""
+    cache = get_llm_cache()
+    return cache.stats() if cache else {}
+
+def get_generation_params(llm) -> dict:
+    """Collect the generation parameters set on an LLM instance"""
+    params = {}
+    for name in GENERATION_PARAMS:
+        value = getattr(llm, name, None)
+        if value is not None:
+            params[name] = value
+    return params
+
+
+class ManagedLLM:
     """
-    Read a CSV file and generate an output path if not provided.
-    
-    Args:
-        csv_path (str): Path to input CSV file
-        output_path (str, optional): Path to save updated CSV. If None, creates a new filename
-    
+    Wrapper around a LangChain LLM returned by get_llm.
+
+    invoke() holds a provider concurrency slot and a rate-limiter token while the
+    request is in flight and memoizes responses in the LLM cache, keyed on provider, model, generation
+    parameters and a hash of the prompt. Cache hits return the same type the
+    model would (AIMessage for OpenAI, str for Ollama). Every other attribute is
+    passed through to the wrapped LLM.
+    """
+
+    def __init__(self, llm, provider: str, model: str, cache: SQLiteCache = None, client_stats: dict = None):
+        self.llm = llm
+        self.provider = provider
+        self.model_name = model
+        self.cache = cache
+        self.client_stats = client_stats
+        self.generation_params = get_generation_params(llm)
+        self._local = threading.local()
+
+        # Sampled output differs between calls, so optionally skip caching it
+        temperature = self.generation_params.get("temperature")
+        if Config.LLM_CACHE_DETERMINISTIC_ONLY and temperature != 0:
+            self.cache = None
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def __repr__(self):
+        return f"ManagedLLM({self.llm!r})"
+
+    @property
+    def last_request_seconds(self):
+        """
+        Latency of this thread's last invoke(), measured around the model request only
+        (excludes waiting for a concurrency slot or the rate limiter). None for a cache hit.
+        """
+        return getattr(self._local, "seconds", None)
+
+    @property
+    def last_usage(self):
+        """
+        (prompt_tokens, response_tokens) of this thread's last invoke(), as reported by the
+        provider or else estimated. None for a cache hit.
+        """
+        return getattr(self._local, "usage", None)
+
+    def cache_key(self, prompt: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return make_cache_key(self.provider, self.model_name, self.generation_params, prompt_hash)
+
+    def invoke(self, prompt, use_cache: bool = True, **kwargs):
+        """
+        Invoke the wrapped LLM, serving repeated prompts from the cache.
+
+        Args:
+            prompt: Prompt passed to the LLM
+            use_cache (bool): Set to False to always call the model (e.g. when sampling)
+            **kwargs: Passed to the wrapped invoke(); calls with extra kwargs are not cached
+
+        Returns:
+            The model response (AIMessage for OpenAI, str for Ollama)
+        """
+        cacheable = self.cache is not None and use_cache and isinstance(prompt, str) and not kwargs
+        key = self.cache_key(prompt) if cacheable else None
+        self._local.seconds = None
+        self._local.usage = None
+
+        with span("llm.invoke", provider=self.provider, model=self.model_name,
+                  bytes_in=len(str(prompt))) as attrs:
+            if cacheable:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    attrs.update(cached=True, bytes_out=len(cached))
+                    return AIMessage(content=cached) if self.provider == "openai" else cached
+
+            prompt_tokens = estimate_tokens(prompt)
+            limiter = get_rate_limiter(self.provider)
+            attrs["throttled_seconds"] = 0.0
+
+            def attempt():
+                with provider_slot(self.provider):
+                    attrs["throttled_seconds"] += limiter.acquire(tokens=prompt_tokens)
+                    start_time = time.perf_counter()
+                    response = self.llm.invoke(prompt, **kwargs)
+                    self._local.seconds = time.perf_counter() - start_time
+                    self._record_request(self._local.seconds)
+                return response
+
+            # Transient failures are retried with backoff; a provider that keeps
+            # failing trips its circuit breaker (see utils/retry_utils.py)
+            response = call_with_retry(self.provider, attempt, max_retries=Config.MAX_RETRIES, attrs=attrs)
+            limiter.record_success()
+
+            text = response.content if hasattr(response, 'content') else str(response)
+            usage = getattr(response, "usage_metadata", None) or {}
+            self._local.usage = (usage.get("input_tokens", prompt_tokens),
+                                 usage.get("output_tokens", estimate_tokens(text)))
+            attrs.update(cached=False, request_seconds=self._local.seconds, bytes_out=len(text),
+                         prompt_tokens=self._local.usage[0], response_tokens=self._local.usage[1])
+
+            if cacheable:
+                self.cache.set(key, text)
+            return response
+
+    def _record_request(self, seconds: float):
+        """Track request latency so the registry can estimate connection set-up cost"""
+        if self.client_stats is None:
+            return
+        with _llm_registry_lock:
+            if self.client_stats["requests"] == 0:
+                self.client_stats["first_request_seconds"] = seconds
+            else:
+                self.client_stats["warm_request_seconds"] += seconds
+            self.client_stats["requests"] += 1
+
+
+# Shared LLM clients keyed by (provider, model, base_url). Each client keeps its own
+# HTTP connection pool, so reusing it keeps connections alive between calls.
+# ChatOpenAI and OllamaLLM are safe to call from several threads at once.
+_llm_registry = {}
+_llm_registry_lock = threading.Lock()
+
+def _create_llm(use_openai: bool, model: str, base_url: str):
+    if use_openai:
+        # Retries are made by ManagedLLM (Config.MAX_RETRIES), not by the client as well
+        return ChatOpenAI(api_key=Config.OPENAI_API_KEY, model=model, max_retries=0)
+    # Keep the model loaded between calls (see utils/ollama_utils.py)
+    return OllamaLLM(model=model, base_url=base_url, keep_alive=OLLAMA_KEEP_ALIVE)
+
+def get_llm_client(use_openai: bool, model: str, base_url: str):
+    """
+    Return the shared client for (provider, model, base_url), creating it on first use.
+
     Returns:
-        tuple[pd.DataFrame, str]: DataFrame containing the CSV data and the output path
+        tuple: (ChatOpenAI or OllamaLLM instance, registry stats dict for that client)
     """
-    # If no output path is provided, create one based on the input filename
-    if not output_path:
-        dirname, filename = os.path.split(csv_path)
-        base, ext = os.path.splitext(filename)
-        output_path = os.path.join(dirname, f"{base}_updated{ext}")
-    
-    # Read the CSV file
-    try:
-        df = pd.read_csv(csv_path)
-        return df, output_path
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        raise
+    key = (get_provider_name(use_openai), model, None if use_openai else base_url)
+    with _llm_registry_lock:
+        entry = _llm_registry.get(key)
+        if entry is not None:
+            entry["reused"] += 1
+            return entry["llm"], entry
+
+        start_time = time.perf_counter()
+        llm = _create_llm(use_openai, model, base_url)
+        entry = {
+            "llm": llm,
+            "reused": 0,
+            "construction_seconds": time.perf_counter() - start_time,
+            "requests": 0,
+            "first_request_seconds": None,
+            "warm_request_seconds": 0.0,
+        }
+        _llm_registry[key] = entry
+        return llm, entry
+
+def get_llm_registry_stats() -> dict:
+    """
+    Report how much client construction and connection set-up the registry saved.
+
+    Connection set-up cost per client is estimated as the latency of its first
+    request minus the mean latency of the requests that followed on the warm
+    connection. Every reuse would otherwise have paid construction plus that cost.
+
+    Returns:
+        dict: clients, reused, construction_seconds, connection_setup_seconds
+        (estimated, per client on average) and estimated_seconds_saved
+    """
+    with _llm_registry_lock:
+        entries = list(_llm_registry.values())
+
+    clients = len(entries)
+    reused = sum(entry["reused"] for entry in entries)
+    construction_seconds = sum(entry["construction_seconds"] for entry in entries)
+
+    saved = 0.0
+    setup_estimates = []
+    for entry in entries:
+        setup_seconds = 0.0
+        if entry["requests"] > 1:
+            warm_mean = entry["warm_request_seconds"] / (entry["requests"] - 1)
+            setup_seconds = max(0.0, entry["first_request_seconds"] - warm_mean)
+            setup_estimates.append(setup_seconds)
+        saved += entry["reused"] * (entry["construction_seconds"] + setup_seconds)
+
+    return {
+        "clients": clients,
+        "reused": reused,
+        "construction_seconds": construction_seconds,
+        "connection_setup_seconds": sum(setup_estimates) / len(setup_estimates) if setup_estimates else 0.0,
+        "estimated_seconds_saved": saved,
+    }
+
 
 # Initialize LLMs
-def get_llm(use_openai: bool = None, model_name: str = None, base_url: str = None):
+def get_llm(use_openai: bool = None, model_name: str = None, base_url: str = None, cache: bool = None):
     """
     Get an LLM instance based on specified parameters.
     
@@ -54,24 +273,34 @@ def get_llm(use_openai: bool = None, model_name: str = None, base_url: str = Non
             - For OpenAI: model name (e.g., "gpt-4", "gpt-3.5-turbo")
             - For Ollama: model name (e.g., "llama2", "mistral", "phi")
         base_url (str, optional): Base URL for Ollama. If None, uses Config.OLLAMA_URL
+        cache (bool, optional): Whether to cache responses. If None, uses Config.LLM_CACHE_ENABLED.
+            Pass False for non-deterministic sampling
     
     Returns:
-        LLM instance (ChatOpenAI or OllamaLLM)
+        ManagedLLM wrapping a ChatOpenAI or OllamaLLM instance. The underlying client is
+        shared by every call with the same provider, model and base URL (see get_llm_client)
     """
     # Use provided parameters or fall back to config values
     use_openai = use_openai if use_openai is not None else Config.USE_OPENAI
     base_url = base_url or Config.OLLAMA_URL
+    response_cache = get_llm_cache() if cache is not False else None
     
     if use_openai:  # Use OpenAI
         if not Config.OPENAI_API_KEY:
             raise ValueError("OpenAI API key not found")
         # Use provided model name or default to gpt-4
         model = model_name or "gpt-4"
-        return ChatOpenAI(api_key=Config.OPENAI_API_KEY, model=model)
     else:  # Use Ollama
         # Use provided model name or fall back to config
         model = model_name or Config.OLLAMA_MODEL
-        return OllamaLLM(model=model, base_url=base_url)
+
+    llm, client_stats = get_llm_client(use_openai, model, base_url)
+    return ManagedLLM(llm, get_provider_name(use_openai), model, cache=response_cache, client_stats=client_stats)
+
+def get_provider_name(use_openai: bool = None) -> str:
+    """Return the provider name used for concurrency limits and cache keys ("openai" or "ollama")"""
+    use_openai = use_openai if use_openai is not None else Config.USE_OPENAI
+    return "openai" if use_openai else "ollama"
 
 def summarize(prompt, text):
     
@@ -80,32 +309,27 @@ def summarize(prompt, text):
         Summarize the following text:
         """
 
+    llm = get_llm()
+    # Keep the prompt within the model's input token budget
+    response = llm.invoke(build_prompt(prompt + "\n{text}", text, model=llm.model_name))
     if Config.USE_OPENAI:
-        llm = get_llm()
-        response = llm.invoke(prompt + "\n" + text)
         response = response.content
-    else:
-        llm = get_llm()     
-        response = llm.invoke(prompt + "\n" + text)
 
     return response  
 
 
 def summarize_text_partnership(text, partner1, partner2):
-    prompt = f"""
+    llm = get_llm()
+    # The text is sent once, packed into the model's input token budget with
+    # the sentences about the partners first
+    prompt = build_prompt(f"""
     Summarize the following AI partnership announcement in one sentence:
     {partner1} and {partner2}
-    {text}
-    """
+    {{text}}
+    """, text, names=(partner1, partner2), model=llm.model_name)
 
+    response = llm.invoke(prompt)
     if Config.USE_OPENAI:
-        llm = get_llm()
-        response = llm.invoke(prompt + "\n" + text)
         response = response.content
-    else:
-        llm = get_llm()     
-        response = llm.invoke(prompt + "\n" + text)
-
-    return response
-
 
+    return response
\ No newline at end of file
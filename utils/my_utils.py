@@ -1,86 +1,39 @@
-import re
-from datetime import datetime
 import pandas as pd
 import os
 
-from utils.tavily_search_utils import web_search
-from utils.my_llm_utils import summarize_text_partnership
+from utils.tavily_search_utils import web_search, get_search_cache_stats
+from utils.retry_utils import RetryQueue, is_retryable, get_circuit_breaker_stats
+from utils.my_llm_utils import summarize_text_partnership, get_llm_cache_stats
+from utils.concurrency_utils import map_in_order, UPDATE_MAX_WORKERS
+from utils.rate_limit_utils import get_rate_limit_stats
+from utils.journal_utils import RowJournal, JournalEntries, apply_journal, default_journal_path, row_key
+from utils.trace_utils import span, print_trace_report
+from utils.date_utils import parse_date, parse_month_year, to_month_year
+from utils.blob_utils import BLOB_COLUMNS, to_blob, intern_columns
+from utils.storage_utils import (
+    default_output_path, read_csv_with_output_path, open_storage, save_table
+)
 
-import time
 from urllib.parse import urlparse
 
-def clean_date(date_str):
-    """Convert dates like 'Sep-24' to a standardized format 'yyyy-mm'"""
-    if not isinstance(date_str, str) or not date_str:
-        return None
-    
-    try:
-        # Map month abbreviations to numbers
-        month_map = {
-            'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-            'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-            'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-        }
-        
-        # Split the date string into month and year
-        parts = date_str.strip().split('-')
-        if len(parts) != 2:
-            return None
-            
-        month_abbr, year = parts
-        
-        # Convert year to 4-digits (assuming 20xx for brevity)
-        if len(year) == 2:
-            year = f"20{year}"
-            
-        # Get month number
-        month_num = month_map.get(month_abbr, None)
-        if not month_num:
-            return None
-            
-        return f"{year}-{month_num}"
-    except:
-        return None
-
+# Pick up where an interrupted update_partnerships run left off (see utils/journal_utils.py)
+UPDATE_RESUME = os.getenv("UPDATE_RESUME", "true").lower() == "true" # default to True
+# Rows per chunk for update_partnerships_streaming
+UPDATE_CHUNKSIZE = int(os.getenv("UPDATE_CHUNKSIZE", 50))
+# Columns update_partnerships fills in
+UPDATE_COLUMNS = ['Link', 'When announced', 'summary', 'raw_content']
+# Columns plan_partnership_updates looks at (dry runs read only these)
+PLAN_COLUMNS = ['partner1', 'partner2', 'Link', 'link 2', 'When announced', 'summary']
+# Vectorized equivalent of validate_link: a scheme followed by :// and a host
+LINK_PATTERN = r'^[A-Za-z][A-Za-z0-9+.\-]*://[^/?#\s]+'
 
+def clean_date(date_str):
+    """Convert dates like 'Sep-24' to a standardized format 'yyyy-mm' (see utils/date_utils.py)"""
+    return parse_month_year(date_str)
 
 def extract_date_from_text(text):
-    """Try to extract a date from text using patterns"""
-    # Look for common date patterns
-    patterns = [
-        r'(\w+\s+\d{1,2},\s*20\d{2})',  # e.g., "October 23, 2024"
-        r'(\d{1,2}\s+\w+\s+20\d{2})',    # e.g., "23 October 2024"
-        r'(20\d{2}-\d{1,2}-\d{1,2})'     # e.g., "2024-10-23"
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            try:
-                date_str = matches[0]
-                # Try to parse the date
-                date_obj = None
-                
-                # Try different formats
-                formats = [
-                    '%B %d, %Y',      # "October 23, 2024"
-                    '%b %d, %Y',      # "Oct 23, 2024"
-                    '%d %B %Y',       # "23 October 2024"
-                    '%d %b %Y',       # "23 Oct 2024"
-                    '%Y-%m-%d'        # "2024-10-23"
-                ]
-                
-                for fmt in formats:
-                    try:
-                        date_obj = datetime.strptime(date_str, fmt)
-                        if date_obj:
-                            # Return in month-year format
-                            return f"{date_obj.strftime('%b')}-{date_obj.strftime('%y')}"
-                    except:
-                        continue
-            except:
-                pass
-    return None
+    """Extract the first date from text, in month-year format like 'Oct-24' (see utils/date_utils.py)"""
+    return to_month_year(parse_date(text))
 
 # Validate Link (basic check)
 def validate_link(url):
@@ -91,31 +44,6 @@ def validate_link(url):
         return False
 
 
-def read_csv_with_output_path(csv_path: str, output_path: str = None) -> tuple[pd.DataFrame, str]:
-    """
-    Read a CSV file and generate an output path if not provided.
-    
-    Args:
-        csv_path (str): Path to input CSV file
-        output_path (str, optional): Path to save updated CSV. If None, creates a new filename
-    
-    Returns:
-        tuple[pd.DataFrame, str]: DataFrame containing the CSV data and the output path
-    """
-    # If no output path is provided, create one based on the input filename
-    if not output_path:
-        dirname, filename = os.path.split(csv_path)
-        base, ext = os.path.splitext(filename)
-        output_path = os.path.join(dirname, f"{base}_updated{ext}")
-    
-    # Read the CSV file
-    try:
-        df = pd.read_csv(csv_path)
-        return df, output_path
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        raise
-
 def find_partnership_info(partner1, partner2, partner3=None, return_raw_content=True):
     """Search for partnership information using Tavily
     partner1, partner2, partner3 are the names of the companies to search for
@@ -141,7 +69,7 @@ def find_partnership_info(partner1, partner2, partner3=None, return_raw_content=
     
     # Search for the partnership info
     try:
-        search_results = web_search(query, max_results=3)
+        search_results = web_search(query, max_results=3, raise_retryable=True)
         
         if not search_results or not search_results.get('results'):
             return None, None, None, None if return_raw_content else None
@@ -168,7 +96,9 @@ def find_partnership_info(partner1, partner2, partner3=None, return_raw_content=
         content = result.get('content', '')
         
         # Try to extract date from content
-        date = extract_date_from_text(content)
+        with span("date_extraction", bytes_in=len(content)) as attrs:
+            date = extract_date_from_text(content)
+            attrs["found"] = date is not None
         
         # Generate summary if we have content
         summary = None
@@ -183,139 +113,430 @@ def find_partnership_info(partner1, partner2, partner3=None, return_raw_content=
         return link, date, summary, raw_content
         
     except Exception as e:
+        # Let transient failures reach the caller, which retries the row later
+        if is_retryable(e):
+            raise
         print(f"Error searching for partnership info: {str(e)}")
         return None, None, None, None if return_raw_content else None
     
 
-def update_partnerships(df, output_path=None):
-    """Update the AI partnerships CSV with missing information"""
+def _process_partnership_row(row):
+    """Work out the updates for a single partnership row.
+
+    Makes the search and LLM calls needed to fill in the missing link, date and
+    summary, but does not touch the DataFrame. Returns a dict mapping column
+    names to new values; later entries for the same column win.
+    """
+    partner1 = row.get('partner1')
+    partner2 = row.get('partner2')
+    partner3 = row.get('partner3')
+    updates = {}
+
+    print(f"\nProcessing partnership: {partner1} and {partner2}")
+    
+    # Check if we have a valid link
+    link1 = row.get('Link')
+    link2 = row.get('link 2')
     
-    # Add summary and raw_content columns if they don't exist
-    if 'summary' not in df.columns:
-        df['summary'] = None
-    if 'raw_content' not in df.columns:
-        df['raw_content'] = None
+    valid_link = None
+    content = None
     
-    # Process each row
-    for idx, row in df.iterrows():
-        partner1 = row.get('partner1')
-        partner2 = row.get('partner2')
-        partner3 = row.get('partner3')
+    # Validate existing links
+    if isinstance(link1, str) and validate_link(link1):
+        valid_link = link1
+    elif isinstance(link2, str) and validate_link(link2):
+        valid_link = link2
+    
+    # If no valid link or missing date, search for information
+    if not valid_link or pd.isna(row.get('When announced')):
+        new_link, new_date, summary, raw_content = find_partnership_info(partner1, partner2, partner3, return_raw_content=True)
         
-        # Skip if we don't have at least two partners
-        if not isinstance(partner1, str) or not isinstance(partner2, str):
-            continue
+        # Update link if we found one
+        if new_link and validate_link(new_link):
+            updates['Link'] = new_link
+            valid_link = new_link
+            print(f"Found new link: {new_link}")
             
-        print(f"\nProcessing partnership: {partner1} and {partner2}")
-        
-        # Check if we have a valid link
-        link1 = row.get('Link')
-        link2 = row.get('link 2')
-        
-        valid_link = None
-        content = None
+        # Update date if we found one
+        if new_date and (pd.isna(row.get('When announced')) or not row.get('When announced')):
+            updates['When announced'] = new_date
+            print(f"Found new date: {new_date}")
+            
+        # Update summary and raw content if we found them
+        if summary:
+            updates['summary'] = summary
+            print(f"Generated summary: {summary}")
+        if raw_content:
+            updates['raw_content'] = raw_content
+            print("Stored raw content")
         
-        # Validate existing links
-        if isinstance(link1, str) and validate_link(link1):
-            valid_link = link1
-        elif isinstance(link2, str) and validate_link(link2):
-            valid_link = link2
+    # If we have a valid link but no summary, try to generate one
+    elif valid_link and (pd.isna(row.get('summary')) or not row.get('summary')):
+        print(f"Generating summary based on existing link...")
+        search_results = web_search(valid_link, max_results=1, raise_retryable=True)
         
-        # If no valid link or missing date, search for information
-        if not valid_link or pd.isna(row.get('When announced')):
-            new_link, new_date, summary, raw_content = find_partnership_info(partner1, partner2, partner3, return_raw_content=True)
-            
-            # Update link if we found one
-            if new_link and validate_link(new_link):
-                df.at[idx, 'Link'] = new_link
-                valid_link = new_link
-                print(f"Found new link: {new_link}")
-                
-            # Update date if we found one
-            if new_date and (pd.isna(row.get('When announced')) or not row.get('When announced')):
-                df.at[idx, 'When announced'] = new_date
-                print(f"Found new date: {new_date}")
-                
-            # Update summary and raw content if we found them
-            if summary:
-                df.at[idx, 'summary'] = summary
+        if search_results and search_results.get('results'):
+            content = search_results['results'][0].get('content', '')
+            if content and len(content.strip()) > 10:
+                summary = summarize_text_partnership(content, partner1, partner2)
+                updates['summary'] = summary
+                updates['raw_content'] = content
                 print(f"Generated summary: {summary}")
-            if raw_content:
-                df.at[idx, 'raw_content'] = raw_content
                 print("Stored raw content")
-            
-        # If we have a valid link but no summary, try to generate one
-        elif valid_link and (pd.isna(row.get('summary')) or not row.get('summary')):
-            print(f"Generating summary based on existing link...")
-            search_results = web_search(valid_link, max_results=1)
-            
-            if search_results and search_results.get('results'):
-                content = search_results['results'][0].get('content', '')
-                if content and len(content.strip()) > 10:
-                    summary = summarize_text_partnership(content, partner1, partner2)
-                    df.at[idx, 'summary'] = summary
-                    df.at[idx, 'raw_content'] = content
-                    print(f"Generated summary: {summary}")
-                    print("Stored raw content")
-                else:
-                    # If no content from the link, fall back to searching for partnership info
-                    print(f"No content found from link, searching for partnership info...")
-                    new_link, new_date, summary, raw_content = find_partnership_info(partner1, partner2, partner3, return_raw_content=True)
-                    
-                    # Update link if we found a better one
-                    if new_link and validate_link(new_link):
-                        df.at[idx, 'Link'] = new_link
-                        print(f"Found better link: {new_link}")
-                    
-                    # Update date if we found one
-                    if new_date and (pd.isna(row.get('When announced')) or not row.get('When announced')):
-                        df.at[idx, 'When announced'] = new_date
-                        print(f"Found new date: {new_date}")
-                    
-                    # Update summary and raw content if we found them
-                    if summary:
-                        df.at[idx, 'summary'] = summary
-                        print(f"Generated summary from new search: {summary}")
-                    if raw_content:
-                        df.at[idx, 'raw_content'] = raw_content
-                        print("Stored raw content")
-                    else:
-                        df.at[idx, 'summary'] = "No content available from any source"
-                        print("No content available from any source")
             else:
-                # If no search results from the link, fall back to searching for partnership info
-                print(f"No search results from link, searching for partnership info...")
-                new_link, new_date, summary, raw_content = find_partnership_info(partner1, partner2, partner3, return_raw_content=True)
-                
-                # Update link if we found a better one
-                if new_link and validate_link(new_link):
-                    df.at[idx, 'Link'] = new_link
-                    print(f"Found better link: {new_link}")
-                
-                # Update date if we found one
-                if new_date and (pd.isna(row.get('When announced')) or not row.get('When announced')):
-                    df.at[idx, 'When announced'] = new_date
-                    print(f"Found new date: {new_date}")
-                
-                # Update summary and raw content if we found them
-                if summary:
-                    df.at[idx, 'summary'] = summary
-                    print(f"Generated summary from new search: {summary}")
-                if raw_content:
-                    df.at[idx, 'raw_content'] = raw_content
-                    print("Stored raw content")
-                else:
-                    df.at[idx, 'summary'] = "No content available from any source"
-                    print("No content available from any source")
-                    
-        # Add a small delay to avoid rate limits
-        time.sleep(1)
+                # If no content from the link, fall back to searching for partnership info
+                print(f"No content found from link, searching for partnership info...")
+                updates.update(_search_fallback_updates(row, partner1, partner2, partner3))
+        else:
+            # If no search results from the link, fall back to searching for partnership info
+            print(f"No search results from link, searching for partnership info...")
+            updates.update(_search_fallback_updates(row, partner1, partner2, partner3))
+
+    return updates
+
+
+def _search_fallback_updates(row, partner1, partner2, partner3):
+    """Search for the partnership when the existing link yields no content"""
+    updates = {}
+    new_link, new_date, summary, raw_content = find_partnership_info(partner1, partner2, partner3, return_raw_content=True)
+    
+    # Update link if we found a better one
+    if new_link and validate_link(new_link):
+        updates['Link'] = new_link
+        print(f"Found better link: {new_link}")
+    
+    # Update date if we found one
+    if new_date and (pd.isna(row.get('When announced')) or not row.get('When announced')):
+        updates['When announced'] = new_date
+        print(f"Found new date: {new_date}")
+    
+    # Update summary and raw content if we found them
+    if summary:
+        updates['summary'] = summary
+        print(f"Generated summary from new search: {summary}")
+    if raw_content:
+        updates['raw_content'] = raw_content
+        print("Stored raw content")
+    else:
+        updates['summary'] = "No content available from any source"
+        print("No content available from any source")
+
+    return updates
+
+
+def _column(df, name):
+    """Return a column, or an all-missing column if df doesn't have it"""
+    return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+
+def _is_string(series):
+    """Vectorized isinstance(value, str)"""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return pd.Series(False, index=series.index)
+    return series.str.len().notna()
+
+
+def valid_link_mask(series):
+    """Vectorized validate_link: True where the value is a URL with a scheme and a host"""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return pd.Series(False, index=series.index)
+    return series.str.match(LINK_PATTERN, na=False).astype(bool)
+
+
+def plan_partnership_updates(df, done=None):
+    """Decide for every row at once whether it needs a search, a summary or nothing
+
+    Computes the same conditions _process_partnership_row checks (two partners,
+    a valid Link / link 2, a known date, an existing summary) as vectorized masks
+    over the whole frame, so rows that need no work are never dispatched.
+
+    Args:
+        df (pd.DataFrame): Partnerships (or a chunk of them)
+        done (set, optional): Indices that are already complete (e.g. restored from a journal)
+
+    Returns:
+        dict: Action ('search', 'summarize', 'skip') -> list of row indices
+    """
+    has_partners = _is_string(_column(df, 'partner1')) & _is_string(_column(df, 'partner2'))
+    has_valid_link = valid_link_mask(_column(df, 'Link')) | valid_link_mask(_column(df, 'link 2'))
+    missing_date = _column(df, 'When announced').isna()
+    summary = _column(df, 'summary')
+    missing_summary = summary.isna() | summary.eq('')
+
+    pending = has_partners & ~df.index.isin(list(done or ()))
+    search = pending & (~has_valid_link | missing_date)
+    summarize = pending & ~search & missing_summary
+
+    return {
+        'search': df.index[search].tolist(),
+        'summarize': df.index[summarize].tolist(),
+        'skip': df.index[~(search | summarize)].tolist(),
+    }
+
+
+def format_plan_report(plan):
+    """Describe the rows and API calls a plan will make (used for dry runs)"""
+    searches = len(plan['search'])
+    summaries = len(plan['summarize'])
+    lines = [
+        f"Rows needing a search:        {searches}",
+        f"Rows needing a summary only:  {summaries}",
+        f"Rows with nothing to do:      {len(plan['skip'])}",
+        f"Planned Tavily searches:      {searches + summaries}-{searches + 2 * summaries}",
+        f"Planned LLM summaries:        up to {searches + summaries}",
+    ]
+    return "\n".join(lines)
+
+
+def prepare_update_columns(df):
+    """Give df every UPDATE_COLUMNS column, typed object so text can be written into it
+
+    A chunk whose Link or date cells are all empty is read as float64, which
+    rejects strings, so existing columns are cast too. Adding missing columns
+    keeps every chunk's columns the same.
+    """
+    for column in UPDATE_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+        elif df[column].dtype != object:
+            df[column] = df[column].astype(object)
+    return df
+
+
+def enrich_partnerships(df, max_workers=None, journal=None, done=None):
+    """Fill in missing links, dates and summaries for the rows of df, in place
+
+    Only rows that plan_partnership_updates marks for a search or a summary are
+    processed. They run serially by default. With max_workers > 1 they run on a
+    thread pool; in-flight search and LLM requests are bounded per provider
+    (see utils/concurrency_utils.py) and updates are written back in row order.
+
+    A row whose search or LLM call still fails with a retryable error (see
+    utils/retry_utils.py) is deferred instead of being saved half-done, and
+    tried once more after the other rows. Rows that fail again are left as
+    they were and out of the journal, so a resumed run picks them up.
+
+    Args:
+        df (pd.DataFrame): Partnerships (or a chunk of them) to update in place
+        max_workers (int, optional): Rows processed at once. If None, uses UPDATE_MAX_WORKERS
+        journal (RowJournal, optional): Journal each processed row is appended to
+        done (set, optional): Indices that are already complete and should be skipped
+    """
+    max_workers = max_workers or UPDATE_MAX_WORKERS
+    done = done or set()
+    
+    prepare_update_columns(df)
+    
+    # Only dispatch the rows the planner says need work
+    plan = plan_partnership_updates(df, done)
+    print(f"Planned: {len(plan['search'])} rows to search, {len(plan['summarize'])} to summarize, "
+          f"{len(plan['skip'])} skipped")
+    work = df.index[df.index.isin(plan['search'] + plan['summarize'])]
+    rows = list(df.loc[work].iterrows())
+
+    retry_queue = RetryQueue()
+
+    def run(item):
+        idx, row = item
+        # Article text and long summaries go to the blob store; the frame keeps references
+        updates = {column: to_blob(value) if column in BLOB_COLUMNS else value
+                   for column, value in _process_partnership_row(row).items()}
+        if journal:
+            journal.append(idx, row_key(row), updates)
+        return updates
+
+    def process(item):
+        try:
+            return run(item)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            retry_queue.add(f"row {item[0]}", lambda: (item[0], run(item)), e)
+            return {}
+
+    # Process the rows and write the updates back in row order.
+    # Request rates are governed by the per-provider rate limiters (utils/rate_limit_utils.py)
+    results = map_in_order(process, rows, max_workers=max_workers)
+    for (idx, _), updates in zip(rows, results):
+        for column, value in updates.items():
+            df.at[idx, column] = value
+
+    # Retry the rows deferred by transient failures
+    succeeded, failed = retry_queue.drain()
+    for _, (idx, updates) in succeeded:
+        for column, value in updates.items():
+            df.at[idx, column] = value
+    if failed:
+        print(f"{len(failed)} rows still failing; they are not journaled and will be retried on resume")
+        if journal:
+            journal.mark_incomplete()
+
+    return df
+
+
+def _open_journal(output_path, journal_path, resume):
+    """Open the run journal and the entries an earlier run left in it"""
+    journal_path = journal_path or (default_journal_path(output_path) if output_path else None)
+    if not journal_path:
+        return None, {}
+    journal = RowJournal(journal_path, resume=resume)
+    entries = JournalEntries(journal) if resume else {}
+    return journal, entries
+
+
+def _complete_journal(journal):
+    """Delete a finished run's journal, so the next run refreshes every row instead of restoring them"""
+    if journal and not journal.complete():
+        print(f"Keeping {journal.path} to resume the rows that are still failing")
+
+
+def _read_chunks(path, chunksize, columns=None):
+    """Yield a table chunk by chunk (see utils/storage_utils.py), timing each read as a storage.read span"""
+    reader = open_storage(path).iter_chunks(chunksize, columns)
+    while True:
+        with span("storage.read", path=path) as attrs:
+            chunk = next(reader, None)
+            attrs["rows"] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        yield intern_columns(chunk)
+
+
+def _print_rate_limit_stats():
+    """Report time spent waiting on rate limits, and circuits that opened"""
+    for provider, stats in get_rate_limit_stats().items():
+        print(f"{provider}: {stats['requests']} requests, {stats['rate_limited']} rate limited, "
+              f"{stats['throttled_seconds']:.1f}s throttled")
+    for provider, stats in get_circuit_breaker_stats().items():
+        if stats['opened']:
+            print(f"{provider} circuit: opened {stats['opened']} times, {stats['rejected']} calls failed fast, "
+                  f"now {stats['state']}")
+
+
+def print_cache_stats():
+    """Report search and LLM cache hits and misses (caches that are disabled or unused are skipped)"""
+    for name, stats in (("Search", get_search_cache_stats()), ("LLM", get_llm_cache_stats())):
+        if stats and stats['hits'] + stats['misses']:
+            print(f"{name} cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+                  f"{stats['entries']} entries")
+
+
+def update_partnerships(df, output_path=None, max_workers=None, journal_path=None, resume=None, dry_run=False):
+    """Update the AI partnerships CSV with missing information
+
+    See enrich_partnerships for how rows are processed. Every processed row is
+    appended to a journal next to the output file as soon as it completes. With
+    resume (default UPDATE_RESUME) rows already in the journal are restored from
+    it instead of being searched and summarized again, so an interrupted run can
+    be restarted where it stopped. The journal is deleted once the output is
+    saved (unless some rows are still failing), so a later run refreshes every row.
+
+    With dry_run, prints the planned work (see plan_partnership_updates) and
+    returns without making any API calls or writing files.
+    """
+    resume = UPDATE_RESUME if resume is None else resume
+
+    if dry_run:
+        print(format_plan_report(plan_partnership_updates(df)))
+        return True
+
+    # Restore rows finished by an earlier, interrupted run
+    journal, entries = _open_journal(output_path, journal_path, resume)
+    prepare_update_columns(df)
+    done = apply_journal(df, entries) if entries else set()
+    if done:
+        print(f"Resuming: restored {len(done)} rows from {journal.path}")
+
+    try:
+        enrich_partnerships(df, max_workers=max_workers, journal=journal, done=done)
+    finally:
+        if journal:
+            journal.close()
+
+    _print_rate_limit_stats()
+    print_cache_stats()
         
-    # Save the updated data
+    # Save the updated data (SQLite outputs are updated in place)
     try:
-        df.to_csv(output_path, index=False)
+        save_table(df, output_path)
         print(f"\nUpdated data saved to {output_path}")
+        _complete_journal(journal)
+        print_trace_report()
         return True
     except Exception as e:
         print(f"Error saving CSV: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def update_partnerships_streaming(csv_path, output_path=None, chunksize=None, max_workers=None,
+                                  journal_path=None, resume=None, dry_run=False):
+    """Update a partnerships CSV chunk by chunk, streaming results to one output file
+
+    Reads the input with pandas chunksize, enriches each chunk (see
+    enrich_partnerships) and appends it to the output before reading the next,
+    so peak memory depends on the chunk size rather than the file size. Replaces
+    splitting the input with split_csv_by_rows and running each shard by hand.
+    Input and output can be CSV, Parquet or SQLite, picked by file extension
+    (see utils/storage_utils.py).
+
+    The journal and resume behave as in update_partnerships; on resume the output
+    is rewritten from the start, with finished rows restored from the journal.
+
+    Args:
+        csv_path (str): Path to input CSV file
+        output_path (str, optional): Path to save updated CSV. If None, creates a new filename
+        chunksize (int, optional): Rows per chunk. If None, uses UPDATE_CHUNKSIZE
+        max_workers (int, optional): Rows processed at once within a chunk
+        journal_path (str, optional): Journal file. If None, sits next to the output
+        resume (bool, optional): Restore finished rows from the journal. If None, uses UPDATE_RESUME
+        dry_run (bool): Only print the planned work for the whole file; no API calls or writes
+
+    Returns:
+        bool: True if every chunk was processed and saved
+    """
+    output_path = output_path or default_output_path(csv_path)
+    chunksize = chunksize or UPDATE_CHUNKSIZE
+    resume = UPDATE_RESUME if resume is None else resume
+
+    if dry_run:
+        plan = {'search': [], 'summarize': [], 'skip': []}
+        for chunk in _read_chunks(csv_path, chunksize, columns=PLAN_COLUMNS):
+            for action, indices in plan_partnership_updates(chunk).items():
+                plan[action].extend(indices)
+        print(format_plan_report(plan))
+        return True
+
+    journal, entries = _open_journal(output_path, journal_path, resume)
+    output = open_storage(output_path)
+    total_rows = 0
+    try:
+        for chunk_number, chunk in enumerate(_read_chunks(csv_path, chunksize)):
+            prepare_update_columns(chunk)
+            done = apply_journal(chunk, entries) if entries else set()
+            print(f"\nChunk {chunk_number + 1}: rows {chunk.index[0]}-{chunk.index[-1]}"
+                  f"{f' ({len(done)} restored from journal)' if done else ''}")
+
+            enrich_partnerships(chunk, max_workers=max_workers, journal=journal, done=done)
+            
+            # Append the chunk to the output (the first chunk replaces any earlier output)
+            with span("storage.write", path=output_path, rows=len(chunk)):
+                if chunk_number == 0:
+                    output.write(chunk)
+                else:
+                    output.append(chunk)
+            total_rows += len(chunk)
+    except Exception as e:
+        print(f"Error updating {csv_path}: {e}")
+        return False
+    finally:
+        # Finish the output file (Parquet keeps a writer open across chunks)
+        output.close()
+        if journal:
+            journal.close()
+
+    _print_rate_limit_stats()
+    print_cache_stats()
+    print(f"\nUpdated {total_rows} rows saved to {output_path}")
+    _complete_journal(journal)
+    print_trace_report()
+    return True
\ No newline at end of file
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+import urllib.request
+
+# Residency of local Ollama models (override via env vars)
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_SCHEDULER_ENABLED = os.getenv("OLLAMA_SCHEDULER_ENABLED", "true").lower() == "true" # default to True
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m") # how long Ollama keeps a model loaded after a request
+OLLAMA_MEMORY_GB = float(os.getenv("OLLAMA_MEMORY_GB", 0)) # memory for resident models; 0 for no limit
+OLLAMA_MAX_RESIDENT = int(os.getenv("OLLAMA_MAX_RESIDENT", 0)) # resident models at once; 0 for no limit
+OLLAMA_MEMORY_OVERHEAD = float(os.getenv("OLLAMA_MEMORY_OVERHEAD", 1.2)) # loaded size / size on disk (KV cache etc.)
+
+
+def _request(base_url, path, payload=None, timeout=600):
+    """GET (or POST a JSON payload to) the Ollama API and return the decoded response"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(f"{base_url.rstrip('/')}{path}", data=data,
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8') or '{}')
+
+
+def model_tag(model):
+    """Full name of a model as Ollama lists it ('llama3' -> 'llama3:latest')"""
+    return model if ':' in model else f"{model}:latest"
+
+
+class OllamaScheduler:
+    """
+    Keeps the models a run needs resident on one Ollama host.
+
+    Before work for a model starts, ensure_resident loads it with an explicit
+    warm-up request (keep_alive OLLAMA_KEEP_ALIVE) and, if the configured
+    memory or model count would be exceeded, first unloads the least recently
+    used resident models. Warm-up time of models that were not loaded is
+    recorded as cold-load time, separately from inference latency. Models are
+    tracked by their full name, so 'llama3' and 'llama3:latest' are the same
+    model. Safe to share between threads.
+    """
+
+    def __init__(self, base_url=None, memory_gb=None, max_resident=None, keep_alive=None):
+        """
+        Args:
+            base_url (str, optional): Ollama URL. If None, uses OLLAMA_URL
+            memory_gb (float, optional): Memory for resident models (0 for no limit). If None, uses OLLAMA_MEMORY_GB
+            max_resident (int, optional): Resident models at once (0 for no limit). If None, uses OLLAMA_MAX_RESIDENT
+            keep_alive (str, optional): Ollama keep_alive for warm-ups. If None, uses OLLAMA_KEEP_ALIVE
+        """
+        self.base_url = base_url or OLLAMA_URL
+        self.memory_bytes = (OLLAMA_MEMORY_GB if memory_gb is None else memory_gb) * 1024 ** 3
+        self.max_resident = OLLAMA_MAX_RESIDENT if max_resident is None else max_resident
+        self.keep_alive = keep_alive or OLLAMA_KEEP_ALIVE
+        self._last_used = {}
+        self._model_stats = {}
+        self._model_locks = {}
+        self._lock = threading.Lock()
+
+    def resident_models(self):
+        """Models Ollama has loaded now, as name -> loaded size in bytes"""
+        response = _request(self.base_url, "/api/ps", timeout=10)
+        return {model_tag(model['name']): model.get('size', 0) for model in response.get('models', [])}
+
+    def model_size(self, model):
+        """Estimated loaded size of a model in bytes (size on disk times OLLAMA_MEMORY_OVERHEAD)"""
+        model = model_tag(model)
+        response = _request(self.base_url, "/api/tags", timeout=10)
+        for entry in response.get('models', []):
+            if model_tag(entry['name']) == model or model_tag(entry.get('model', '')) == model:
+                return int(entry.get('size', 0) * OLLAMA_MEMORY_OVERHEAD)
+        return 0
+
+    def _stats(self, model):
+        return self._model_stats.setdefault(model, {'cold_loads': 0, 'cold_load_seconds': 0.0,
+                                                    'warm_hits': 0, 'unloads': 0})
+
+    def unload(self, model):
+        """Ask Ollama to unload a model now"""
+        model = model_tag(model)
+        _request(self.base_url, "/api/generate", {'model': model, 'keep_alive': 0})
+        self._stats(model)['unloads'] += 1
+        self._last_used.pop(model, None)
+
+    def _make_room(self, model, resident):
+        """Unload least recently used models until the model fits the memory and count limits"""
+        needed = self.model_size(model) if self.memory_bytes else 0
+        while resident:
+            over_memory = self.memory_bytes and sum(resident.values()) + needed > self.memory_bytes
+            over_count = self.max_resident and len(resident) + 1 > self.max_resident
+            if not (over_memory or over_count):
+                break
+            victim = min(resident, key=lambda name: self._last_used.get(name, 0))
+            print(f"Unloading {victim} to make room for {model}")
+            self.unload(victim)
+            resident.pop(victim)
+
+    def ensure_resident(self, model):
+        """
+        Load a model (if it is not loaded already) before work for it starts.
+
+        Best effort: if Ollama cannot be reached the error is printed and the
+        first request loads the model as usual. Only one warm-up per model runs
+        at a time; the shared lock is not held while a model loads, so other
+        models can be checked or loaded meanwhile.
+
+        Returns:
+            float: Cold-load seconds (0.0 if the model was already resident)
+        """
+        model = model_tag(model)
+        with self._lock:
+            model_lock = self._model_locks.setdefault(model, threading.Lock())
+
+        with model_lock:
+            try:
+                with self._lock:
+                    resident = self.resident_models()
+                    if model in resident:
+                        self._stats(model)['warm_hits'] += 1
+                        self._last_used[model] = time.time()
+                        return 0.0
+                    self._make_room(model, resident)
+
+                start_time = time.perf_counter()
+                response = _request(self.base_url, "/api/generate", {'model': model, 'keep_alive': self.keep_alive})
+                elapsed = time.perf_counter() - start_time
+            except Exception as e:
+                print(f"Ollama warm-up failed for {model}: {e}")
+                return 0.0
+
+        # Ollama reports the load itself in nanoseconds; fall back to the request time
+        cold_load = response.get('load_duration', elapsed * 1e9) / 1e9
+        with self._lock:
+            stats = self._stats(model)
+            stats['cold_loads'] += 1
+            stats['cold_load_seconds'] += cold_load
+            self._last_used[model] = time.time()
+        print(f"Loaded {model} in {cold_load:.1f}s")
+        return cold_load
+
+    def stats(self):
+        """
+        Return per-model residency counters.
+
+        Returns:
+            dict: model -> cold_loads, cold_load_seconds, warm_hits (already resident) and unloads
+        """
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._model_stats.items()}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_ollama_scheduler():
+    """Return the shared Ollama scheduler, or None if it is disabled"""
+    global _scheduler
+    if not OLLAMA_SCHEDULER_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = OllamaScheduler()
+        return _scheduler
+
+
+def get_cold_load_seconds(model):
+    """Total cold-load time recorded for a model by the shared scheduler"""
+    scheduler = get_ollama_scheduler()
+    if scheduler is None:
+        return 0.0
+    return scheduler.stats().get(model_tag(model), {}).get('cold_load_seconds', 0.0)
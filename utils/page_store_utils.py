@@ -0,0 +1,218 @@
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+
+from utils.url_utils import canonicalize_url
+
+# Local store of crawled pages (override via env vars)
+PAGE_STORE_ENABLED = os.getenv("PAGE_STORE_ENABLED", "true").lower() == "true" # default to True
+PAGE_STORE_PATH = os.getenv("PAGE_STORE_PATH", "data/cache/pages.sqlite")
+PAGE_STORE_TTL_HOURS = float(os.getenv("PAGE_STORE_TTL_HOURS", 7 * 24)) # serve without revalidating for this long
+PAGE_STORE_MAX_MB = float(os.getenv("PAGE_STORE_MAX_MB", 500))
+USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+
+class PageStore:
+    """
+    Compressed store of crawled pages keyed by canonical URL.
+
+    Keeps the page markdown (zlib-compressed) with the ETag / Last-Modified
+    headers it was served with. Pages younger than the TTL are served as-is;
+    older pages are revalidated with a conditional GET and only re-crawled if
+    the server reports a change. The store is kept under max_bytes by evicting
+    the least recently used pages. Safe to share between threads.
+    """
+
+    def __init__(self, path, ttl=None, max_bytes=None):
+        """
+        Args:
+            path (str): Path to the SQLite file (parent directory is created if needed)
+            ttl (float, optional): Seconds a page is served without revalidation
+            max_bytes (int, optional): Maximum total size of compressed pages. None for no limit
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                source_url TEXT NOT NULL,
+                markdown BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access)")
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Look up a stored page.
+
+        Args:
+            url (str): Page URL (any variant of it; it is canonicalized)
+
+        Returns:
+            dict: markdown, etag, last_modified, fetched_at and fresh (within TTL), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT markdown, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (canonicalize_url(url),),
+            ).fetchone()
+        if row is None:
+            return None
+
+        markdown, etag, last_modified, fetched_at = row
+        return {
+            'markdown': zlib.decompress(markdown).decode('utf-8'),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+            'fresh': self.ttl is None or time.time() - fetched_at < self.ttl,
+        }
+
+    def put(self, url, markdown, etag=None, last_modified=None):
+        """Store a freshly crawled page with its validators"""
+        compressed = zlib.compress(markdown.encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, source_url, markdown, size, etag, last_modified, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (canonicalize_url(url), url, compressed, len(compressed), etag, last_modified, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url):
+        """Mark a stored page as just validated and just used"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?",
+                (now, now, canonicalize_url(url)),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used pages until the store is under max_bytes"""
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+
+    def lookup(self, url):
+        """
+        Return the stored markdown for a page if it can be served without re-crawling.
+
+        Fresh pages are served directly. Stale pages with an ETag or
+        Last-Modified are revalidated with a conditional GET; a 304 refreshes
+        them. Returns None when the page must be crawled again.
+        """
+        record = self.get(url)
+        if record is None:
+            self.misses += 1
+            return None
+
+        if not record['fresh']:
+            if not (record['etag'] or record['last_modified']) or not is_not_modified(url, record):
+                self.misses += 1
+                return None
+            self.revalidated += 1
+
+        self.hits += 1
+        self.touch(url)
+        return record['markdown']
+
+    def stats(self):
+        """
+        Return store counters.
+
+        Returns:
+            dict: hits (including revalidated), revalidated, misses, pages and bytes
+        """
+        with self._lock:
+            pages, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses,
+                'pages': pages, 'bytes': total}
+
+
+def is_not_modified(url, record, timeout=10):
+    """
+    Ask the server whether a stored page changed, with a conditional GET.
+
+    Args:
+        url (str): Page URL
+        record (dict): Stored page with its etag / last_modified
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        bool: True if the server answered 304 Not Modified
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if record.get('etag'):
+        headers['If-None-Match'] = record['etag']
+    if record.get('last_modified'):
+        headers['If-Modified-Since'] = record['last_modified']
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            return response.status == 304
+    except urllib.error.HTTPError as e:
+        return e.code == 304
+    except Exception:
+        return False
+
+
+def page_validators(headers):
+    """Extract (etag, last_modified) from response headers"""
+    if not headers:
+        return None, None
+    headers = {key.lower(): value for key, value in dict(headers).items()}
+    return headers.get('etag'), headers.get('last-modified')
+
+
+_page_store = None
+_page_store_lock = threading.Lock()
+
+
+def get_page_store():
+    """Return the shared page store, or None if it is disabled"""
+    global _page_store
+    if not PAGE_STORE_ENABLED:
+        return None
+    with _page_store_lock:
+        if _page_store is None:
+            _page_store = PageStore(PAGE_STORE_PATH, ttl=PAGE_STORE_TTL_HOURS * 3600,
+                                    max_bytes=int(PAGE_STORE_MAX_MB * 1024 * 1024))
+        return _page_store
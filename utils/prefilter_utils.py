@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import threading
+
+import pandas as pd
+
+from utils.prompt_utils import PARTNERSHIP_KEYWORDS
+
+# Pre-filter ahead of company extraction and validation (override via env vars)
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() == "true" # default to True
+PREFILTER_MIN_SCORE = float(os.getenv("PREFILTER_MIN_SCORE", 2.0)) # heuristic score a result needs to pass
+PREFILTER_MIN_COMPANIES = int(os.getenv("PREFILTER_MIN_COMPANIES", 2)) # capitalized names a result must mention
+PREFILTER_MODEL_PATH = os.getenv("PREFILTER_MODEL_PATH") # optional JSON logistic model, replaces the heuristic score
+
+# LLM calls a rejected result would have cost at most: one extraction, and one
+# validation if it had candidate pairs (fewer if it was a near-duplicate or cached)
+LLM_CALLS_PER_RESULT = 2
+
+# Features (regexes counted per text, case-insensitive unless noted)
+FEATURE_PATTERNS = {
+    # Keywords are word prefixes ("collaborat" matches "collaboration", not "ideal" for "deal")
+    'keywords': rf"\b(?:{'|'.join(PARTNERSHIP_KEYWORDS)})\w*",
+    # Announcement verbs the keywords do not already cover ("announce", "partner", "join", "team up")
+    'announcement': r'\b(?:signs?|signed|unveil\w*|launch\w*)\b',
+    'ai_terms': r'\b(?:ai|artificial intelligence|machine learning|ml|llms?|generative|genai|gpt\w*|models?)\b|\ba\.i\.(?!\w)',
+    'negative': r'\b(?:how to|top \d+|best \w+ (?:tools|apps)|jobs?|careers?|hiring|course|tutorial|review)\b',
+}
+# Runs of capitalized words, e.g. "Google Cloud" or "NVIDIA" (case-sensitive)
+COMPANY_NAME_PATTERN = r'\b[A-Z][A-Za-z0-9&\-]+(?:\s+[A-Z][A-Za-z0-9&\-]+)*'
+
+# Heuristic score = sum of capped feature counts times these weights
+FEATURE_WEIGHTS = {'keywords': 1.0, 'announcement': 1.0, 'ai_terms': 1.0, 'negative': -1.5}
+FEATURE_CAP = 3
+
+
+def load_classifier(path):
+    """
+    Load a tiny logistic model from JSON.
+
+    Format: {"bias": -2.0, "weights": {"keywords": 0.8, ...}, "threshold": 0.5}
+    where weights are keyed by the columns of score_texts.
+
+    Returns:
+        dict: The model, or None if path is empty or missing
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as infile:
+        model = json.load(infile)
+    model.setdefault('bias', 0.0)
+    model.setdefault('threshold', 0.5)
+    return model
+
+
+def score_texts(texts, min_score=None, min_companies=None, classifier=None):
+    """
+    Score texts for how likely they are to announce a partnership.
+
+    Features are computed for every text at once with pandas string methods.
+    Texts must keep their original case (company names are found by
+    capitalization).
+
+    Args:
+        texts (list[str] or pd.Series): Result texts, e.g. title + content
+        min_score (float, optional): Score needed to pass. If None, uses PREFILTER_MIN_SCORE
+        min_companies (int, optional): Company names needed to pass. If None, uses PREFILTER_MIN_COMPANIES
+        classifier (dict, optional): Logistic model from load_classifier; when given, the score
+            is its probability and the pass mark is its threshold
+
+    Returns:
+        pd.DataFrame: One row per text with feature counts, companies, score and passed
+    """
+    min_score = PREFILTER_MIN_SCORE if min_score is None else min_score
+    min_companies = PREFILTER_MIN_COMPANIES if min_companies is None else min_companies
+    texts = pd.Series(texts, dtype=object).fillna('').astype(str).reset_index(drop=True)
+
+    features = pd.DataFrame({
+        name: texts.str.count(f'(?i){pattern}').clip(upper=FEATURE_CAP)
+        for name, pattern in FEATURE_PATTERNS.items()
+    })
+    # Distinct capitalized names; sentence-initial words are counted too, so this over-counts slightly
+    features['companies'] = texts.str.findall(COMPANY_NAME_PATTERN).apply(lambda names: len(set(names)))
+
+    if classifier:
+        logit = classifier['bias'] + sum(features[name] * weight for name, weight in classifier['weights'].items())
+        features['score'] = 1 / (1 + (-logit).apply(math.exp))
+        threshold = classifier['threshold']
+    else:
+        features['score'] = sum(features[name] * weight for name, weight in FEATURE_WEIGHTS.items())
+        threshold = min_score
+
+    features['passed'] = (features['score'] >= threshold) & (features['companies'] >= min_companies)
+    return features
+
+
+class Prefilter:
+    """
+    Rejects search results that are obviously not partnership announcements
+    before any model call, and counts the LLM calls that saved. Safe to share
+    between threads.
+    """
+
+    def __init__(self, min_score=None, min_companies=None, classifier=None):
+        """
+        Args:
+            min_score (float, optional): See score_texts
+            min_companies (int, optional): See score_texts
+            classifier (dict, optional): Logistic model from load_classifier
+        """
+        self.min_score = min_score
+        self.min_companies = min_companies
+        self.classifier = classifier
+        self.scored = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def filter(self, results):
+        """
+        Keep the search results that pass the pre-filter.
+
+        Args:
+            results (list[dict]): Tavily results with title and content
+
+        Returns:
+            list[dict]: The results that passed, in their original order
+        """
+        if not results:
+            return []
+        texts = [f"{result.get('title') or ''} {result.get('content') or ''}" for result in results]
+        passed = score_texts(texts, self.min_score, self.min_companies, self.classifier)['passed'].tolist()
+        with self._lock:
+            self.scored += len(results)
+            self.rejected += passed.count(False)
+        return [result for result, keep in zip(results, passed) if keep]
+
+    def stats(self):
+        """
+        Return pre-filter counters.
+
+        Returns:
+            dict: scored, rejected, rejection_rate and llm_calls_saved (an upper bound:
+            one extraction and one validation call per rejected result)
+        """
+        with self._lock:
+            scored, rejected = self.scored, self.rejected
+        return {
+            'scored': scored,
+            'rejected': rejected,
+            'rejection_rate': rejected / scored if scored else 0.0,
+            'llm_calls_saved': rejected * LLM_CALLS_PER_RESULT,
+        }
+
+
+_prefilter = None
+_prefilter_lock = threading.Lock()
+
+
+def get_prefilter():
+    """Return the shared pre-filter, or None if it is disabled"""
+    global _prefilter
+    if not PREFILTER_ENABLED:
+        return None
+    with _prefilter_lock:
+        if _prefilter is None:
+            _prefilter = Prefilter(classifier=load_classifier(PREFILTER_MODEL_PATH))
+        return _prefilter
+
+
+def get_prefilter_stats():
+    """Return the shared pre-filter's counters (empty dict if disabled)"""
+    prefilter = get_prefilter()
+    return prefilter.stats() if prefilter else {}
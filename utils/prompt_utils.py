@@ -0,0 +1,135 @@
+import os
+import re
+from functools import lru_cache
+
+from utils.rate_limit_utils import estimate_tokens
+
+# Input token budget for a whole prompt (override via env vars), e.g.
+# MODEL_PROMPT_BUDGETS="gemma3:1b=1000,gpt-4o=4000". Models not listed use PROMPT_TOKEN_BUDGET.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 1500))
+MODEL_PROMPT_BUDGETS = {
+    name.strip(): int(limit)
+    for name, limit in (item.split('=') for item in os.getenv("MODEL_PROMPT_BUDGETS", "").split(',') if '=' in item)
+}
+
+# Words that mark a sentence as being about a partnership (matched as lowercase prefixes)
+PARTNERSHIP_KEYWORDS = ('partner', 'collaborat', 'agreement', 'alliance', 'join', 'team up', 'teams up',
+                        'announce', 'integrat', 'deal', 'invest')
+
+# Sentence boundaries: end punctuation followed by whitespace, or line breaks
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    """tiktoken encoding for an OpenAI model, or None if tiktoken is unavailable"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model=None):
+    """
+    Count the tokens a model would see for a text.
+
+    Uses the model's tiktoken encoding for OpenAI models when tiktoken is
+    installed; otherwise (and for local models) the rough estimate_tokens.
+
+    Args:
+        text (str): Text to count
+        model (str, optional): Model name
+
+    Returns:
+        int: Number of tokens
+    """
+    encoding = _encoding(model) if model and model.startswith(("gpt-", "o1", "o3", "o4")) else None
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def get_prompt_budget(model=None):
+    """Input token budget for a model (MODEL_PROMPT_BUDGETS, falling back to PROMPT_TOKEN_BUDGET)"""
+    return MODEL_PROMPT_BUDGETS.get(model, PROMPT_TOKEN_BUDGET)
+
+
+def split_sentences(text):
+    """Split text into non-empty sentences"""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def sentence_score(sentence, names=()):
+    """
+    Score how relevant a sentence is to a partnership between the named companies.
+
+    Each partner name mentioned scores 2 and each partnership keyword scores 1.
+    """
+    lowered = sentence.lower()
+    score = sum(2 for name in names if name and name.lower() in lowered)
+    return score + sum(1 for keyword in PARTNERSHIP_KEYWORDS if keyword in lowered)
+
+
+def pack_text(text, budget, names=(), model=None):
+    """
+    Fit a text into a token budget, keeping the most relevant sentences.
+
+    Text within the budget is returned unchanged. Otherwise sentences are
+    ranked by sentence_score (earlier sentences first on ties) and added while
+    they fit, then joined back in their original order.
+
+    Args:
+        text (str): Text to pack
+        budget (int): Maximum tokens for the packed text
+        names (tuple[str]): Partner names that make a sentence relevant
+        model (str, optional): Model the tokens are counted for
+
+    Returns:
+        str: The packed text
+    """
+    if not text or count_tokens(text, model) <= budget:
+        return text or ""
+
+    sentences = split_sentences(text)
+    ranked = sorted(range(len(sentences)), key=lambda i: (-sentence_score(sentences[i], names), i))
+
+    kept = []
+    used = 0
+    for i in ranked:
+        tokens = count_tokens(sentences[i], model) + 1
+        if used + tokens > budget:
+            continue
+        kept.append(i)
+        used += tokens
+
+    if not kept:
+        # A single sentence longer than the budget: keep its start
+        return sentences[ranked[0]][:max(0, budget) * 4]
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+def build_prompt(template, text, names=(), model=None, budget=None):
+    """
+    Fill a prompt template with as much of a text as the token budget allows.
+
+    The text replaces the "{text}" placeholder in the template, packed with
+    pack_text into whatever budget the rest of the prompt leaves. The text
+    appears in the prompt once.
+
+    Args:
+        template (str): Prompt containing a "{text}" placeholder
+        text (str): Article or search result text
+        names (tuple[str]): Partner names used to rank sentences
+        model (str, optional): Model the prompt is for (token counting and budget)
+        budget (int, optional): Tokens for the whole prompt. If None, uses get_prompt_budget(model)
+
+    Returns:
+        str: The prompt
+    """
+    budget = get_prompt_budget(model) if budget is None else budget
+    text_budget = budget - count_tokens(template.replace("{text}", ""), model)
+    return template.replace("{text}", pack_text(text, text_budget, names=names, model=model))
@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+
+# Request and token budgets per provider (override via env vars, 0 = unlimited).
+# The configured rate is a ceiling: limiters back off on 429s and climb back up to it.
+RATE_LIMITS = {
+    "tavily": {
+        "requests_per_second": float(os.getenv("TAVILY_RPS", 5)),
+        "tokens_per_minute": 0,
+    },
+    "openai": {
+        "requests_per_second": float(os.getenv("OPENAI_RPS", 5)),
+        "tokens_per_minute": float(os.getenv("OPENAI_TPM", 0)),
+    },
+    "ollama": {
+        "requests_per_second": float(os.getenv("OLLAMA_RPS", 0)),
+        "tokens_per_minute": 0,
+    },
+}
+
+# AIMD tuning: halve the rate on a 429, add a small step back per success
+RATE_DECREASE_FACTOR = float(os.getenv("RATE_DECREASE_FACTOR", 0.5))
+RATE_INCREASE_STEP = float(os.getenv("RATE_INCREASE_STEP", 0.1))
+MIN_REQUESTS_PER_SECOND = 0.05
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with additive-increase / multiplicative-decrease.
+
+    Each request takes one token from the request bucket, which refills at the
+    current rate. An optional second bucket limits tokens per minute (prompt
+    size). When the provider answers with 429 the rate is cut by
+    RATE_DECREASE_FACTOR and all callers wait for Retry-After; every success
+    raises it again by RATE_INCREASE_STEP up to the configured maximum.
+    Safe to share between threads.
+    """
+
+    def __init__(self, name, requests_per_second=0, tokens_per_minute=0):
+        """
+        Args:
+            name (str): Provider name, used in stats
+            requests_per_second (float): Maximum request rate. 0 for unlimited
+            tokens_per_minute (float): Maximum prompt tokens per minute. 0 for unlimited
+        """
+        self.name = name
+        self.max_rate = requests_per_second
+        self.rate = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._request_tokens = max(1.0, requests_per_second)
+        self._budget_tokens = tokens_per_minute
+        self._last_refill = now
+        self._blocked_until = 0.0
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.throttled_seconds = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.rate:
+            self._request_tokens = min(max(1.0, self.rate), self._request_tokens + elapsed * self.rate)
+        if self.tokens_per_minute:
+            self._budget_tokens = min(self.tokens_per_minute,
+                                      self._budget_tokens + elapsed * self.tokens_per_minute / 60)
+
+    def acquire(self, tokens=0):
+        """
+        Block until a request (and its token budget) is allowed.
+
+        Args:
+            tokens (int): Estimated tokens the request will use, counted against tokens_per_minute
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = 0.0
+                if self._blocked_until > now:
+                    wait = self._blocked_until - now
+                elif self.rate and self._request_tokens < 1:
+                    wait = (1 - self._request_tokens) / self.rate
+                elif self.tokens_per_minute and self._budget_tokens < tokens:
+                    wait = (tokens - self._budget_tokens) * 60 / self.tokens_per_minute
+
+                if wait <= 0:
+                    if self.rate:
+                        self._request_tokens -= 1
+                    if self.tokens_per_minute:
+                        self._budget_tokens -= tokens
+                    self.requests += 1
+                    self.throttled_seconds += waited
+                    return waited
+
+            time.sleep(wait)
+            waited += wait
+
+    def record_success(self):
+        """Additive increase after a successful request"""
+        with self._lock:
+            if self.max_rate and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE_STEP)
+
+    def record_rate_limited(self, retry_after=None):
+        """
+        Multiplicative decrease after a 429 response.
+
+        Args:
+            retry_after (float, optional): Seconds the provider asked us to wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.rate_limited += 1
+            if self.max_rate:
+                self.rate = max(MIN_REQUESTS_PER_SECOND, self.rate * RATE_DECREASE_FACTOR)
+                self._request_tokens = min(self._request_tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self):
+        """
+        Return limiter counters.
+
+        Returns:
+            dict: requests, rate_limited (429s seen), throttled_seconds and the current rate
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "throttled_seconds": self.throttled_seconds,
+                "current_rate": self.rate,
+                "max_rate": self.max_rate,
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider):
+    """Return the shared rate limiter for a provider, created from RATE_LIMITS on first use"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            limits = RATE_LIMITS.get(provider, {})
+            _limiters[provider] = RateLimiter(
+                provider,
+                requests_per_second=limits.get("requests_per_second", 0),
+                tokens_per_minute=limits.get("tokens_per_minute", 0),
+            )
+        return _limiters[provider]
+
+
+def get_rate_limit_stats():
+    """Return stats for every limiter used so far, keyed by provider"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.stats() for provider, limiter in limiters.items()}
+
+
+def estimate_tokens(text):
+    """Rough token count for rate budgeting (about 4 characters per token)"""
+    return len(text) // 4 + 1 if isinstance(text, str) else 0
+
+
+def is_rate_limit_error(error):
+    """Check whether an exception from a provider client is a 429 / rate limit error"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+
+    message = f"{type(error).__name__} {error}".lower()
+    return "ratelimit" in message or "rate limit" in message or "429" in message
+
+
+def get_retry_after(error):
+    """Return the Retry-After delay (seconds) carried by a provider error, if any"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def record_error(provider, error):
+    """Feed a failed request back into the provider's limiter (backs off on 429s)"""
+    if is_rate_limit_error(error):
+        get_rate_limiter(provider).record_rate_limited(get_retry_after(error))
@@ -0,0 +1,293 @@
+import os
+import random
+import socket
+import threading
+import time
+
+from utils.rate_limit_utils import is_rate_limit_error, get_retry_after, record_error
+
+# Retries, backoff and circuit breaking for provider calls (override via env vars)
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3)) # retries after the first attempt
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", 1.0)) # seconds; doubles per retry, with full jitter
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", 30.0)) # seconds
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5)) # consecutive failures that open a circuit
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 60)) # open circuits let a trial call through after this
+
+# HTTP statuses worth retrying (timeouts, conflicts, server errors)
+RETRYABLE_STATUSES = {408, 409, 425, 500, 502, 503, 504, 520, 522, 524, 529}
+# Exception names (or parts of them) from provider clients that mean the call may succeed later
+TRANSIENT_ERROR_NAMES = ("timeout", "connection", "serviceunavailable", "internalserver", "overloaded",
+                         "temporar", "remotedisconnected", "protocolerror")
+TRANSIENT_ERROR_MESSAGES = ("timed out", "timeout", "connection reset", "connection refused", "connection aborted",
+                            "temporarily unavailable", "service unavailable", "bad gateway", "overloaded",
+                            "server error", "try again")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, provider, retry_in):
+        super().__init__(f"{provider} circuit is open; retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def _status_code(error):
+    status = getattr(error, "status_code", None) or getattr(error, "status", None) or getattr(error, "code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_error(error):
+    """
+    Classify a failed provider call.
+
+    Returns:
+        str: "rate_limited" (429), "transient" (timeouts, connection errors, 5xx,
+        open circuits; worth retrying) or "fatal" (bad requests, auth, parsing; retrying cannot help)
+    """
+    if isinstance(error, CircuitOpenError):
+        return "transient"
+    if is_rate_limit_error(error):
+        return "rate_limited"
+    status = _status_code(error)
+    if status is not None and 100 <= status < 600:
+        return "transient" if status in RETRYABLE_STATUSES else "fatal"
+    if isinstance(error, (TimeoutError, ConnectionError, socket.timeout)):
+        return "transient"
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    if any(part in name for part in TRANSIENT_ERROR_NAMES) or any(part in message for part in TRANSIENT_ERROR_MESSAGES):
+        return "transient"
+    return "fatal"
+
+
+def is_retryable(error):
+    """True if a failed call may succeed when tried again later"""
+    return classify_error(error) != "fatal"
+
+
+def backoff_delay(retry, retry_after=None):
+    """
+    Seconds to wait before a retry: exponential with full jitter, at least Retry-After.
+
+    Args:
+        retry (int): Retry number, starting at 1
+        retry_after (float, optional): Delay the provider asked for
+    """
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (retry - 1)))
+    return max(delay, retry_after or 0.0)
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive retryable failures the circuit
+    opens and calls fail fast with CircuitOpenError instead of waiting on a
+    provider that is down. After reset_seconds one trial call is let through
+    (half-open): success closes the circuit, failure opens it again. A fatal
+    error (e.g. a bad request) means the provider answered, so it counts as
+    healthy. Safe to share between threads.
+    """
+
+    def __init__(self, provider, failure_threshold=None, reset_seconds=None):
+        """
+        Args:
+            provider (str): Provider name, used in errors and stats
+            failure_threshold (int, optional): If None, uses CIRCUIT_FAILURE_THRESHOLD
+            reset_seconds (float, optional): If None, uses CIRCUIT_RESET_SECONDS
+        """
+        self.provider = provider
+        self.failure_threshold = failure_threshold or CIRCUIT_FAILURE_THRESHOLD
+        self.reset_seconds = CIRCUIT_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_in(self):
+        """Seconds until an open circuit lets a trial call through (0 if it is not open)"""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def before_call(self):
+        """Raise CircuitOpenError if the provider should not be called now"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "open" or (self.state == "half_open" and self._trial_in_flight):
+                self.rejected += 1
+                raise CircuitOpenError(self.provider, max(0.0, self._opened_at + self.reset_seconds - time.monotonic()))
+            if self.state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print(f"{self.provider} circuit closed")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                if self.state == "closed":
+                    print(f"{self.provider} circuit opened after {self.failures} consecutive failures")
+                self.state = "open"
+                self.opened += 1
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def stats(self):
+        """
+        Return breaker counters.
+
+        Returns:
+            dict: state, consecutive failures, times opened and calls rejected while open
+        """
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider):
+    """Return the shared circuit breaker for a provider"""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+def get_circuit_breaker_stats():
+    """Return stats for every circuit breaker used so far, keyed by provider"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {provider: breaker.stats() for provider, breaker in breakers.items()}
+
+
+def call_with_retry(provider, func, max_retries=None, attrs=None, limiter_provider=None):
+    """
+    Call func, retrying retryable failures with jittered exponential backoff.
+
+    Each attempt goes through the provider's circuit breaker. Failures are fed
+    to the provider's rate limiter (which slows down on 429s), so func should
+    acquire its rate limit inside, once per attempt.
+
+    Args:
+        provider (str): Circuit breaker name (e.g. "openai", "tavily", "crawl:example.com")
+        func (callable): The call, without arguments
+        max_retries (int, optional): Retries after the first attempt. If None, uses MAX_RETRIES
+        attrs (dict, optional): Span attributes; "retries" is set to the number of retries made
+        limiter_provider (str, optional): Rate limiter fed with the errors. If None, uses provider
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        CircuitOpenError: The provider's circuit is open
+        Exception: The last error, if it is fatal or the retries ran out
+    """
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    breaker = get_circuit_breaker(provider)
+    retry = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            record_error(limiter_provider or provider, e)
+            kind = classify_error(e)
+            if kind == "fatal":
+                # The provider answered, so it is up; retrying the same call cannot help
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if retry >= max_retries:
+                raise
+            retry += 1
+            if attrs is not None:
+                attrs["retries"] = retry
+            delay = backoff_delay(retry, get_retry_after(e))
+            print(f"{provider}: {kind} error ({type(e).__name__}), retry {retry}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def wait_for_circuits(timeout=None):
+    """Sleep until every open circuit lets a trial call through (at most timeout seconds, default CIRCUIT_RESET_SECONDS)"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    wait = max([breaker.retry_in() for breaker in breakers] + [0.0])
+    wait = min(wait, CIRCUIT_RESET_SECONDS if timeout is None else timeout)
+    if wait > 0:
+        print(f"Waiting {wait:.0f}s for open circuits before retrying deferred work")
+        time.sleep(wait)
+
+
+class RetryQueue:
+    """
+    Work that failed with a retryable error, to be tried again at the end of a run.
+
+    Instead of leaving an item unfinished when its provider is down or its
+    retries ran out, callers add a function that redoes it; drain() waits for
+    open circuits and calls each once more. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._items = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def add(self, label, func, error=None):
+        """
+        Queue work for later.
+
+        Args:
+            label (str): What the work is, for messages
+            func (callable): Redoes the work, without arguments
+            error (Exception, optional): Why it failed
+        """
+        with self._lock:
+            self._items.append((label, func))
+        print(f"Deferred {label}{f' ({type(error).__name__}: {error})' if error else ''}")
+
+    def drain(self):
+        """
+        Retry every queued item once (after waiting for open circuits).
+
+        Returns:
+            tuple[list, list]: ([(label, result)] that succeeded, [(label, error)] that failed again)
+        """
+        with self._lock:
+            items, self._items = self._items, []
+        if not items:
+            return [], []
+
+        wait_for_circuits()
+        print(f"Retrying {len(items)} deferred items")
+        succeeded, failed = [], []
+        for label, func in items:
+            try:
+                succeeded.append((label, func()))
+            except Exception as e:
+                print(f"Retry of {label} failed: {type(e).__name__}: {e}")
+                failed.append((label, e))
+        return succeeded, failed
@@ -2,26 +2,41 @@ import csv
 import os
 
 def split_csv_by_rows(input_path, output_prefix, max_rows=50):
+    """Split a CSV into _NN.csv shards of max_rows rows, reading one row at a time.
+
+    No longer needed to run updatePartnerships.py on large files, which now
+    streams the input in chunks (see update_partnerships_streaming).
+    """
     with open(input_path, 'r', newline='', encoding='utf-8') as infile:
-        reader = list(csv.reader(infile))
-        header = reader[0]
-        rows = reader[1:]
+        reader = csv.reader(infile)
+        header = next(reader)
+
+        file_number = 0
+        outfile = None
+        writer = None
+        rows_in_file = 0
+
+        for row in reader:
+            # Start a new shard when the current one is full
+            if writer is None or rows_in_file == max_rows:
+                if outfile:
+                    outfile.close()
+                    print(f"Wrote {output_path} with {rows_in_file} rows.")
+                file_number += 1
+                output_path = f"{output_prefix}_{file_number:02d}.csv"
+                outfile = open(output_path, 'w', newline='', encoding='utf-8')
+                writer = csv.writer(outfile)
+                writer.writerow(header)
+                rows_in_file = 0
 
-    total_rows = len(rows)
-    num_files = (total_rows + max_rows - 1) // max_rows
+            writer.writerow(row)
+            rows_in_file += 1
 
-    for i in range(num_files):
-        start = i * max_rows
-        end = start + max_rows
-        chunk = rows[start:end]
-        output_path = f"{output_prefix}_{i+1:02d}.csv"
-        with open(output_path, 'w', newline='', encoding='utf-8') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow(header)
-            writer.writerows(chunk)
-        print(f"Wrote {output_path} with {len(chunk)} rows.")
+        if outfile:
+            outfile.close()
+            print(f"Wrote {output_path} with {rows_in_file} rows.")
 
 if __name__ == "__main__":
     input_file = "data/AI Partnerships.csv"
     output_prefix = "data/AI Partnerships"
-    split_csv_by_rows(input_file, output_prefix, max_rows=50) 
\ No newline at end of file
+    split_csv_by_rows(input_file, output_prefix, max_rows=50) 
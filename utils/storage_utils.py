@@ -0,0 +1,413 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+from utils.trace_utils import span
+from utils.blob_utils import intern_columns, resolve_columns
+
+# Default format for new tables when the path has no known extension (override via env var)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv") # csv, parquet or sqlite
+# Table name inside SQLite files
+SQLITE_TABLE = os.getenv("SQLITE_TABLE", "partnerships")
+
+# File extensions of each backend
+BACKEND_EXTENSIONS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.sqlite': 'sqlite',
+    '.db': 'sqlite',
+}
+
+
+def default_output_path(csv_path: str) -> str:
+    """Output path next to the input file, e.g. 'data/x.csv' -> 'data/x_updated.csv'"""
+    dirname, filename = os.path.split(csv_path)
+    base, ext = os.path.splitext(filename)
+    return os.path.join(dirname, f"{base}_updated{ext}")
+
+
+class CSVStorage:
+    """
+    Partnerships table in a CSV file.
+
+    CSV cannot be updated in place, so upserts and appends of changed columns
+    rewrite the file; projection still skips parsing unused columns.
+
+    Every backend writes blob references (see utils/blob_utils.py) out as their
+    texts, so a saved table never depends on the blob store.
+    """
+
+    supports_upsert = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def read(self, columns=None):
+        """Read the table, or only the given columns (missing columns are ignored)"""
+        usecols = (lambda name: name in set(columns)) if columns else None
+        return pd.read_csv(self.path, usecols=usecols)
+
+    def iter_chunks(self, chunksize, columns=None):
+        """Yield the table in chunks of rows (index continues across chunks)"""
+        usecols = (lambda name: name in set(columns)) if columns else None
+        yield from pd.read_csv(self.path, chunksize=chunksize, usecols=usecols)
+
+    def write(self, df):
+        """Replace the table with df"""
+        resolve_columns(df).to_csv(self.path, index=False)
+
+    def append(self, df):
+        """Add rows to the end of the table (creating it with a header if needed)"""
+        df = resolve_columns(df)
+        exists = self.exists()
+        if exists:
+            # Line the columns up with the existing header
+            df = df.reindex(columns=pd.read_csv(self.path, nrows=0).columns)
+        df.to_csv(self.path, index=False, mode='a' if exists else 'w', header=not exists)
+
+    def upsert(self, df, columns=None):
+        """Update rows by index (and add new ones); rewrites the whole file"""
+        upsert_frame(self, df, columns)
+
+    def sync(self, df):
+        """Make the table hold exactly the rows of df"""
+        self.write(df)
+
+    def close(self):
+        """Finish any pending writes"""
+
+    def export_csv(self, path):
+        """Copy the table to a CSV file"""
+        CSVStorage(path).write(self.read())
+
+
+class ParquetStorage(CSVStorage):
+    """
+    Partnerships table in a Parquet file (requires pyarrow).
+
+    Columnar: reading a projection decodes only those columns, so stages that
+    need only partner names never load the article text. The row index is
+    stored with the data.
+
+    Parquet files cannot be appended to once closed, so write() leaves a
+    ParquetWriter open: append() adds each further chunk as a row group and
+    close() finishes the file. Appending to a closed file, or a chunk that does
+    not fit the file's schema, rewrites it.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError("The Parquet storage backend requires pyarrow (pip install pyarrow)") from e
+        self._writer = None
+        self._schema = None
+
+    def _existing_columns(self, columns):
+        import pyarrow.parquet as pq
+        names = set(pq.read_schema(self.path).names)
+        return [name for name in columns if name in names]
+
+    def iter_chunks(self, chunksize, columns=None):
+        import pyarrow.parquet as pq
+        self.close()
+        columns = self._existing_columns(columns) if columns else None
+        parquet_file = pq.ParquetFile(self.path)
+        index_columns = [name for name in parquet_file.schema_arrow.pandas_metadata.get('index_columns', [])
+                         if isinstance(name, str)] if parquet_file.schema_arrow.pandas_metadata else []
+        start = 0
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns + index_columns if columns else None):
+            chunk = batch.to_pandas()
+            if not index_columns:
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _text_frame(df):
+        """df with blob references resolved and object columns holding only strings or None"""
+        df = resolve_columns(df)
+        objects = [name for name in df.columns if df[name].dtype == object]
+        if objects:
+            df = df.copy()
+            for name in objects:
+                df[name] = df[name].map(lambda value: value if isinstance(value, str) or not pd.notna(value) else str(value))
+        return df
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.close()
+        df = self._text_frame(df)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        # Columns that are empty or text in the first chunk are stored as text, so
+        # later chunks can fill them in (an all-NaN CSV column is read as float64)
+        text = {name for name in df.columns if df[name].dtype == object or df[name].isna().all()}
+        self._schema = pa.schema([field.with_type(pa.string())
+                                  if pa.types.is_null(field.type) or field.name in text else field
+                                  for field in table.schema], metadata=table.schema.metadata)
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def append(self, df):
+        import pyarrow as pa
+        if self._writer is None:
+            self.write(pd.concat([self.read(), df]) if self.exists() else df)
+            return
+        df = self._text_frame(df)
+        try:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+            # The chunk does not fit the file's schema (e.g. text in a numeric
+            # column, or a new column): rewrite the file with the columns widened
+            self.write(pd.concat([self.read(), df]))
+            return
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def read(self, columns=None):
+        self.close()
+        return pd.read_parquet(self.path, columns=self._existing_columns(columns) if columns else None)
+
+
+class SQLiteStorage:
+    """
+    Partnerships table in a SQLite database.
+
+    The DataFrame index is stored as the row_id primary key. Projection selects
+    only the requested columns, and upsert updates just the given columns of
+    the given rows in place. sync updates an existing table in place too, so
+    columns added by other stages (e.g. model summaries) are kept.
+    """
+
+    supports_upsert = True
+
+    def __init__(self, path, table=None):
+        self.path = path
+        self.table = table or SQLITE_TABLE
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _table_columns(self, conn):
+        return [row[1] for row in conn.execute(f'PRAGMA table_info("{self.table}")')]
+
+    def exists(self):
+        if not os.path.exists(self.path):
+            return False
+        with self._connect() as conn:
+            return bool(self._table_columns(conn))
+
+    def _select(self, conn, columns):
+        names = self._table_columns(conn)
+        if columns:
+            names = ['row_id'] + [name for name in columns if name in names and name != 'row_id']
+        return f'SELECT {", ".join(f"{chr(34)}{name}{chr(34)}" for name in names)} FROM "{self.table}" ORDER BY row_id'
+
+    def read(self, columns=None):
+        """Read the table, or only the given columns (missing columns are ignored)"""
+        with self._connect() as conn:
+            df = pd.read_sql_query(self._select(conn, columns), conn, index_col='row_id')
+        df.index.name = None
+        return df
+
+    def iter_chunks(self, chunksize, columns=None):
+        """Yield the table in chunks of rows, indexed by row_id"""
+        conn = self._connect()
+        try:
+            for chunk in pd.read_sql_query(self._select(conn, columns), conn, index_col='row_id', chunksize=chunksize):
+                chunk.index.name = None
+                yield chunk
+        finally:
+            conn.close()
+
+    def write(self, df):
+        """Replace the table with df"""
+        with self._connect() as conn:
+            resolve_columns(df).to_sql(self.table, conn, if_exists='replace', index=True, index_label='row_id')
+            conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.table}_row_id" ON "{self.table}"(row_id)')
+
+    def append(self, df):
+        """Add rows to the table (creating it if needed)"""
+        if not self.exists():
+            self.write(df)
+            return
+        self.upsert(df)
+
+    def upsert(self, df, columns=None):
+        """
+        Update rows in place by index, inserting rows that are not there yet.
+
+        Args:
+            df (pd.DataFrame): Rows to write, indexed like the table
+            columns (list[str], optional): Columns to write. If None, every column of df
+        """
+        if not self.exists():
+            self.write(df if columns is None else df[list(columns)])
+            return
+
+        columns = list(columns) if columns is not None else list(df.columns)
+        df = resolve_columns(df[columns])
+        with self._connect() as conn:
+            existing = set(self._table_columns(conn))
+            for name in columns:
+                if name not in existing:
+                    conn.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{name}"')
+
+            quoted = ", ".join(f'"{name}"' for name in columns)
+            updates = ", ".join(f'"{name}" = excluded."{name}"' for name in columns)
+            rows = [
+                (int(index), *(None if pd.isna(value) else (value.item() if hasattr(value, 'item') else value)
+                               for value in values))
+                for index, values in zip(df.index, df[columns].itertuples(index=False, name=None))
+            ]
+            conn.executemany(
+                f'INSERT INTO "{self.table}" (row_id, {quoted}) VALUES (?, {", ".join("?" for _ in columns)}) '
+                f'ON CONFLICT(row_id) DO UPDATE SET {updates}',
+                rows,
+            )
+
+    def sync(self, df):
+        """
+        Make the table hold exactly the rows of df.
+
+        Every column of df is upserted and rows whose row_id is not in df are
+        deleted; columns of the table that df does not have are left as they are.
+        """
+        if not self.exists():
+            self.write(df)
+            return
+        self.upsert(df)
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE keep_rows (row_id INTEGER PRIMARY KEY)")
+            conn.executemany("INSERT INTO keep_rows (row_id) VALUES (?)", [(int(index),) for index in df.index])
+            conn.execute(f'DELETE FROM "{self.table}" WHERE row_id NOT IN (SELECT row_id FROM keep_rows)')
+
+    def close(self):
+        """Nothing to finish; every write is committed straight away"""
+
+    def export_csv(self, path):
+        """Copy the table to a CSV file"""
+        CSVStorage(path).write(self.read())
+
+
+def upsert_frame(storage, df, columns=None):
+    """Upsert for backends without in-place updates: read, merge by index and rewrite"""
+    if not storage.exists():
+        storage.write(df)
+        return
+    current = storage.read()
+    columns = list(columns) if columns is not None else list(df.columns)
+    for name in columns:
+        if name not in current.columns:
+            current[name] = None
+    new_rows = df.index.difference(current.index)
+    if len(new_rows):
+        current = pd.concat([current, df.loc[new_rows, columns]])
+    existing_rows = df.index.intersection(current.index).difference(new_rows)
+    current.loc[existing_rows, columns] = df.loc[existing_rows, columns]
+    storage.write(current)
+
+
+def storage_backend(path):
+    """Backend name for a path, from its extension (STORAGE_BACKEND if unknown)"""
+    return BACKEND_EXTENSIONS.get(os.path.splitext(path)[1].lower(), STORAGE_BACKEND)
+
+
+def open_storage(path, backend=None):
+    """
+    Open a partnerships table.
+
+    Args:
+        path (str): File path; the extension picks the backend (.csv, .parquet, .sqlite / .db)
+        backend (str, optional): Force "csv", "parquet" or "sqlite"
+
+    Returns:
+        CSVStorage, ParquetStorage or SQLiteStorage
+    """
+    backend = backend or storage_backend(path)
+    if backend == 'sqlite':
+        return SQLiteStorage(path)
+    if backend == 'parquet':
+        return ParquetStorage(path)
+    return CSVStorage(path)
+
+
+def read_table(path, columns=None):
+    """
+    Read a partnerships table from any backend, timed as a storage.read span.
+
+    Long article texts and summaries are moved into the blob store, so the
+    frame holds references to them (see utils/blob_utils.py).
+
+    Args:
+        path (str): Table path (see open_storage)
+        columns (list[str], optional): Only read these columns
+
+    Returns:
+        pd.DataFrame: The table
+    """
+    with span("storage.read", path=path, columns=len(columns) if columns else None,
+              bytes_in=os.path.getsize(path)) as attrs:
+        df = intern_columns(open_storage(path).read(columns))
+        attrs["rows"] = len(df)
+    return df
+
+
+def save_table(df, path):
+    """
+    Save a partnerships table, timed as a storage.write span.
+
+    Afterwards the table holds exactly the rows of df. Backends that update in
+    place (SQLite) sync an existing table (see SQLiteStorage.sync); the others
+    rewrite the file.
+
+    Args:
+        df (pd.DataFrame): The table
+        path (str): Table path (see open_storage)
+    """
+    storage = open_storage(path)
+    with span("storage.write", path=path, rows=len(df)):
+        storage.sync(df)
+        storage.close()
+
+
+def read_csv_with_output_path(csv_path: str, output_path: str = None, columns: list = None) -> tuple[pd.DataFrame, str]:
+    """
+    Read a CSV file and generate an output path if not provided.
+
+    Also reads Parquet and SQLite tables (see open_storage).
+
+    Args:
+        csv_path (str): Path to input CSV file
+        output_path (str, optional): Path to save updated CSV. If None, creates a new filename
+        columns (list[str], optional): Only read these columns
+
+    Returns:
+        tuple[pd.DataFrame, str]: DataFrame containing the CSV data and the output path
+    """
+    # If no output path is provided, create one based on the input filename
+    if not output_path:
+        output_path = default_output_path(csv_path)
+
+    # Read the CSV file
+    try:
+        return read_table(csv_path, columns), output_path
+    except Exception as e:
+        print(f"Error reading CSV: {e}")
+        raise
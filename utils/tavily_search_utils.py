@@ -1,9 +1,102 @@
 from tavily import TavilyClient
+import hashlib
+import json
 import os
+import threading
+
+from utils.concurrency_utils import provider_slot, map_in_order, PROVIDER_CONCURRENCY
+from utils.url_utils import canonicalize_url
+from utils.cache_utils import SQLiteCache, make_cache_key
+from utils.rate_limit_utils import get_rate_limiter
+from utils.retry_utils import call_with_retry, is_retryable, RetryQueue
+from utils.trace_utils import span
 
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 TAVILY_MAX_RESULTS = int(os.getenv("TAVILY_MAX_RESULTS", 1))  # Default to 1 if not set
 
+# Persistent cache for search responses
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true" # default to True
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "data/cache/tavily_search.sqlite")
+SEARCH_CACHE_MAX_MB = float(os.getenv("SEARCH_CACHE_MAX_MB", 200))
+
+# How long cached responses stay fresh (seconds), by time_range.
+# Narrow time ranges go stale quickly; unbounded searches rarely change.
+SEARCH_CACHE_TTLS = {
+    "day": 60 * 60,
+    "week": 6 * 60 * 60,
+    "month": 24 * 60 * 60,
+    "year": 7 * 24 * 60 * 60,
+    None: 30 * 24 * 60 * 60,
+}
+
+# Tavily's time ranges, by the days they cover (numbers of days are mapped to the
+# shortest range covering them; see normalize_time_range)
+TIME_RANGE_DAYS = {"day": 1, "week": 7, "month": 31, "year": 366}
+TIME_RANGE_ALIASES = {"d": "day", "w": "week", "m": "month", "y": "year"}
+
+_client = None
+_search_cache = None
+_lock = threading.Lock()
+
+
+def get_tavily_client():
+    """Return a shared TavilyClient, created on first use"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = TavilyClient()
+        return _client
+
+
+def get_search_cache():
+    """Return the shared search cache, or None if caching is disabled"""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _search_cache is None:
+            _search_cache = SQLiteCache(SEARCH_CACHE_PATH, max_bytes=int(SEARCH_CACHE_MAX_MB * 1024 * 1024))
+        return _search_cache
+
+
+def get_search_cache_stats():
+    """Return hit/miss counters for the search cache (empty dict if disabled)"""
+    cache = get_search_cache()
+    return cache.stats() if cache else {}
+
+
+def normalize_time_range(time_range):
+    """
+    Turn a time range into one Tavily accepts.
+
+    Numbers of days map to the shortest range covering them (e.g. 30 -> "month";
+    more than a year -> None, no limit), and "d"/"w"/"m"/"y" to their full names.
+    Other values are returned unchanged.
+    """
+    if time_range is None or isinstance(time_range, bool):
+        return time_range
+    if isinstance(time_range, (int, float)):
+        for name, days in TIME_RANGE_DAYS.items():
+            if time_range <= days:
+                return name
+        return None
+    time_range = str(time_range).strip().lower()
+    return TIME_RANGE_ALIASES.get(time_range, time_range)
+
+
+def search_cache_ttl(time_range):
+    """Seconds a response stays fresh; ranges without their own TTL get the shortest one"""
+    return SEARCH_CACHE_TTLS.get(time_range, min(SEARCH_CACHE_TTLS.values()))
+
+
+def normalize_query(query):
+    """Normalize a search query for cache lookups (quotes, case and whitespace)"""
+    return " ".join(query.strip().strip('"').lower().split())
+
+
+def _search_cache_key(query, max_results, search_depth, time_range):
+    return make_cache_key("tavily", normalize_query(query), max_results, search_depth, time_range)
+
 # def search_tavily(query, max_results=TAVILY_MAX_RESULTS):
 #     """
 #     Search Tavily for a given query.
@@ -23,7 +116,7 @@ TAVILY_MAX_RESULTS = int(os.getenv("TAVILY_MAX_RESULTS", 1))  # Default to 1 if
 #     return search_response
 
 # web search using tavily api - basic or advanced search depth
-def web_search(query, max_results=TAVILY_MAX_RESULTS, search_depth="advanced", time_range=None):  
+def web_search(query, max_results=TAVILY_MAX_RESULTS, search_depth="advanced", time_range=None, raise_retryable=False):  
   """
     Performs a web search using the Tavily API.
 
@@ -38,7 +131,15 @@ def web_search(query, max_results=TAVILY_MAX_RESULTS, search_depth="advanced", t
         "Advanced" search depth is more comprehensive but slower and more expensive.
 
         time_range (str): The time range of search results. Default is None. 
-        Other options include: none, day, week, month, year
+        Other options include: none, day, week, month, year, or a number of days
+        (see normalize_time_range)
+
+    Responses are cached on disk (see SEARCH_CACHE_*), keyed on the normalized
+    query and the search parameters. Failed searches are not cached.
+
+    Transient failures are retried with backoff (see utils/retry_utils.py).
+    raise_retryable (bool): If a search still fails with a retryable error, raise
+    it instead of returning None, so the caller can try again later.
 
     Returns:
         dict: A dictionary containing the search results from Tavily. The results typically include:
@@ -49,19 +150,126 @@ def web_search(query, max_results=TAVILY_MAX_RESULTS, search_depth="advanced", t
             - published_date: When the content was published (if available)
   """
   query = query.strip('"')
+  time_range = normalize_time_range(time_range)
+
+  with span("tavily.search", query=query, time_range=time_range, bytes_in=len(query)) as attrs:
+      # Serve repeated searches from the cache
+      cache = get_search_cache()
+      cache_key = _search_cache_key(query, max_results, search_depth, time_range)
+      if cache:
+          cached = cache.get(cache_key)
+          if cached is not None:
+              attrs.update(cached=True, results=len(cached.get("results", [])))
+              return cached
+
+      try:
+          # Reuse the shared client
+          client = get_tavily_client()
+
+          # Perform the search, bounded by the Tavily concurrency and rate limits
+          limiter = get_rate_limiter("tavily")
+          attrs["throttled_seconds"] = 0.0
+
+          def attempt():
+              with provider_slot("tavily"):
+                  attrs["throttled_seconds"] += limiter.acquire()
+                  return client.search(
+                      query=query,
+                      search_depth=search_depth,  
+                      max_results=max_results,
+                      time_range=time_range
+                  )
+
+          response = call_with_retry("tavily", attempt, attrs=attrs)
+          limiter.record_success()
+          attrs.update(cached=False, results=len(response.get("results", [])) if response else 0,
+                       bytes_out=len(json.dumps(response, default=str)) if response else 0)
+
+          if cache and response:
+              cache.set(cache_key, response, ttl=search_cache_ttl(time_range))
+          return response
+      except Exception as e:
+          attrs["error"] = f"{type(e).__name__}: {e}"
+          print(f"Search error: {e}")
+          if raise_retryable and is_retryable(e):
+              raise
+          return None
+
+
+def content_hash(result):
+  """Hash of a result's content with case and whitespace normalized, to spot the same article at different URLs"""
+  content = " ".join((result.get("content") or "").lower().split())
+  return hashlib.sha256(content.encode("utf-8")).hexdigest() if content else None
+
+
+def merge_search_results(queries, responses):
+  """
+    Merge the results of several searches, dropping duplicates.
+
+    A result is a duplicate if its canonical URL (see canonicalize_url) or its
+    content hash was already seen in an earlier query or earlier in the same one.
+
+    Args:
+        queries (list[str]): The queries, in order
+        responses (list[dict]): web_search response for each query (None for failed searches)
+
+    Returns:
+        tuple[list[dict], dict]: The unique results in query order, and for each query
+        the number of results it returned and the number of unique results it added
+  """
+  seen_urls = set()
+  seen_hashes = set()
+  unique_results = []
+  counts = {}
+
+  for query, response in zip(queries, responses):
+      results = (response or {}).get("results") or []
+      added = 0
+      for result in results:
+          url = canonicalize_url(result["url"]) if result.get("url") else None
+          digest = content_hash(result)
+          if (url and url in seen_urls) or (digest and digest in seen_hashes):
+              continue
+          seen_urls.add(url)
+          seen_hashes.add(digest)
+          unique_results.append(result)
+          added += 1
+      counts[query] = {"results": len(results), "unique": added}
+
+  return unique_results, counts
+
+
+def web_search_many(queries, max_results=TAVILY_MAX_RESULTS, search_depth="advanced", time_range=None, max_workers=None):
+  """
+    Run several searches concurrently and merge their results (see merge_search_results).
+
+    Searches still share the Tavily concurrency and rate limits of web_search.
+    Searches that still fail with a retryable error (e.g. while the Tavily
+    circuit is open) are tried once more after the others have finished.
+
+    Args:
+        queries (list[str]): Search queries
+        max_results, search_depth, time_range: Passed to web_search for every query
+        max_workers (int, optional): Searches in flight at once. If None, uses TAVILY_CONCURRENCY
+
+    Returns:
+        tuple[list[dict], dict]: Unique results in query order, and per-query result counts
+  """
+  max_workers = max_workers or PROVIDER_CONCURRENCY.get("tavily", 1)
+  retry_queue = RetryQueue()
+
+  def search(i):
+    def run():
+      return web_search(queries[i], max_results=max_results, search_depth=search_depth,
+                        time_range=time_range, raise_retryable=True)
+    try:
+      return run()
+    except Exception as e:
+      retry_queue.add(f"search {queries[i]!r}", lambda: (i, run()), e)
+      return None
 
-  try:
-      # Initialize the client
-      client = TavilyClient()
-
-      # Perform the search
-      response = client.search(
-          query=query,
-          search_depth=search_depth,  
-          max_results=max_results,
-          time_range=time_range
-      )
-      return response
-  except Exception as e:
-      print(f"Search error: {e}")
-      return None
\ No newline at end of file
+  responses = map_in_order(search, range(len(queries)), max_workers=max_workers)
+  succeeded, _ = retry_queue.drain()
+  for _, (i, response) in succeeded:
+    responses[i] = response
+  return merge_search_results(queries, responses)
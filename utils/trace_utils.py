@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.benchmark_utils import percentile
+
+# Per-stage tracing (override via env vars)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() == "true" # default to True
+TRACE_DIR = os.getenv("TRACE_DIR", "data/traces") # one JSONL file per run
+TRACE_PATH = os.getenv("TRACE_PATH") # explicit JSONL file, overrides TRACE_DIR
+
+# Numeric span attributes summed per stage in the report
+SUMMED_ATTRIBUTES = ("bytes_in", "bytes_out", "prompt_tokens", "response_tokens", "retries", "throttled_seconds")
+
+
+class Tracer:
+    """
+    Records timed spans to a JSONL file and aggregates them per stage.
+
+    Each span is written as one JSON line (stage, start time, duration, error
+    and any attributes such as payload sizes or token counts). Only per-stage
+    aggregates are kept in memory. Safe to use from several threads.
+    """
+
+    def __init__(self, jsonl_path=None, wandb_run=None):
+        """
+        Args:
+            jsonl_path (str, optional): File spans are appended to. None to keep only the report
+            wandb_run (optional): wandb run that receives the report in log_trace_report_to_wandb
+        """
+        self.jsonl_path = jsonl_path
+        self.wandb_run = wandb_run
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, stage, start, duration, error=None, **attrs):
+        """Record one finished span"""
+        with self._lock:
+            stats = self._stages.setdefault(stage, {"durations": [], "errors": 0,
+                                                    **{name: 0 for name in SUMMED_ATTRIBUTES}})
+            stats["durations"].append(duration)
+            if error:
+                stats["errors"] += 1
+            for name in SUMMED_ATTRIBUTES:
+                value = attrs.get(name)
+                if isinstance(value, (int, float)):
+                    stats[name] += value
+
+            if self.jsonl_path:
+                if self._file is None:
+                    dirname = os.path.dirname(self.jsonl_path)
+                    if dirname:
+                        os.makedirs(dirname, exist_ok=True)
+                    self._file = open(self.jsonl_path, "a", encoding="utf-8")
+                record = {"run_id": self.run_id, "stage": stage, "start": start,
+                          "duration": duration, "error": error, **attrs}
+                self._file.write(json.dumps(record, default=str) + "\n")
+                self._file.flush()
+
+    def report(self):
+        """
+        Aggregate the spans recorded so far.
+
+        Returns:
+            list[dict]: One entry per stage (count, errors, total/mean/p50/p95 seconds and
+            summed payload, token, retry and throttling attributes), slowest stage first
+        """
+        with self._lock:
+            stages = {stage: dict(stats, durations=list(stats["durations"])) for stage, stats in self._stages.items()}
+
+        rows = []
+        for stage, stats in stages.items():
+            durations = stats.pop("durations")
+            rows.append({
+                "stage": stage,
+                "count": len(durations),
+                "errors": stats.pop("errors"),
+                "total_seconds": sum(durations),
+                "mean_seconds": sum(durations) / len(durations),
+                "p50_seconds": percentile(durations, 50),
+                "p95_seconds": percentile(durations, 95),
+                **stats,
+            })
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def reset(self):
+        """Forget the aggregated spans (the JSONL file is kept)"""
+        with self._lock:
+            self._stages = {}
+
+
+def _default_jsonl_path():
+    if TRACE_PATH:
+        return TRACE_PATH
+    return os.path.join(TRACE_DIR, f"trace_{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl")
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Return the shared tracer, created on first use"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(_default_jsonl_path() if TRACE_ENABLED else None)
+        return _tracer
+
+
+def configure_tracing(jsonl_path=None, wandb_run=None):
+    """
+    Replace the shared tracer.
+
+    Args:
+        jsonl_path (str, optional): JSONL output file. If None, uses TRACE_PATH / TRACE_DIR
+        wandb_run (optional): wandb run the report is logged to by log_trace_report_to_wandb
+
+    Returns:
+        Tracer: The new shared tracer
+    """
+    global _tracer
+    with _tracer_lock:
+        _tracer = Tracer(jsonl_path or (_default_jsonl_path() if TRACE_ENABLED else None), wandb_run=wandb_run)
+        return _tracer
+
+
+@contextmanager
+def span(stage, **attrs):
+    """
+    Time a block of work as one span of a pipeline stage.
+
+    Yields a dict of attributes the block can add to (e.g. response sizes or
+    token counts); they are recorded when the block exits. Exceptions are
+    recorded as the span's error and re-raised; a block that handles its own
+    failure can set attrs["error"] instead.
+
+    Example:
+        with span("tavily.search", query=query) as attrs:
+            response = client.search(query)
+            attrs["results"] = len(response["results"])
+    """
+    if not TRACE_ENABLED:
+        yield attrs
+        return
+
+    start = time.time()
+    start_counter = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        error = error or attrs.pop("error", None)
+        get_tracer().record(stage, start, time.perf_counter() - start_counter, error=error, **attrs)
+
+
+def trace_report():
+    """Per-stage aggregates of every span recorded in this run (see Tracer.report)"""
+    return get_tracer().report()
+
+
+def print_trace_report():
+    """Print the per-stage timing report for this run"""
+    rows = trace_report()
+    if not rows:
+        return
+    print("\nPer-stage timing:")
+    print(f"{'Stage':<22}{'Count':>7}{'Errors':>8}{'Total (s)':>11}{'Mean (s)':>10}{'P95 (s)':>10}"
+          f"{'Prompt tok':>12}{'Resp tok':>10}{'Retries':>9}")
+    for row in rows:
+        print(f"{row['stage']:<22}{row['count']:>7}{row['errors']:>8}{row['total_seconds']:>11.2f}"
+              f"{row['mean_seconds']:>10.3f}{row['p95_seconds']:>10.3f}{row['prompt_tokens']:>12}"
+              f"{row['response_tokens']:>10}{row['retries']:>9}")
+    tracer = get_tracer()
+    if tracer.jsonl_path:
+        print(f"Spans written to {tracer.jsonl_path}")
+
+
+def log_trace_report_to_wandb(run=None):
+    """Log the per-stage report as a wandb table (to run, or the run given to configure_tracing)"""
+    run = run or get_tracer().wandb_run
+    if run is None:
+        return
+    import wandb
+    import pandas as pd
+    run.log({"stage_timing": wandb.Table(dataframe=pd.DataFrame(trace_report()))})
@@ -0,0 +1,41 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'cmpid', 'ncid'}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def canonicalize_url(url):
+    """
+    Canonical form of a URL, used as a key for stored pages and for deduplication.
+
+    Lower-cases the scheme and host, drops "www.", default ports, the fragment,
+    tracking parameters and trailing slashes, and sorts the query string, so
+    variants of the same article link map to one key.
+
+    Args:
+        url (str): URL to canonicalize
+
+    Returns:
+        str: Canonical URL ('' if url is empty or not a string)
+    """
+    if not isinstance(url, str) or not url.strip():
+        return ''
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = host
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)]
+
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ''))